@@ -0,0 +1,66 @@
+"""Chunker throughput on synthetic text.
+
+    python benchmarks/bench_chunker.py [--chars 10000000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.models.chunk_budget import ChunkBudget
+from src.domain.services.text_service import TextService
+
+WORDS = ("el la de que y en los se del las un por con no una su para es al lo como más o pero sus le ha me "
+         "sí sin sobre este ya entre cuando todo esta ser son dos también fue había era muy años hasta desde "
+         "está mi porque qué sólo han yo hay vez puede todos así nos ni parte tiene él uno donde bien tiempo").split()
+
+def make_text(chars: int, seed: int = 7) -> str:
+    """Spanish-like prose: sentences of 5-40 words, commas, paragraphs of 2-8 sentences."""
+    rnd = random.Random(seed)
+    out, size = [], 0
+    while size < chars:
+        paragraph = []
+        for _ in range(rnd.randint(2, 8)):
+            words = [rnd.choice(WORDS) for _ in range(rnd.randint(5, 40))]
+            for i in range(3, len(words) - 1, rnd.randint(4, 12)):
+                words[i] += ","
+            paragraph.append(" ".join(words).capitalize() + rnd.choice(".?!."))
+        out.append(" ".join(paragraph))
+        size += len(out[-1]) + 2
+    return "\n\n".join(out)[:chars]
+
+def bench(name, fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return name, best, result
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chars", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    text = make_text(args.chars)
+    service = TextService()
+    flat = service.preprocess(text)
+    pages = [text[i:i + 3000] for i in range(0, len(text), 3000)]
+    print(f"{len(text):,} caracteres, {len(pages):,} páginas simuladas")
+
+    cases = [
+        ("chunk_text 3500 palabras", lambda: TextService.chunk_text(flat)),
+        ("chunk_text 5000 caracteres", lambda: TextService.chunk_text(text, budget=ChunkBudget(max_chars=5000, max_words=None))),
+        ("chunk_text 4096 bytes + 700 palabras", lambda: TextService.chunk_text(text, budget=ChunkBudget(max_bytes=4096, max_words=700))),
+        ("chunk_stream 3500 palabras", lambda: list(service.chunk_stream(pages))),
+    ]
+    for name, fn in cases:
+        name, seconds, chunks = bench(name, fn)
+        rate = len(text) / seconds / 1e6
+        print(f"{name:40s} {seconds * 1000:9.1f} ms  {rate:6.1f} M car/s  {len(chunks):6d} fragmentos")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Text normalization throughput (TextService.preprocess) on synthetic pages.
+
+    python benchmarks/bench_normalizer.py [--chars 2000000] [--language es]
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_chunker import bench, make_text
+from src.domain.services.text_service import TextService
+
+# Tokens the normalizer rewrites, sprinkled into the prose
+SAMPLES = {
+    "es": ["10/12/2024", "$1.250,50", "21%", "3,5", "1.000.000", "Sr.", "Dra.", "etc.", "pág.", "&", "1984", "31 €"],
+    "en": ["12/10/2024", "$1,250.50", "21%", "3.5", "1,000,000", "Mr.", "Dr.", "etc.", "e.g.", "&", "1984", "31 €"],
+}
+
+def make_pages(chars: int, language: str, seed: int = 11):
+    """Prose with PDF artifacts: hard line wraps, hyphenated breaks, runs of
+    spaces and one special token about every 60 words."""
+    rnd = random.Random(seed)
+    words = make_text(chars, seed).split(" ")
+    for i in range(0, len(words), 60):
+        words[rnd.randrange(i, min(i + 60, len(words)))] = rnd.choice(SAMPLES[language])
+    lines, line = [], []
+    for word in words:
+        line.append(word)
+        if len(line) >= 12:
+            lines.append(" ".join(line) + rnd.choice(["", "", "  ", "-"]))
+            line = []
+    lines.append(" ".join(line))
+    raw = "\n".join(lines)
+    return [raw[i:i + 3000] for i in range(0, len(raw), 3000)]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chars", type=int, default=2_000_000)
+    parser.add_argument("--language", default="es", choices=sorted(SAMPLES))
+    args = parser.parse_args()
+
+    pages = make_pages(args.chars, args.language)
+    raw = "\n".join(pages)
+    service = TextService(language=args.language)
+    service.preprocess("x") # compile the rule set outside the timing
+    print(f"{len(raw):,} caracteres, {len(pages):,} páginas simuladas, idioma {args.language}")
+
+    cases = [
+        ("preprocess (documento completo)", lambda: service.preprocess(raw)),
+        ("chunk_stream (por páginas)", lambda: list(service.chunk_stream(pages))),
+    ]
+    for name, fn in cases:
+        name, seconds, _ = bench(name, fn)
+        print(f"{name:40s} {seconds * 1000:9.1f} ms  {len(raw) / seconds / 1e6:6.1f} M car/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""End-to-end pipeline benchmark, fully offline.
+
+Runs ProcessPdfToSpeechUseCase from the real Container on synthetic PDFs,
+with the speech service replaced by FakeSpeechGenerator. Each scenario runs
+in its own process (so peak RSS is per scenario) and reports wall time,
+time to first audio, peak RSS and the job's per-stage metrics.
+
+    python benchmarks/bench_pipeline.py [--scenario digital-10,mixed-200,scanned-10]
+        [--latency 0.3] [--failure-rate 0.02] [--throttle-above 16]
+        [--render ffmpeg|null] [--output bench_pipeline.json] [--compare previous.json]
+
+A scenario is <digital|scanned|mixed>-<pages>. Fixtures are generated once
+into --fixtures (under the system temp directory by default). Scanned pages need Pillow to generate and the OCR binaries
+to run; --render ffmpeg needs ffmpeg.
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fixtures import KINDS, fixture
+
+DEFAULT_SCENARIOS = "digital-10,digital-200,mixed-200,scanned-10"
+VOICE = "es-ES-AlvaroNeural"
+
+def peak_rss_mb() -> dict:
+    """Peak resident memory of this process and of its largest finished child."""
+    try:
+        import resource
+    except ImportError: # Windows
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")
+            ]
+
+        counters = Counters(cb=ctypes.sizeof(Counters))
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb
+        )
+        return {"self": round(counters.PeakWorkingSetSize / 2**20, 1)}
+    unit = 1 if sys.platform == "darwin" else 1024 # ru_maxrss is bytes on macOS, KiB elsewhere
+    return {
+        "self": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2**20, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit / 2**20, 1)
+    }
+
+class FirstAudioProbe:
+    """Stands in for the audio processor and notes when render() receives
+    its first chunk, i.e. when audio starts reaching the output."""
+
+    def __init__(self, processor):
+        self._processor = processor
+        self.first_audio: Optional[float] = None
+
+    def _watch(self, chunks):
+        for chunk in chunks:
+            if self.first_audio is None:
+                self.first_audio = time.perf_counter()
+            yield chunk
+
+    def render(self, chunks, *args, **kwargs):
+        return self._processor.render(self._watch(chunks), *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._processor, name)
+
+def null_processor():
+    """FFmpegAdapter that drains the chunks into an empty file instead of running ffmpeg."""
+    from src.infrastructure.adapters.ffmpeg_adapter import FFmpegAdapter
+
+    class NullRenderer(FFmpegAdapter):
+        def render(self, chunks, output_path, *args, **kwargs):
+            for _ in chunks:
+                pass
+            open(output_path, "wb").close()
+            return output_path
+
+    return NullRenderer()
+
+def run_scenario(spec: str, pdf_path: str, args) -> dict:
+    """Converts one fixture in a scratch directory (fresh caches and settings)."""
+    from benchmarks.fake_tts import FakeSpeechGenerator
+    from src.domain.models.voice_settings import VoiceSettings
+    from src.infrastructure.container import Container
+
+    cwd, workdir = os.getcwd(), tempfile.mkdtemp(prefix="bench-")
+    os.chdir(workdir)
+    try:
+        container = Container()
+        generator = FakeSpeechGenerator(
+            limiter=container.synthesis_limiter,
+            latency=args.latency,
+            per_char=args.per_char,
+            jitter=args.jitter,
+            failure_rate=args.failure_rate,
+            throttle_above=args.throttle_above,
+            journal=container.journal_adapter
+        )
+        generator.BASE_DELAY = args.retry_delay
+        container.override("speech_generator", generator)
+        probe = FirstAudioProbe(null_processor() if args.render == "null" else container.audio_processor)
+        container.override("audio_processor", probe)
+        if args.verbose:
+            container.journal_adapter.set_callback(lambda m: print(m, end="", file=sys.stderr))
+        use_case = container.process_pdf_use_case
+
+        start = time.perf_counter()
+        text = use_case.extract_only(pdf_path) if args.mode == "text" else None
+        output = use_case.execute(text, pdf_path, os.path.join(workdir, "out"), VoiceSettings(VOICE))
+        wall = time.perf_counter() - start
+
+        manifest = container.job_repo.load_project(os.path.dirname(output))
+        with open(container.job_repo.trace_path(manifest), "r", encoding="utf-8") as f:
+            summary = json.loads(f.readlines()[-1])
+        return {
+            "scenario": spec,
+            "mode": args.mode,
+            "render": args.render,
+            "wall_seconds": round(wall, 3),
+            "time_to_first_audio": round(probe.first_audio - start, 3) if probe.first_audio else None,
+            "peak_rss_mb": peak_rss_mb(),
+            "chunks": len(manifest.chunks),
+            "audio_seconds": round(sum(r.duration or 0.0 for r in manifest.chunks.values()), 1),
+            "chars_saved": manifest.chars_saved,
+            "fake_tts": generator.stats(),
+            "limiter": container.synthesis_limiter.snapshot(),
+            "counters": summary["counters"],
+            "stages": summary["histograms"]
+        }
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results: list, previous_path: str):
+    with open(previous_path, "r", encoding="utf-8") as f:
+        previous = {r["scenario"]: r for r in json.load(f)["results"]}
+    print(f"\nComparado con {previous_path}:")
+    for result in results:
+        old = previous.get(result["scenario"])
+        if not old:
+            continue
+        deltas = []
+        for key in ("wall_seconds", "time_to_first_audio"):
+            if result.get(key) and old.get(key):
+                deltas.append(f"{key} {(result[key] / old[key] - 1):+.1%}")
+        if old["peak_rss_mb"].get("self"):
+            deltas.append(f"rss {(result['peak_rss_mb']['self'] / old['peak_rss_mb']['self'] - 1):+.1%}")
+        print(f"  {result['scenario']:16s} " + "  ".join(deltas))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scenario", default=DEFAULT_SCENARIOS, help="comma-separated <kind>-<pages>")
+    parser.add_argument("--mode", choices=("stream", "text"), default="stream",
+                        help="stream from the PDF, or extract first as the editor does")
+    parser.add_argument("--render", choices=("ffmpeg", "null"), default="ffmpeg")
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds per request")
+    parser.add_argument("--per-char", type=float, default=0.0002, help="extra seconds per character")
+    parser.add_argument("--jitter", type=float, default=0.2, help="relative latency jitter")
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-above", type=int, default=None, help="concurrent requests before 429s")
+    parser.add_argument("--retry-delay", type=float, default=2.0, help="base backoff between retries")
+    parser.add_argument("--fixtures", default=os.path.join(tempfile.gettempdir(), "ttspython_bench_fixtures"))
+    parser.add_argument("--output", default="bench_pipeline.json")
+    parser.add_argument("--compare", default=None, help="earlier results file")
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        spec, pdf_path = args.child.split("=", 1)
+        print(json.dumps(run_scenario(spec, pdf_path, args)))
+        return
+
+    results = []
+    for spec in args.scenario.split(","):
+        kind, pages = spec.rsplit("-", 1)
+        if kind not in KINDS:
+            parser.error(f"escenario desconocido: {spec}")
+        pdf_path = os.path.abspath(fixture(args.fixtures, kind, int(pages)))
+        # A fresh interpreter per scenario: clean caches and an honest peak RSS
+        child = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), *sys.argv[1:], "--child", f"{spec}={pdf_path}"],
+            stdout=subprocess.PIPE, text=True
+        )
+        if child.returncode != 0:
+            print(f"{spec:16s} falló (código {child.returncode})")
+            continue
+        result = json.loads(child.stdout.strip().splitlines()[-1])
+        results.append(result)
+        ttfa = result["time_to_first_audio"]
+        print(f"{spec:16s} {result['wall_seconds']:9.2f} s  primer audio {ttfa if ttfa is not None else '-':>6} s"
+              f"  rss {result['peak_rss_mb']['self']:7.1f} MB  {result['chunks']:5d} fragmentos")
+
+    report = {
+        "commit": git_commit(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {k: v for k, v in vars(args).items() if k not in ("child", "compare", "output", "verbose")},
+        "results": results
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Resultados: {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Offline stand-in for the Edge TTS service.
+
+FakeSpeechGenerator keeps everything EdgeTTSAdapter does around a request
+(event loop, adaptive limiter, retries with backoff, metrics) and replaces
+only the network call, so benchmarks exercise the real dispatch path.
+"""
+import asyncio
+import os
+import random
+import sys
+from typing import AsyncIterator, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.models.voice_settings import VoiceSettings
+from src.domain.services.adaptive_limiter import AdaptiveConcurrencyLimiter
+from src.infrastructure.adapters.edgetts_adapter import EdgeTTSAdapter
+from src.infrastructure.adapters.journal_adapter import JournalAdapter
+
+# MPEG-2 Layer III, 48 kbps, 24 kHz, mono: the format Edge TTS returns.
+# 576 samples per frame -> 24 ms; 576 / 8 * 48000 / 24000 = 144 bytes.
+FRAME_HEADER = b"\xff\xf3\x64\xc0"
+FRAME_BYTES = 144
+FRAME_SECONDS = 0.024
+PIECE_BYTES = FRAME_BYTES * 20 # about what one streamed message carries
+
+def silent_mp3(seconds: float) -> bytes:
+    """Bare MP3 frames with a zeroed payload, which decode to silence."""
+    frame = FRAME_HEADER + bytes(FRAME_BYTES - len(FRAME_HEADER))
+    return frame * max(1, round(seconds / FRAME_SECONDS))
+
+class FakeServiceError(Exception):
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+class FakeSpeechGenerator(EdgeTTSAdapter):
+    """Starts answering after latency seconds and finishes per_char *
+    len(text) seconds later (both scaled by a random jitter factor), fails a
+    fraction of requests, and rejects with a 429 any request beyond
+    throttle_above running at once."""
+
+    def __init__(
+        self,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        latency: float = 0.3,
+        per_char: float = 0.0002,
+        jitter: float = 0.2,
+        failure_rate: float = 0.0,
+        throttle_above: Optional[int] = None,
+        chars_per_second: float = 15.0,
+        seed: int = 1,
+        journal: Optional[JournalAdapter] = None
+    ):
+        super().__init__(limiter, journal)
+        self.latency = latency
+        self.per_char = per_char
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.throttle_above = throttle_above
+        self.chars_per_second = chars_per_second # speaking rate of the generated audio
+        self.random = random.Random(seed)
+        self.active = 0 # only touched on the event loop
+        self.requests = self.failures = self.throttled = 0
+
+    async def _request_stream(self, text: str, settings: VoiceSettings) -> AsyncIterator[bytes]:
+        # The first piece arrives after latency; the rest trickles in over
+        # per_char * len(text), in pieces the size the service sends
+        self.requests += 1
+        self.active += 1
+        try:
+            if self.throttle_above and self.active > self.throttle_above:
+                self.throttled += 1
+                await asyncio.sleep(self.latency * 0.1)
+                raise FakeServiceError("429 Too Many Requests", status=429)
+            factor = 1.0 + self.random.uniform(-self.jitter, self.jitter)
+            await asyncio.sleep(self.latency * factor)
+            if self.random.random() < self.failure_rate:
+                self.failures += 1
+                raise FakeServiceError("Connection reset by fake service")
+            audio = silent_mp3(len(text) / self.chars_per_second)
+            pieces = range(0, len(audio), PIECE_BYTES)
+            for offset in pieces:
+                yield audio[offset:offset + PIECE_BYTES]
+                await asyncio.sleep(self.per_char * len(text) * factor / len(pieces))
+        finally:
+            self.active -= 1
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "failures": self.failures, "throttled": self.throttled}
@@ -0,0 +1,143 @@
+"""Synthetic PDF fixtures: digital (text layer), scanned (page images only)
+and mixed (one scanned page in five).
+
+    python benchmarks/fixtures.py digital 200 out.pdf
+
+Pages are written one at a time, so a 2,000-page document needs no more
+memory than a single page. Scanned pages are rendered with Pillow.
+"""
+import os
+import random
+import sys
+import unicodedata
+import zlib
+from typing import BinaryIO, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_chunker import make_text
+
+KINDS = ("digital", "scanned", "mixed")
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842 # A4 in points
+LINES_PER_PAGE = 46
+CHARS_PER_LINE = 90
+SCAN_DPI = 150
+
+class _PdfWriter:
+    """Streams numbered objects to a file and writes the xref table at the end."""
+
+    def __init__(self, f: BinaryIO):
+        self.f = f
+        self.offsets = {}
+        f.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def add(self, number: int, body: bytes, stream: bytes = None):
+        self.offsets[number] = self.f.tell()
+        self.f.write(b"%d 0 obj\n" % number)
+        if stream is None:
+            self.f.write(body)
+        else:
+            self.f.write(body[:-2] + b" /Length %d >>\nstream\n" % len(stream))
+            self.f.write(stream)
+            self.f.write(b"\nendstream")
+        self.f.write(b"\nendobj\n")
+
+    def close(self, root: int):
+        xref = self.f.tell()
+        size = max(self.offsets) + 1
+        self.f.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        for number in range(1, size):
+            if number in self.offsets:
+                self.f.write(b"%010d 00000 n \n" % self.offsets[number])
+            else:
+                self.f.write(b"0000000000 65535 f \n") # unused image slot
+        self.f.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, root, xref))
+
+def _page_lines(rnd: random.Random, number: int, total: int) -> List[str]:
+    """Running header, wrapped body text and a numbered footer."""
+    words = make_text(LINES_PER_PAGE * CHARS_PER_LINE, seed=rnd.randrange(1 << 30)).split()
+    body, line = [], ""
+    for word in words:
+        if len(line) + len(word) + 1 > CHARS_PER_LINE:
+            body.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    body.append(line)
+    return ["Informe sintético de rendimiento", ""] + body[:LINES_PER_PAGE] + ["", f"Página {number} de {total}"]
+
+def _escape(line: str) -> bytes:
+    data = line.encode("cp1252", "replace")
+    return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+def _text_content(lines: List[str]) -> bytes:
+    out = [b"BT /F1 10 Tf 15 TL 50 800 Td"]
+    out += [b"(%s) '" % _escape(line) for line in lines]
+    out.append(b"ET")
+    return b"\n".join(out)
+
+def _scan_image(lines: List[str]):
+    """Grayscale page image with the text drawn on it, as a scanner would produce."""
+    from PIL import Image, ImageDraw, ImageFont
+    scale = SCAN_DPI / 72
+    image = Image.new("L", (int(PAGE_WIDTH * scale), int(PAGE_HEIGHT * scale)), 255)
+    draw = ImageDraw.Draw(image)
+    try:
+        font = ImageFont.load_default(size=int(10 * scale))
+    except TypeError:
+        font = ImageFont.load_default() # Pillow < 10.1: fixed bitmap font
+    y = 42 * scale
+    for line in lines:
+        # Pillow's built-in font has no accented glyphs: draw the base letters
+        line = unicodedata.normalize("NFKD", line).encode("ascii", "ignore").decode()
+        draw.text((50 * scale, y), line, fill=0, font=font)
+        y += 15 * scale
+    return image
+
+def make_pdf(path: str, kind: str, pages: int, seed: int = 3):
+    if kind not in KINDS:
+        raise ValueError(f"Tipo desconocido: {kind}")
+    rnd = random.Random(seed)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pdf = _PdfWriter(f)
+        pdf.add(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+        kids = []
+        for number in range(1, pages + 1):
+            page_id = 4 + (number - 1) * 3 # page, content, image
+            lines = _page_lines(rnd, number, pages)
+            scanned = kind == "scanned" or (kind == "mixed" and number % 5 == 0)
+            if scanned:
+                image = _scan_image(lines)
+                pdf.add(page_id + 2, (
+                    b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray"
+                    b" /BitsPerComponent 8 /Filter /FlateDecode >>" % image.size
+                ), zlib.compress(image.tobytes(), 6))
+                content = b"q %d 0 0 %d 0 0 cm /Im1 Do Q" % (PAGE_WIDTH, PAGE_HEIGHT)
+                resources = b"<< /XObject << /Im1 %d 0 R >> >>" % (page_id + 2)
+            else:
+                content = _text_content(lines)
+                resources = b"<< /Font << /F1 3 0 R >> >>"
+            pdf.add(page_id + 1, b"<< /Filter /FlateDecode >>", zlib.compress(content))
+            pdf.add(page_id, (
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources %s /Contents %d 0 R >>"
+                % (PAGE_WIDTH, PAGE_HEIGHT, resources, page_id + 1)
+            ))
+            kids.append(b"%d 0 R" % page_id)
+        pdf.add(2, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages))
+        pdf.add(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+        pdf.close(root=1)
+    os.replace(tmp_path, path)
+
+def fixture(directory: str, kind: str, pages: int) -> str:
+    """Path to the fixture, generating it on first use."""
+    path = os.path.join(directory, f"{kind}-{pages}.pdf")
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        make_pdf(path, kind, pages)
+    return path
+
+if __name__ == "__main__":
+    kind, pages, path = sys.argv[1], int(sys.argv[2]), sys.argv[3]
+    make_pdf(path, kind, pages)
+    print(path)
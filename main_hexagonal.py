@@ -1,15 +1,25 @@
 import os
 import sys
-from tkinter import messagebox
-import tkinter as tk
 
 # Asegurar que el root esté en el path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# --startup-report: mide cada import y fase del arranque (como -X importtime)
+STARTUP_REPORT = __name__ == "__main__" and "--startup-report" in sys.argv
+if STARTUP_REPORT:
+    from src.infrastructure.startup_profiler import profiler
+    profiler.install()
+
+import multiprocessing
+from tkinter import messagebox
+import tkinter as tk
+
 from src.infrastructure.env_manager import env_manager
-from src.interfaces.gui.app import AntigravityApp
 
 if __name__ == "__main__":
+    # Requerido por el pool de procesos de OCR en el ejecutable congelado
+    multiprocessing.freeze_support()
+
     # VALIDACIÓN INICIAL DE BINARIOS LOCALES
     if not env_manager.validate_binaries():
         root = tk.Tk()
@@ -20,7 +30,18 @@ if __name__ == "__main__":
             "La aplicación no puede continuar."
         )
         sys.exit(1)
+    if STARTUP_REPORT: profiler.mark("binarios validados")
 
-    # Lanzar Aplicación
+    # Lanzar Aplicación (importada aquí para que los procesos hijos de OCR,
+    # que re-importan este módulo, no carguen la GUI ni el contenedor)
+    from src.interfaces.gui.app import AntigravityApp
+    if STARTUP_REPORT: profiler.mark("interfaz importada")
     app = AntigravityApp()
+    if STARTUP_REPORT:
+        profiler.mark("ventana construida")
+        def _startup_done():
+            profiler.mark("ventana visible")
+            profiler.uninstall()
+            profiler.report()
+        app.after_idle(_startup_done)
     app.mainloop()
@@ -1,16 +1,34 @@
 import os
 import concurrent.futures
+import contextvars
 import threading
 import time
-import shutil
-from typing import Callable, Optional, List, Tuple
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, Optional, List, Tuple, Union
 from src.domain.models.audio_project import AudioProject
+from src.domain.models.job_manifest import JobManifest, ChunkRecord
+from src.domain.models.chunk_budget import ChunkBudget
+from src.domain.models.page_text import PageText
+from src.domain.models.pipeline_settings import PipelineSettings
+from src.domain.models.progress_update import ProgressUpdate
 from src.domain.models.voice_settings import VoiceSettings
 from src.domain.ports.document_extractor import DocumentExtractorPort
 from src.domain.ports.speech_generator import SpeechGeneratorPort
 from src.domain.ports.audio_processor import AudioProcessorPort
 from src.domain.services.text_service import TextService
+from src.domain.services.adaptive_limiter import AdaptiveConcurrencyLimiter, request_owner
+from src.domain.services.ordered_chunk_buffer import OrderedChunkBuffer
+from src.domain.services.pipeline_stage import PipelineStage
+from src.domain.services.fair_scheduler import FairShareScheduler
+from src.domain.services.chunk_tuner import ChunkSizeTuner
+from src.domain.services.header_footer_detector import HeaderFooterDetector
+from src.domain.services.progress_reporter import ProgressReporter
 from src.infrastructure.adapters.journal_adapter import JournalAdapter
+from src.infrastructure.adapters.metrics_adapter import metrics
+from src.infrastructure.repositories.cache_repository import CacheRepository
+from src.infrastructure.repositories.extraction_cache_repository import ExtractionCacheRepository
+from src.infrastructure.repositories.job_manifest_repository import JobManifestRepository
 
 class ProcessPdfToSpeechUseCase:
     def __init__(
@@ -20,138 +38,645 @@ class ProcessPdfToSpeechUseCase:
         processor: AudioProcessorPort,
         text_service: TextService,
         journal: Optional[JournalAdapter] = None,
-        max_workers: int = 4
+        cache: Optional[CacheRepository] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        extraction_cache: Optional[ExtractionCacheRepository] = None,
+        jobs: Optional[JobManifestRepository] = None,
+        scheduler: Optional[FairShareScheduler] = None,
+        chunk_tuner: Optional[ChunkSizeTuner] = None,
+        pipeline: Optional[PipelineSettings] = None
     ):
         self.extractor = extractor
         self.generator = generator
         self.processor = processor
         self.text_service = text_service
         self.journal = journal
-        self.max_workers = max_workers
+        self.cache = cache
+        self.limiter = limiter
+        self.extraction_cache = extraction_cache
+        self.jobs = jobs
+        self.scheduler = scheduler
+        self.chunk_tuner = chunk_tuner
+        self.pipeline = pipeline or PipelineSettings()
+        # Recent previews by (text, voice, rate, pitch), most recent last
+        self._previews: "OrderedDict[Tuple[str, str, str, str], bytes]" = OrderedDict()
+        self._previews_lock = threading.Lock()
 
     def _log(self, message, level="INFO"):
         if self.journal:
             self.journal.log(message, level)
 
-    def extract_only(self, pdf_path: str) -> str:
+    def extract_only(
+        self,
+        pdf_path: str,
+        language: Optional[str] = None,
+        progress_callback: Optional[Callable[[ProgressUpdate], None]] = None
+    ) -> str:
         self._log(f"Extrayendo texto de: {os.path.basename(pdf_path)}")
-        raw_text, _ = self.extractor.extract_text(pdf_path)
+        language = language or self.text_service.language
+        if not self.extraction_cache:
+            raw_text = self._join_pages([p.text for p in self._iter_pages(pdf_path, progress_callback)])
+            if not raw_text:
+                raise Exception("No se pudo extraer texto del PDF.")
+            return self.text_service.preprocess(raw_text, language)
+
+        entry = self.extraction_cache.get(pdf_path)
+        if entry is None:
+            pages = [self._page_record(p) for p in self._iter_pages(pdf_path, progress_callback)]
+            entry = {"pages": pages}
+            stale = []
+        else:
+            # Only OCR'd pages depend on the OCR language; asking for it loads
+            # the OCR engine, which a digital PDF never needs
+            ocr_pages = [p for p in entry["pages"] if p["method"] == "OCR"]
+            ocr_lang = self.extractor.ocr_language() if ocr_pages else None
+            stale = [p["number"] for p in ocr_pages if p.get("ocr_lang") != ocr_lang]
+            if stale:
+                self._log(f"Reextrayendo {len(stale)} páginas por cambio de idioma OCR.")
+                fresh = {p.number: self._page_record(p) for p in self._iter_pages(pdf_path, progress_callback, stale)}
+                entry["pages"] = [fresh.get(p["number"], p) for p in entry["pages"]]
+            elif (entry.get("preprocess_version") == self.text_service.PREPROCESS_VERSION
+                    and entry.get("language") == language and entry.get("headers_stripped")):
+                self._log("Texto recuperado de la caché de extracción.")
+                return entry["text"]
+
+        raw_text = self._join_pages([p["text"] for p in entry["pages"] if p["text"]])
         if not raw_text:
             raise Exception("No se pudo extraer texto del PDF.")
-        return self.text_service.preprocess(raw_text)
+        entry["text"] = self.text_service.preprocess(raw_text, language)
+        entry["preprocess_version"] = self.text_service.PREPROCESS_VERSION
+        entry["language"] = language
+        entry["headers_stripped"] = True
+        try:
+            self.extraction_cache.put(pdf_path, entry)
+        except OSError as e:
+            self._log(f"No se pudo guardar la caché de extracción: {e}", "WARN")
+        return entry["text"]
+
+    def _iter_pages(
+        self,
+        pdf_path: str,
+        progress_callback: Optional[Callable[[ProgressUpdate], None]],
+        numbers: Optional[List[int]] = None
+    ) -> Iterator[PageText]:
+        """The extractor's pages, reporting progress as each one (OCR'd or
+        not) comes out."""
+        ocr_pages = 0
+        progress = ProgressReporter(
+            progress_callback, "extract", "Extrayendo páginas",
+            total=len(numbers) if numbers else None,
+            suffix=lambda: f" - OCR: {ocr_pages}" if ocr_pages else ""
+        )
+        for page in self.extractor.iter_pages(pdf_path, numbers):
+            if progress.total is None:
+                progress.set_total(page.total)
+            if page.method == "OCR":
+                ocr_pages += 1
+            progress.advance(chars=len(page.text))
+            yield page
+        progress.finish()
+
+    def _join_pages(self, page_texts: List[str]) -> str:
+        """Joins extracted pages without their running headers and footers."""
+        detector = HeaderFooterDetector()
+        page_texts = detector.strip_pages(page_texts)
+        if detector.saved_chars:
+            self._log(f"Encabezados y pies de página repetidos eliminados: {detector.saved_chars} caracteres.")
+        return "\n".join(page_texts).strip()
+
+    @staticmethod
+    def _page_record(page) -> dict:
+        return {"number": page.number, "text": page.text, "method": page.method, "ocr_lang": page.ocr_lang}
+
+    # Words of the text spoken by a preview, and previews kept in memory
+    PREVIEW_WORDS = 30
+    PREVIEW_ENTRIES = 16
+
+    def preview_stream(self, text: str, voice_settings: VoiceSettings) -> Iterator[bytes]:
+        """Yields the preview audio as it is synthesized, so playback can
+        start with the first piece. Previews heard recently are replayed
+        from memory without a request."""
+        preview_text = " ".join(text.split()[:self.PREVIEW_WORDS])
+        key = (preview_text, voice_settings.voice_id, voice_settings.rate, voice_settings.pitch)
+        with self._previews_lock:
+            audio = self._previews.get(key)
+            if audio is not None:
+                self._previews.move_to_end(key)
+        if audio is not None:
+            self._log("Previsualización de voz recuperada de memoria.")
+            yield audio
+            return
 
-    def preview_voice(self, text: str, voice_settings: VoiceSettings) -> str:
         self._log("Generando previsualización de voz...")
+        pieces = []
+        for data in self.generator.stream_speech(preview_text, voice_settings):
+            pieces.append(data)
+            yield data
+        # Only complete previews are kept; a stopped one raises GeneratorExit above
+        with self._previews_lock:
+            self._previews[key] = b"".join(pieces)
+            if len(self._previews) > self.PREVIEW_ENTRIES:
+                self._previews.popitem(last=False)
+
+    def preview_voice(self, text: str, voice_settings: VoiceSettings) -> str:
+        """Writes the preview to a temporary MP3 and returns its path."""
         temp_preview = os.path.join(os.environ.get('TEMP', os.getcwd()), "preview_voice.mp3")
-        preview_text = " ".join(text.split()[:30]) 
-        self.generator.generate_speech(preview_text, temp_preview, voice_settings)
+        audio = b"".join(self.preview_stream(text, voice_settings))
+        with open(temp_preview, "wb") as f:
+            f.write(audio)
         return temp_preview
 
+    def _cached_audio(self, text: str, voice_settings: VoiceSettings) -> Optional[bytes]:
+        if not self.cache:
+            return None
+        return self.cache.get_bytes(text, voice_settings.voice_id, voice_settings.rate, voice_settings.pitch)
+
     def execute(
         self,
-        text: str,
+        text: Optional[str],
         pdf_path: str,
         output_base_dir: str,
         voice_settings: VoiceSettings,
         bgm_path: Optional[str] = None,
         bgm_volume: float = 0.2,
-        progress_callback: Optional[Callable[[str, float], None]] = None,
+        progress_callback: Optional[Callable[[ProgressUpdate], None]] = None,
         cancel_event: Optional[threading.Event] = None
     ) -> Optional[str]:
+        """Runs the full pipeline. With text=None the PDF is extracted page by
+        page and synthesis starts while later pages are still being parsed."""
         base_name = os.path.basename(pdf_path).split('.')[0]
         project_dir = os.path.join(output_base_dir, base_name)
         os.makedirs(project_dir, exist_ok=True)
         
         self._log(f"Iniciando pipeline para: {base_name}")
 
-        # Cleanup existing part files
+        # Cleanup existing part files; the previous output stays until replaced
         for f in os.listdir(project_dir):
-            if f.startswith(base_name) and f.endswith(".mp3"):
+            if f.startswith(base_name) and f.endswith(".mp3") and f != f"{base_name}_mixed.mp3":
                 try: os.remove(os.path.join(project_dir, f))
                 except: pass
 
+        manifest = JobManifest(
+            job_id=f"{base_name}-{uuid.uuid4().hex[:8]}",
+            pdf_path=pdf_path, project_dir=project_dir, base_name=base_name,
+            voice_settings=voice_settings, bgm_path=bgm_path, bgm_volume=bgm_volume
+        )
+        previous_chunks = None
+        if self.jobs:
+            # A previous job on this project with the same voice: keep its chunk
+            # boundaries, so after an edit the unchanged chunks are found in the
+            # audio cache and only what changed is re-synthesized
+            previous = self.jobs.load_project(project_dir)
+            if previous is not None and self._same_voice(previous.voice_settings, voice_settings):
+                manifest.chunk_budget = previous.chunk_budget
+                if isinstance(text, str):
+                    previous_chunks = self.jobs.load_texts(previous)
+            self.jobs.create(manifest)
+        return self._run(manifest, text, progress_callback, cancel_event, previous_chunks)
+
+    @staticmethod
+    def _same_voice(a: VoiceSettings, b: VoiceSettings) -> bool:
+        """Whether chunk audio made with one settings is valid for the other
+        (volume is applied when rendering, not when synthesizing)."""
+        return (a.voice_id, a.rate, a.pitch) == (b.voice_id, b.rate, b.pitch)
+
+    def resume(
+        self,
+        job_id: str,
+        progress_callback: Optional[Callable[[ProgressUpdate], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Optional[str]:
+        """Finishes an interrupted job, synthesizing only the chunks that are
+        missing or failed; finished chunks are read back from their checkpoints."""
+        manifest = self.jobs.load(job_id) if self.jobs else None
+        if manifest is None:
+            raise ValueError(f"No existe el trabajo: {job_id}")
+        if manifest.status == "completed" and manifest.final_path and os.path.exists(manifest.final_path):
+            return manifest.final_path
+
+        done = sum(1 for r in manifest.chunks.values() if r.status == "done")
+        self._log(f"Reanudando trabajo {job_id}: {done} fragmentos ya generados.")
+        manifest.status = "running"
+        self.jobs.save(manifest)
+
+        text = None
+        if manifest.source_complete:
+            text = self.jobs.load_texts(manifest)
+        return self._run(manifest, text, progress_callback, cancel_event)
+
+    # Rough text per page, to size chunks before a streamed PDF is parsed
+    AVG_PAGE_CHARS = 2000
+    # How often blocked waits wake up to check for cancellation and errors
+    POLL_INTERVAL = 0.1
+    # Chunks up to this size keep their audio for reuse within the job
+    REPEAT_MEMO_MAX_CHARS = 500
+    REPEAT_MEMO_ENTRIES = 256
+
+    def _choose_budget(self, total_chars: Optional[int]) -> Optional[ChunkBudget]:
+        """Sizes chunks from the document length and what the limiter has seen."""
+        if not self.chunk_tuner or not total_chars:
+            return None
+        workers = self.limiter.limit if self.limiter else 4
+        model = self.limiter.latency_model() if self.limiter else None
+        failure_rate = self.limiter.snapshot()["error_rate"] if self.limiter else 0.0
+        budget, reason = self.chunk_tuner.choose(total_chars, workers, model, failure_rate)
+        self._log(f"Tamaño de fragmento: {budget.max_chars} caracteres ({reason}).")
+        return budget
+
+    def _checkpoint(self, manifest: JobManifest, idx: int, audio: bytes, keep_part: bool = True):
+        """Records a finished chunk so a resumed job can skip it. Audio the
+        cache holds needs no part: the cache is its checkpoint, found again
+        by the chunk's text and the job's voice."""
+        record = manifest.chunks[idx]
+        record.duration = self.processor.get_duration(audio)
+        if self.jobs and keep_part:
+            record.output_path = self.jobs.write_part(manifest, idx, audio)
+        record.status = "done"
+        if self.jobs:
+            # One appended line per chunk; the manifest is rewritten only on job-level changes
+            try:
+                self.jobs.append_record(manifest, record)
+            except OSError as e:
+                self._log(f"No se pudo guardar el progreso del fragmento {idx}: {e}", "WARN")
+
+    def _save_manifest(self, manifest: JobManifest):
+        if not self.jobs:
+            return
+        try:
+            self.jobs.save(manifest)
+        except OSError as e:
+            self._log(f"No se pudo guardar el manifiesto del trabajo: {e}", "WARN")
+
+    def _log_metrics(self, summary: dict, trace_path: Optional[str]):
+        """One-line breakdown of where the job spent its time."""
+        counters, histograms = summary["counters"], summary["histograms"]
+        parts = []
+        synthesis = histograms.get("synthesis.chunk")
+        if synthesis:
+            parts.append(f"síntesis {synthesis['count']} fragmentos (p50 {synthesis['p50']:.1f}s, p95 {synthesis['p95']:.1f}s)")
+        if counters.get("tts.retry"):
+            parts.append(f"{int(counters['tts.retry'])} reintentos")
+        lookups = counters.get("cache.hit", 0) + counters.get("cache.miss", 0)
+        if lookups:
+            parts.append(f"caché {counters.get('cache.hit', 0) / lookups:.0%} aciertos")
+        for name, label in (("extract.page", "extracción"), ("ocr.page", "OCR")):
+            if name in histograms:
+                pages = histograms[name]
+                parts.append(f"{label} {pages['count']} páginas ({pages['mean']:.2f}s/página)")
+        ffmpeg = sum(h["total"] for name, h in histograms.items() if name.startswith("ffmpeg.") and name != "ffmpeg.input_wait")
+        if ffmpeg:
+            parts.append(f"ffmpeg {ffmpeg:.1f}s")
+        if parts:
+            self._log(f"Métricas ({summary['seconds']:.0f}s): " + "; ".join(parts) + ".")
+        if trace_path:
+            self._log(f"Traza del trabajo: {trace_path}")
+
+    def _run(
+        self,
+        manifest: JobManifest,
+        text: Union[str, List[str], None],
+        progress_callback: Optional[Callable[[ProgressUpdate], None]],
+        cancel_event: Optional[threading.Event],
+        previous_chunks: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """Runs a job while recording its metrics to a per-job trace."""
+        trace_path = self.jobs.trace_path(manifest) if self.jobs else None
+        # Requests inherit the owner, so the limiter queues them fairly per job
+        owner_token = request_owner.set(manifest.job_id)
+        with metrics.job(manifest.job_id, trace_path) as trace:
+            try:
+                return self._run_job(manifest, text, progress_callback, cancel_event, previous_chunks)
+            finally:
+                request_owner.reset(owner_token)
+                self._log_metrics(trace.summary(), trace_path)
+
+    def _run_job(
+        self,
+        manifest: JobManifest,
+        text: Union[str, List[str], None],
+        progress_callback: Optional[Callable[[ProgressUpdate], None]],
+        cancel_event: Optional[threading.Event],
+        previous_chunks: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """Synthesizes and renders a job. text may be the edited document, the
+        recorded chunk list of a resumed job, or None to stream from the PDF.
+        previous_chunks, the chunks of an earlier job on the same text, keeps
+        the boundaries of the unedited parts of the document."""
+        voice_settings = manifest.voice_settings
+        bgm_path, bgm_volume = manifest.bgm_path, manifest.bgm_volume
+        base_name, project_dir, pdf_path = manifest.base_name, manifest.project_dir, manifest.pdf_path
+
         project = AudioProject(
             pdf_path=pdf_path, output_dir=project_dir,
             voice_settings=voice_settings, base_name=base_name,
             bgm_path=bgm_path, bgm_volume=bgm_volume
         )
 
-        temp_merged_path = None
-
         def check_cancel():
             if cancel_event and cancel_event.is_set():
                 self._log("Cancelación detectada.", "WARN")
                 raise InterruptedError("Proceso cancelado.")
 
+        assembler = render_thread = None
+        render_result = {}
+        # ffmpeg writes next to the output and the file takes its name only
+        # once complete, so a cancelled or failed job never leaves a truncated
+        # file where a finished one is expected (nor replaces an earlier one)
+        final_mp3_path = os.path.join(project_dir, f"{base_name}_mixed.mp3")
+        partial_path = os.path.join(project_dir, f"{base_name}_mixed.partial.mp3")
+        stages: List[PipelineStage] = []
+
+        def run_render(chunks, output_path):
+            # Single ffmpeg pass fed from memory: concat + volume + BGM, no temp files
+            try:
+                render_result["path"] = self.processor.render(
+                    chunks,
+                    output_path,
+                    voice_settings.volume,
+                    bgm_path if bgm_path and os.path.exists(bgm_path) else "",
+                    bgm_volume,
+                    cancel_event=cancel_event
+                )
+            except BaseException as e:
+                render_result["error"] = e
+
         try:
             check_cancel()
-            
-            project.extracted_text = text
-            project.chunks = self.text_service.chunk_text(text)
-            total_chunks = len(project.chunks)
-            if total_chunks == 0: raise Exception("No hay texto.")
-
-            self._log(f"Plan de audio: {total_chunks} fragmentos.")
-
-            chunk_tasks = []
-            for i, chunk in enumerate(project.chunks):
-                idx = i + 1
-                chunk_path = os.path.join(project_dir, f"{base_name}_part_{idx:03d}.mp3")
-                chunk_tasks.append((idx, chunk, chunk_path))
-                project.generated_files.append(chunk_path)
-
-            completed_count = 0
-            start_time = time.time()
-            
-            def process_chunk(chunk_data):
-                idx, chunk_text, path = chunk_data
+
+            pages_done = pages_total = 0
+            headers = HeaderFooterDetector()
+            if text is not None:
+                if isinstance(text, str):
+                    project.extracted_text = text
+                    if manifest.chunk_budget is None:
+                        manifest.chunk_budget = self._choose_budget(len(text))
+                    if previous_chunks:
+                        chunks = self.text_service.rechunk(text, previous_chunks, budget=manifest.chunk_budget)
+                    else:
+                        chunks = self.text_service.chunk_text(text, budget=manifest.chunk_budget)
+                    # The whole text is known: count first, so repeats are cut out from the first one
+                    counts = self.text_service.count_sentences(chunks)
+                    project.chunks = list(self.text_service.isolate_repeats(chunks, counts=counts))
+                    if previous_chunks:
+                        unchanged = set(previous_chunks)
+                        changed = sum(1 for chunk in project.chunks if chunk not in unchanged)
+                        self._log(f"Texto editado: {changed} de {len(project.chunks)} fragmentos cambiaron.")
+                    # Edited text can't be rebuilt from the PDF: record it all up front
+                    if self.jobs:
+                        self.jobs.append_texts(manifest, enumerate(project.chunks, start=1))
+                    manifest.source_complete = True
+                else:
+                    project.chunks = text
+                chunk_source = project.chunks
+                total_chunks = len(chunk_source)
+                if total_chunks == 0: raise Exception("No hay texto.")
+                self._log(f"Plan de audio: {total_chunks} fragmentos.")
+            else:
+                # Stream straight from the PDF through staged threads with bounded
+                # queues: parsing/OCR -> normalization/chunking -> synthesis
+                # dispatch (this thread) -> assembly/encoding (render thread).
+                # A slow stage blocks the ones before it instead of piling up data.
+                def page_texts():
+                    nonlocal pages_done, pages_total
+                    for page in self.extractor.iter_pages(pdf_path, cancel_event=cancel_event):
+                        pages_done, pages_total = page.number, page.total
+                        yield page.text
+
+                def chunks():
+                    return self.text_service.isolate_repeats(self.text_service.chunk_stream(
+                        headers.stream(extract_stage), budget=manifest.chunk_budget,
+                        language=self.text_service.language_of(manifest.voice_settings.voice_id)
+                    ))
+
+                if manifest.chunk_budget is None:
+                    pages = self.extractor.page_count(pdf_path)
+                    manifest.chunk_budget = self._choose_budget(pages and pages * self.AVG_PAGE_CHARS)
+                    self._save_manifest(manifest)
+                extract_stage = PipelineStage(f"extract-{base_name}", page_texts, self.pipeline.page_queue, cancel_event)
+                chunk_stage = PipelineStage(f"chunk-{base_name}", chunks, self.pipeline.chunk_queue, cancel_event)
+                stages = [extract_stage.start(), chunk_stage.start()]
+                chunk_source = chunk_stage
+                total_chunks = None
+                self._log("Plan de audio: extracción y síntesis en paralelo.")
+
+            submitted_count = 0
+            cache_hits = 0
+            resumed_count = 0
+            # Audio of short chunks already synthesized in this job (isolated
+            # repeated sentences), and repeats waiting on an in-flight twin
+            repeat_audio: "OrderedDict[str, bytes]" = OrderedDict()
+            twins: Dict[str, List[int]] = {}
+            repeat_chars = 0
+
+            def estimate_total(done):
+                # Unknown total while streaming: extrapolate from pages parsed so far
+                if not pages_total:
+                    return None
+                return max(submitted_count * pages_total / max(pages_done, 1), submitted_count)
+
+            def progress_details():
+                return f" - Páginas: {pages_done}/{pages_total}" if total_chunks is None and pages_total else ""
+
+            progress = ProgressReporter(
+                progress_callback, "synthesis", "Generando", 0.15, 0.75,
+                total=total_chunks, estimate=estimate_total, suffix=progress_details, limiter=self.limiter
+            )
+
+            # Streaming assembler: ffmpeg consumes chunks 1..k as soon as they
+            # are all present, so the output grows (and is playable) during the job
+            assembler = OrderedChunkBuffer()
+            # Copied context: the render thread records into this job's metrics
+            render_thread = threading.Thread(
+                target=contextvars.copy_context().run, args=(run_render, assembler, partial_path),
+                name=f"render-{base_name}", daemon=True
+            )
+            render_thread.start()
+
+            in_flight = {}
+
+            def reuse(idx, chunk, audio):
+                nonlocal repeat_chars
+                metrics.count("repeat.hit", index=idx, chars=len(chunk))
+                assembler.put(idx, audio)
+                # The first occurrence put this audio in the cache already
+                self._checkpoint(manifest, idx, audio, keep_part=not self.cache)
+                repeat_chars += len(chunk)
+                progress.advance(bytes=len(audio), chars=len(chunk))
+
+            def collect(done):
+                for future in done:
+                    idx, chunk_text, text_hash, submitted = in_flight.pop(future)
+                    try:
+                        audio = future.result()
+                    except Exception:
+                        manifest.chunks[idx].status = "failed"
+                        raise
+                    metrics.observe(
+                        "synthesis.chunk", time.monotonic() - submitted,
+                        index=idx, chars=len(chunk_text), bytes=len(audio)
+                    )
+                    metrics.count("synthesis.bytes", len(audio))
+                    assembler.put(idx, audio)
+                    cached = self.cache is not None and self.cache.save_bytes(
+                        chunk_text, voice_settings.voice_id,
+                        voice_settings.rate, voice_settings.pitch, audio
+                    )
+                    self._checkpoint(manifest, idx, audio, keep_part=not cached)
+                    progress.advance(bytes=len(audio), chars=len(chunk_text))
+                    for twin in twins.pop(text_hash, []):
+                        reuse(twin, chunk_text, audio)
+                    if len(chunk_text) <= self.REPEAT_MEMO_MAX_CHARS:
+                        repeat_audio[text_hash] = audio
+                        if len(repeat_audio) > self.REPEAT_MEMO_ENTRIES:
+                            repeat_audio.popitem(last=False)
+
+            def wait_some():
                 check_cancel()
-                self.generator.generate_speech(chunk_text, path, voice_settings)
-                return idx
+                if "error" in render_result:
+                    raise render_result["error"]
+                done, _ = concurrent.futures.wait(
+                    in_flight, timeout=self.POLL_INTERVAL, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                collect(done)
 
-            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = {executor.submit(process_chunk, t): t[0] for t in chunk_tasks}
-                for future in concurrent.futures.as_completed(futures):
+            def wait_encoder(count):
+                # Chunks synthesized too far ahead would pile up in the reorder buffer
+                if in_flight:
+                    wait_some()
+                    return
+                check_cancel()
+                if "error" in render_result:
+                    raise render_result["error"]
+                assembler.wait_flushed(count, timeout=self.POLL_INTERVAL)
+
+            try:
+                for idx, chunk in enumerate(chunk_source, start=1):
                     check_cancel()
-                    future.result()
-                    completed_count += 1
-                    
-                    elapsed = time.time() - start_time
-                    avg = elapsed / completed_count
-                    eta = int(avg * (total_chunks - completed_count))
-                    
-                    if progress_callback:
-                        progress = 0.15 + (0.6 * (completed_count / total_chunks))
-                        msg = f"Generando: {completed_count}/{total_chunks} - ETA: {eta}s"
-                        progress_callback(msg, progress)
+                    submitted_count += 1
+                    while idx - assembler.flushed > self.pipeline.reorder_window:
+                        wait_encoder(idx - self.pipeline.reorder_window)
+
+                    text_hash = JobManifestRepository.text_hash(chunk)
+                    record = manifest.chunks.get(idx)
+                    if record and record.text_hash == text_hash:
+                        # Checkpointed by an earlier run of this job
+                        saved = self.jobs.read_part(record) if self.jobs else None
+                        if saved is not None:
+                            metrics.count("resume.hit", index=idx)
+                            assembler.put(idx, saved)
+                            resumed_count += 1
+                            progress.advance(bytes=len(saved), chars=len(chunk))
+                            continue
+                    else:
+                        if self.jobs and not manifest.source_complete:
+                            self.jobs.append_text(manifest, idx, chunk)
+                        record = manifest.chunks[idx] = ChunkRecord(index=idx, text_hash=text_hash)
+                    record.status = "pending"
+
+                    # Cache hits are a local read; only misses go to the speech engine
+                    cached = self._cached_audio(chunk, voice_settings)
+                    if self.cache:
+                        metrics.count("cache.hit" if cached is not None else "cache.miss", index=idx)
+                    if cached is not None:
+                        assembler.put(idx, cached)
+                        self._checkpoint(manifest, idx, cached, keep_part=False)
+                        cache_hits += 1
+                        progress.advance(bytes=len(cached), chars=len(chunk))
+                        continue
+
+                    # Same text as a chunk already synthesized (or in flight) in this job
+                    if text_hash in repeat_audio:
+                        repeat_audio.move_to_end(text_hash)
+                        reuse(idx, chunk, repeat_audio[text_hash])
+                        continue
+                    if text_hash in twins:
+                        twins[text_hash].append(idx)
+                        continue
+
+                    if self.scheduler:
+                        # One slot of the global budget per chunk in flight
+                        while not self.scheduler.acquire(manifest.job_id, timeout=self.POLL_INTERVAL):
+                            check_cancel()
+                            collect([f for f in in_flight if f.done()])
+                    future, = self.generator.submit_many([chunk], voice_settings)
+                    if self.scheduler:
+                        future.add_done_callback(lambda _f: self.scheduler.release(manifest.job_id))
+                    in_flight[future] = (idx, chunk, text_hash, time.monotonic())
+                    twins[text_hash] = []
+
+                    # Bounded window keeps memory flat regardless of document length
+                    while len(in_flight) >= self.pipeline.synthesis_window:
+                        wait_some()
+                    collect([f for f in in_flight if f.done()])
+
+                if submitted_count == 0: raise Exception("No hay texto.")
+                total_chunks = submitted_count
+                progress.set_total(total_chunks)
+                manifest.source_complete = True
+                self._save_manifest(manifest)
+                while in_flight:
+                    wait_some()
+                if text is None:
+                    manifest.chars_saved["headers"] = headers.saved_chars
+                manifest.chars_saved["repeats"] = manifest.chars_saved.get("repeats", 0) + repeat_chars
+            finally:
+                for future in in_flight:
+                    future.cancel()
 
             check_cancel()
-            project.generated_files.sort()
-
-            self._log("Uniendo fragmentos de audio...")
-            if progress_callback: progress_callback("Finalizando mezcla...", 0.9)
-            temp_merged_path = os.path.join(project_dir, f"{base_name}_temp_merged.mp3")
-            self.processor.merge_wavs(project.generated_files, temp_merged_path)
-
-            final_mp3_path = os.path.join(project_dir, f"{base_name}_mixed.mp3")
-            self._log("Aplicando mezcla final...")
-            self.processor.mix_with_bgm(
-                temp_merged_path, 
-                bgm_path if bgm_path and os.path.exists(bgm_path) else "", 
-                final_mp3_path, 
-                voice_settings.volume, 
-                bgm_volume
-            )
+            if self.cache:
+                self._log(f"Caché: {cache_hits} aciertos, {total_chunks - cache_hits - resumed_count} fallos.")
+            if resumed_count:
+                self._log(f"Reanudación: {resumed_count} fragmentos recuperados del trabajo anterior.")
+            if headers.saved_chars:
+                self._log(f"Encabezados y pies de página repetidos eliminados: {headers.saved_chars} caracteres.")
+            if repeat_chars:
+                self._log(f"Frases repetidas reutilizadas: {repeat_chars} caracteres sin sintetizar.")
+
+            self._log("Cerrando mezcla de audio...")
+            progress.finish()
+            ProgressReporter(progress_callback, "render", "Mezcla", 0.9, 1.0).announce("Finalizando mezcla...")
+            assembler.finish(total_chunks)
+            # The final encode can take a while with BGM: keep honoring cancellation
+            with metrics.span("render.close"):
+                while render_thread.is_alive():
+                    render_thread.join(self.POLL_INTERVAL)
+                    check_cancel()
+            if "error" in render_result:
+                raise render_result["error"]
+            os.replace(render_result["path"], final_mp3_path)
+            project.final_mp3_path = final_mp3_path
+
+            # The final file holds everything now; checkpoints are no longer needed
+            manifest.status = "completed"
+            manifest.final_path = project.final_mp3_path
+            if self.jobs:
+                self.jobs.discard_parts(manifest)
+            self._save_manifest(manifest)
 
-            self._log(f"¡Proceso completado! Archivo final: {final_mp3_path}")
-            return final_mp3_path
+            self._log(f"¡Proceso completado! Archivo final: {project.final_mp3_path}")
+            return project.final_mp3_path
 
-        except InterruptedError: return None
+        except InterruptedError:
+            manifest.status = "cancelled"
+            self._save_manifest(manifest)
+            if self.jobs: self._log(f"Trabajo {manifest.job_id} guardado; puede reanudarse.")
+            return None
         except Exception as e:
+            manifest.status = "failed"
+            self._save_manifest(manifest)
             self._log(f"Error en el pipeline: {str(e)}", "ERROR")
+            if self.jobs: self._log(f"Trabajo {manifest.job_id} guardado; puede reanudarse.")
             raise e
         finally:
-            self._log("Limpiando archivos temporales...")
-            for f in project.generated_files:
-                if os.path.exists(f): os.remove(f)
-            if temp_merged_path and os.path.exists(temp_merged_path): os.remove(temp_merged_path)
+            for stage in stages:
+                stage.close()
+            if render_thread and render_thread.is_alive():
+                assembler.abort()
+                render_thread.join()
+            if manifest.status != "completed" and os.path.exists(partial_path):
+                try: os.remove(partial_path)
+                except OSError: pass
+            if self.cache:
+                try: self.cache.flush()
+                except OSError as e: self._log(f"No se pudo guardar el índice de caché: {e}", "WARN")
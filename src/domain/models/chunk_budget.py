@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass(frozen=True)
+class ChunkBudget:
+    """Upper bounds for one synthesis request. None means unbounded."""
+    max_chars: Optional[int] = None
+    max_words: Optional[int] = 3500
+    max_bytes: Optional[int] = None # UTF-8
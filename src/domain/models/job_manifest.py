@@ -0,0 +1,28 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from src.domain.models.chunk_budget import ChunkBudget
+from src.domain.models.voice_settings import VoiceSettings
+
+@dataclass
+class ChunkRecord:
+    index: int # 1-based
+    text_hash: str
+    status: str = "pending" # pending | done | failed
+    output_path: Optional[str] = None
+    duration: float = 0.0
+
+@dataclass
+class JobManifest:
+    job_id: str
+    pdf_path: str
+    project_dir: str
+    base_name: str
+    voice_settings: VoiceSettings
+    bgm_path: Optional[str] = None
+    bgm_volume: float = 0.2
+    status: str = "running" # running | completed | failed | cancelled
+    source_complete: bool = False # every chunk text has been recorded
+    chunk_budget: Optional[ChunkBudget] = None # so a resumed job re-chunks identically
+    final_path: Optional[str] = None
+    chars_saved: Dict[str, int] = field(default_factory=dict) # characters not synthesized, by reason
+    chunks: Dict[int, ChunkRecord] = field(default_factory=dict)
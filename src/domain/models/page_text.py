@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass(frozen=True)
+class PageText:
+    number: int # 1-based
+    total: int
+    text: str
+    method: str = "Direct"
+    ocr_lang: Optional[str] = None
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass(frozen=True)
+class PipelineSettings:
+    """Queue sizes and worker counts of the conversion pipeline stages:
+    extraction -> chunking -> synthesis -> assembly/encoding."""
+    page_queue: int = 8 # parsed pages waiting for the chunker
+    chunk_queue: int = 16 # chunks waiting to be sent to synthesis
+    synthesis_window: int = 64 # chunks in flight per document
+    reorder_window: int = 128 # chunks synthesized ahead of the encoder
+    ocr_workers: Optional[int] = None # OCR processes (None: one per CPU)
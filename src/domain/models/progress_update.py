@@ -0,0 +1,19 @@
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass(frozen=True)
+class ProgressUpdate:
+    """One progress report: where a job is, and how fast it moves."""
+    stage: str # "extract", "synthesis" or "render"
+    message: str
+    fraction: float # of the whole job, 0..1
+    done: int = 0 # units finished in this stage (pages, chunks)
+    total: Optional[int] = None # None while unknown
+    estimated: bool = False # total extrapolated while streaming
+    bytes: int = 0 # audio produced so far
+    chars_per_second: float = 0.0
+    eta: Optional[float] = None # seconds left in this stage
+    # Synthesis service, from the concurrency limiter; None in other stages
+    concurrency: Optional[int] = None # requests allowed at once
+    error_rate: Optional[float] = None # of recent requests, 0..1
+    latency_ms: Optional[float] = None # smoothed request latency
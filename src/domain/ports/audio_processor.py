@@ -1,5 +1,6 @@
+import threading
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, Iterable, List, Optional, Union
 
 class AudioProcessorPort(ABC):
     @abstractmethod
@@ -12,6 +13,27 @@ class AudioProcessorPort(ABC):
         """Mixes voice audio with background music."""
         pass
 
+    @abstractmethod
+    def render(
+        self,
+        chunks: Iterable[Union[bytes, str]],
+        output_path: str,
+        voice_vol: float = 1.0,
+        bgm_path: str = "",
+        bgm_vol: float = 0.2,
+        silences: Optional[Dict[int, float]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> str:
+        """Builds the final audio from ordered MP3 chunks (bytes or file paths)
+        in exactly one pass: concat, optional silences after chunk i
+        (0-based), voice volume and background music. Encodes at most once.
+        Raises InterruptedError soon after cancel_event is set."""
+        pass
+
+    def get_duration(self, data: bytes) -> float:
+        """Returns the duration in seconds of encoded audio, or 0.0 if unknown."""
+        return 0.0
+
     @abstractmethod
     def convert_to_mp3(self, input_path: str) -> str:
         """Converts an audio file to MP3 format."""
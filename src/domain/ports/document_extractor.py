@@ -1,8 +1,33 @@
+import threading
 from abc import ABC, abstractmethod
-from typing import Tuple, Dict, Any
+from typing import Tuple, Dict, Any, Iterable, Iterator, Optional
+from src.domain.models.page_text import PageText
 
 class DocumentExtractorPort(ABC):
     @abstractmethod
     def extract_text(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
         """Extracts text and metadata from a document file."""
         pass
+
+    def iter_pages(
+        self,
+        file_path: str,
+        pages: Optional[Iterable[int]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[PageText]:
+        """Yields pages in order as they are parsed, optionally only the given
+        1-based page numbers. Raises InterruptedError soon after cancel_event
+        is set, even in the middle of OCR.
+
+        The default extracts the whole document and yields it as a single page.
+        """
+        text, _ = self.extract_text(file_path)
+        yield PageText(number=1, total=1, text=text)
+
+    def page_count(self, file_path: str) -> Optional[int]:
+        """Number of pages without extracting them, or None if unknown."""
+        return None
+
+    def ocr_language(self) -> Optional[str]:
+        """Language setting used for OCR'd pages, or None if OCR is unavailable."""
+        return None
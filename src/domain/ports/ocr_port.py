@@ -1,5 +1,6 @@
+import threading
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, Iterable, Iterator, List, Optional
 
 class OcrPort(ABC):
     @abstractmethod
@@ -7,6 +8,19 @@ class OcrPort(ABC):
         """Recognizes text from a list of image file paths."""
         pass
 
+    def extract_pages_from_images(self, image_paths: List[str]) -> List[str]:
+        """Recognizes each image separately, returning one text per image in order."""
+        return [self.extract_text_from_images([path]) for path in image_paths]
+
+    @abstractmethod
+    def extract_text_from_image_stream(
+        self, images: Iterable[Any], cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[str]:
+        """Recognizes a lazily produced sequence of images (paths or in-memory
+        images), yielding one text per image in order. Raises InterruptedError
+        soon after cancel_event is set."""
+        pass
+
     @abstractmethod
     def is_available(self) -> bool:
         """Checks if the OCR engine is installed and configured."""
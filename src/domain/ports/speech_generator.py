@@ -1,4 +1,9 @@
+import asyncio
+import concurrent.futures
+import os
+import tempfile
 from abc import ABC, abstractmethod
+from typing import Iterator, List
 from src.domain.models.voice_settings import VoiceSettings
 
 class SpeechGeneratorPort(ABC):
@@ -6,3 +11,45 @@ class SpeechGeneratorPort(ABC):
     def generate_speech(self, text: str, output_path: str, settings: VoiceSettings) -> None:
         """Generates audio from text and saves it to a file."""
         pass
+
+    def synthesize(self, text: str, settings: VoiceSettings) -> bytes:
+        """Generates audio from text and returns the encoded bytes.
+
+        The default goes through generate_speech and a temporary file;
+        adapters that receive audio in memory should override it.
+        """
+        fd, path = tempfile.mkstemp(suffix=".mp3")
+        os.close(fd)
+        try:
+            self.generate_speech(text, path, settings)
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            os.remove(path)
+
+    def stream_speech(self, text: str, settings: VoiceSettings) -> Iterator[bytes]:
+        """Yields the encoded audio in pieces as the service delivers them,
+        so playback can start before synthesis ends.
+
+        The default yields the whole of synthesize at once; adapters that
+        receive audio incrementally should override it.
+        """
+        yield self.synthesize(text, settings)
+
+    def submit_many(self, texts: List[str], settings: VoiceSettings) -> List[concurrent.futures.Future]:
+        """Schedules a batch of texts, returning one future per text that
+        resolves to its audio bytes.
+
+        The default runs synthesize on a small thread pool; adapters with a
+        native async engine should override it.
+        """
+        executor = getattr(self, "_batch_executor", None)
+        if executor is None:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+            self._batch_executor = executor
+        return [executor.submit(self.synthesize, text, settings) for text in texts]
+
+    async def generate_many(self, texts: List[str], settings: VoiceSettings) -> List[bytes]:
+        """Awaits synthesis of a whole batch, returning audio bytes in order."""
+        futures = self.submit_many(texts, settings)
+        return await asyncio.gather(*(asyncio.wrap_future(f) for f in futures))
@@ -0,0 +1,194 @@
+import asyncio
+import collections
+import contextvars
+import time
+from typing import Deque, Dict, Hashable, Optional, Tuple
+
+# Job a request is made for. Set by the caller, inherited by the asyncio
+# task that runs the request; requests without one share a single queue.
+request_owner: "contextvars.ContextVar[Optional[Hashable]]" = contextvars.ContextVar("request_owner", default=None)
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD limiter shared by every synthesis request.
+
+    The in-flight limit grows additively (about +1 per round of successful
+    requests) while latency stays healthy, and is cut multiplicatively on
+    errors. Throttling errors also start a global cool-down during which no
+    request is admitted, so all workers back off together.
+
+    Requests waiting for a slot are admitted by owner (request_owner) rather
+    than first come first served: a freed slot goes to the owner with the
+    fewest requests in flight, so a small job is not queued behind the
+    backlog of a large one.
+
+    acquire()/release() must be called from the same event loop, and from
+    the same task for one request; snapshot() is safe to read from any thread.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        cooldown: float = 5.0,
+        max_cooldown: float = 60.0,
+        window: int = 50
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self._limit = float(max(min_limit, min(initial, max_limit)))
+        self._in_flight = 0
+        self._waiters: Deque[Tuple[Hashable, asyncio.Future]] = collections.deque()
+        self._held: "collections.Counter[Hashable]" = collections.Counter() # in flight per owner
+        self._outcomes: Deque[bool] = collections.deque(maxlen=window)
+        self._latency_ewma: Optional[float] = None
+        self._best_unit_latency: Optional[float] = None
+        self._cooldown_until = 0.0
+        self._throttle_streak = 0
+        self._last_decrease = 0.0
+        # Decayed least-squares fit of latency = overhead + unit_latency * size
+        self._fit = [0.0, 0.0, 0.0, 0.0, 0.0] # n, sum x, sum y, sum xx, sum xy
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    async def acquire(self):
+        """Waits for a free slot outside of any global cool-down."""
+        loop = asyncio.get_running_loop()
+        owner = request_owner.get()
+        woken = False
+        while True:
+            delay = self._cooldown_until - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            # A newcomer only takes a slot no queued request was woken for
+            if self._in_flight < self.limit and (woken or not self._waiters):
+                self._in_flight += 1
+                self._held[owner] += 1
+                return
+            waiter = loop.create_future()
+            entry = (owner, waiter)
+            if woken:
+                self._waiters.appendleft(entry) # lost the slot: keep its turn
+            else:
+                self._waiters.append(entry)
+            try:
+                await waiter
+                woken = True
+            except asyncio.CancelledError:
+                # A wake-up meant for this waiter goes to the next one
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+            finally:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+
+    def _return_slot(self):
+        self._in_flight = max(0, self._in_flight - 1)
+        owner = request_owner.get()
+        self._held[owner] -= 1
+        if self._held[owner] <= 0:
+            del self._held[owner]
+
+    def release(self, success: bool, latency: float, throttled: bool = False, size: int = 1):
+        """Returns a slot and feeds the request outcome into the AIMD policy.
+
+        size is the request cost (e.g. characters): latency is judged against
+        what the fitted latency model predicts for that size, so long chunks
+        are not mistaken for a slow service, nor short ones held to the
+        per-character pace of long ones.
+        """
+        self._return_slot()
+        self._outcomes.append(success)
+        now = time.monotonic()
+
+        if success:
+            self._throttle_streak = 0
+            self._latency_ewma = latency if self._latency_ewma is None else 0.8 * self._latency_ewma + 0.2 * latency
+            if self._healthy(latency, size):
+                self._limit = min(self.max_limit, self._limit + 1.0 / self._limit)
+            n, sx, sy, sxx, sxy = (v * 0.95 for v in self._fit)
+            self._fit = [n + 1, sx + size, sy + latency, sxx + size * size, sxy + size * latency]
+        # Only one decrease per cool-down period: a burst of failures from the
+        # same window should not collapse the limit to the minimum
+        elif now - self._last_decrease >= self.cooldown:
+            self._last_decrease = now
+            self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+
+        if throttled:
+            self._throttle_streak += 1
+            pause = min(self.max_cooldown, self.cooldown * (2 ** (self._throttle_streak - 1)))
+            self._cooldown_until = max(self._cooldown_until, now + pause)
+
+        self._wake()
+
+    def _healthy(self, latency: float, size: int) -> bool:
+        """Whether a success took no longer than latency_tolerance times what
+        the fitted latency model expects for its size. Judged before the
+        sample joins the fit, so a slow request does not excuse itself.
+
+        Until the model can be fitted, the best per-unit latency seen stands
+        in for it; that baseline ignores the fixed overhead, so it is only
+        a stopgap for the first requests.
+        """
+        model = self.latency_model()
+        if model is not None:
+            overhead, per_unit = model
+            return latency <= (overhead + per_unit * size) * self.latency_tolerance
+        unit = latency / max(size, 1)
+        if self._best_unit_latency is None or unit < self._best_unit_latency:
+            self._best_unit_latency = unit
+        return unit <= self._best_unit_latency * self.latency_tolerance
+
+    def discard(self):
+        """Returns the slot of a cancelled request without judging the service by it."""
+        self._return_slot()
+        self._wake()
+
+    def _wake(self):
+        free = self.limit - self._in_flight
+        woken: "collections.Counter[Hashable]" = collections.Counter()
+        while free > 0 and self._waiters:
+            # Fewest requests in flight (or about to be) first; oldest among equals
+            owners = [owner for owner, _ in self._waiters]
+            i = min(range(len(owners)), key=lambda i: (self._held[owners[i]] + woken[owners[i]], i))
+            owner, waiter = self._waiters[i]
+            del self._waiters[i]
+            if not waiter.done():
+                waiter.set_result(None)
+                woken[owner] += 1
+                free -= 1
+
+    def latency_model(self) -> Optional[Tuple[float, float]]:
+        """(per-request overhead in seconds, seconds per size unit) fitted from
+        recent successes, or None until requests of different sizes were seen."""
+        n, sx, sy, sxx, sxy = self._fit
+        spread = n * sxx - sx * sx
+        if n < 3 or spread <= 1e-9 * n * sxx:
+            return None
+        slope = (n * sxy - sx * sy) / spread
+        if slope <= 0:
+            return None
+        return max(0.0, (sy - slope * sx) / n), slope
+
+    def snapshot(self) -> Dict[str, float]:
+        """Current limit, load, error rate and smoothed latency."""
+        outcomes = list(self._outcomes)
+        errors = outcomes.count(False)
+        return {
+            "limit": self.limit,
+            "in_flight": self._in_flight,
+            "error_rate": errors / len(outcomes) if outcomes else 0.0,
+            "latency": self._latency_ewma or 0.0,
+            "cooldown": max(0.0, self._cooldown_until - time.monotonic()),
+        }
@@ -0,0 +1,63 @@
+import math
+from typing import Optional, Tuple
+from src.domain.models.chunk_budget import ChunkBudget
+
+class ChunkSizeTuner:
+    """Chooses the chunk size for a job to minimize wall-clock time.
+
+    Small chunks keep every worker busy and make a failed request cheap to
+    retry; large chunks amortize the fixed per-request overhead. The size
+    starts from the parallelism target (IN_FLIGHT_FACTOR chunks per worker)
+    and is capped when requests fail; that cap never drops below the size at
+    which overhead stays a small share of each request. Without failures the
+    parallelism target alone decides, so a short document still spreads over
+    every worker. Sizes snap to a fixed ladder so re-running a document
+    usually reproduces the same chunks (and hits the audio cache).
+    """
+
+    # Character sizes a chunk may take; the largest is about 2,800 words
+    LADDER = (1000, 2000, 4000, 8000, 16000)
+    IN_FLIGHT_FACTOR = 2
+    # Defaults until the limiter has observed enough requests
+    DEFAULT_OVERHEAD = 1.0 # seconds per request
+    DEFAULT_UNIT_LATENCY = 1 / 800 # seconds per character
+    # Overhead should stay under this share of a request's time
+    MAX_OVERHEAD_SHARE = 0.1
+
+    def choose(
+        self,
+        total_chars: int,
+        workers: int,
+        latency_model: Optional[Tuple[float, float]] = None,
+        failure_rate: float = 0.0
+    ) -> Tuple[ChunkBudget, str]:
+        """Returns the budget and a one-line explanation for the journal."""
+        workers = max(1, workers)
+        overhead, unit = latency_model or (self.DEFAULT_OVERHEAD, self.DEFAULT_UNIT_LATENCY)
+        source = "observada" if latency_model else "estimada"
+
+        target = total_chars / (self.IN_FLIGHT_FACTOR * workers)
+        reasons = [f"{total_chars} caracteres / ({self.IN_FLIGHT_FACTOR}×{workers} trabajadores) = {int(target)}"]
+        size = target
+
+        if failure_rate > 0:
+            # Each failure re-sends the whole chunk: shrink as failures rise
+            floor = overhead * (1 - self.MAX_OVERHEAD_SHARE) / self.MAX_OVERHEAD_SHARE / unit
+            cap = max(floor, self.LADDER[-1] * max(0.1, 1 - 3 * failure_rate))
+            if cap < size:
+                size = cap
+                reasons.append(f"errores {failure_rate:.0%} → tope {int(cap)}")
+
+        chosen = self.LADDER[0]
+        for step in self.LADDER:
+            if step <= size:
+                chosen = step
+
+        chunks = max(1, math.ceil(total_chars / chosen))
+        rounds = math.ceil(chunks / workers)
+        estimate = rounds * (overhead + chosen * unit)
+        reasons.append(
+            f"latencia {source} {overhead:.1f}s + {unit * 1000:.2f}s/1000 car."
+            f" → ~{chunks} fragmentos, ~{int(estimate)}s"
+        )
+        return ChunkBudget(max_chars=chosen, max_words=None), "; ".join(reasons)
@@ -0,0 +1,77 @@
+import itertools
+import threading
+from collections import Counter
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+class FairShareScheduler:
+    """Global synthesis budget shared fairly between concurrent jobs.
+
+    Every chunk sent to the speech engine holds one slot until it finishes.
+    When a slot frees up it goes to the waiting job that currently holds the
+    fewest slots (oldest request first on ties), so a small document that
+    joins late is served right away instead of queueing behind the backlog
+    of a large one.
+
+    With limit (e.g. the adaptive limiter's current limit), the budget never
+    exceeds what the speech engine admits at once, re-read on every check.
+    Otherwise the excess would queue first-come-first-served inside the
+    engine, where a large job's backlog holds back everyone else.
+    """
+
+    def __init__(self, capacity: int = 32, limit: Optional[Callable[[], int]] = None):
+        self._cond = threading.Condition()
+        self._capacity = max(1, capacity)
+        self._limit = limit
+        self._held: Counter = Counter()
+        self._waiting: List[Tuple[int, Hashable]] = [] # (ticket, owner)
+        self._tickets = itertools.count()
+
+    @property
+    def capacity(self) -> int:
+        if self._limit is None:
+            return self._capacity
+        return max(1, min(self._capacity, self._limit()))
+
+    def set_capacity(self, capacity: int):
+        with self._cond:
+            self._capacity = max(1, capacity)
+            self._cond.notify_all()
+
+    def _next_owner(self) -> Optional[Hashable]:
+        if not self._waiting:
+            return None
+        _, owner = min(self._waiting, key=lambda w: (self._held[w[1]], w[0]))
+        return owner
+
+    def acquire(self, owner: Hashable, timeout: Optional[float] = None) -> bool:
+        """Blocks until owner gets a slot. Returns False on timeout."""
+        with self._cond:
+            ticket = (next(self._tickets), owner)
+            self._waiting.append(ticket)
+            try:
+                granted = self._cond.wait_for(
+                    lambda: sum(self._held.values()) < self.capacity and self._next_owner() == owner,
+                    timeout
+                )
+                if granted:
+                    self._held[owner] += 1
+                return granted
+            finally:
+                self._waiting.remove(ticket)
+                self._cond.notify_all()
+
+    def release(self, owner: Hashable):
+        with self._cond:
+            self._held[owner] -= 1
+            if self._held[owner] <= 0:
+                del self._held[owner]
+            self._cond.notify_all()
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._cond:
+            return {
+                "capacity": self.capacity,
+                "in_use": sum(self._held.values()),
+                "jobs": len(self._held),
+                "waiting": len(self._waiting),
+            }
@@ -0,0 +1,89 @@
+import re
+from collections import Counter
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+_DIGITS = re.compile(r'\d+')
+_SPACES = re.compile(r'\s+')
+
+class HeaderFooterDetector:
+    """Strips running headers and footers from extracted pages.
+
+    A line counts as one when the same text (page numbers aside) appears at
+    the same position, counted in non-blank lines from the top or from the
+    bottom, on most pages seen so far. Only lines at the edges of a page are
+    removed, so a repeated sentence in the body is kept. One detector per
+    document: it accumulates line counts and the characters it removed.
+    """
+
+    DEPTH = 3 # lines examined at each edge of a page
+    MIN_SHARE = 0.5 # of the pages seen
+    MIN_PAGES = 3 # repeats needed before anything is removed
+    WINDOW = 8 # pages read before stream() yields the first one
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.pages_seen = 0
+        self.saved_chars = 0
+
+    # Only lines this short may differ in their numbers ("Página 3 de 120")
+    MAX_NUMBERED_CHARS = 80
+
+    @classmethod
+    def _key(cls, line: str) -> str:
+        line = _SPACES.sub(" ", line).strip().lower()
+        return _DIGITS.sub("#", line) if len(line) <= cls.MAX_NUMBERED_CHARS else line
+
+    def _edge_keys(self, lines: List[str]) -> Tuple[List[Tuple[int, str]], List[Tuple[int, str]]]:
+        """(line index, key) of the first and last DEPTH non-blank lines."""
+        filled = [i for i, line in enumerate(lines) if line.strip()]
+        top = [(i, ("top", n, self._key(lines[i]))) for n, i in enumerate(filled[:self.DEPTH])]
+        bottom = [(i, ("bottom", n, self._key(lines[i]))) for n, i in enumerate(reversed(filled[-self.DEPTH:]))]
+        return top, bottom
+
+    def learn(self, page: str):
+        top, bottom = self._edge_keys(page.split("\n"))
+        self.counts.update({key for _, key in top + bottom})
+        self.pages_seen += 1
+
+    def _repeated(self, key) -> bool:
+        return self.counts[key] >= max(self.MIN_PAGES, self.MIN_SHARE * self.pages_seen)
+
+    def strip(self, page: str) -> str:
+        lines = page.split("\n")
+        top, bottom = self._edge_keys(lines)
+        drop = set()
+        for edge in (top, bottom):
+            # Peel from the edge inwards; stop at the first line that isn't boilerplate
+            for i, key in edge:
+                if not self._repeated(key):
+                    break
+                drop.add(i)
+        # A page made only of repeated lines is more likely body text in a
+        # regular layout than pure boilerplate: keep it
+        if not drop or all(i in drop for i, line in enumerate(lines) if line.strip()):
+            return page
+        self.saved_chars += sum(len(lines[i]) + 1 for i in drop)
+        return "\n".join(line for i, line in enumerate(lines) if i not in drop)
+
+    def strip_pages(self, pages: List[str]) -> List[str]:
+        """Learns from every page, then strips them all."""
+        for page in pages:
+            self.learn(page)
+        return [self.strip(page) for page in pages]
+
+    def stream(self, pages: Iterable[str]) -> Iterator[str]:
+        """Strips pages as they arrive, after a short look-ahead of WINDOW pages."""
+        window: Optional[List[str]] = []
+        for page in pages:
+            self.learn(page)
+            if window is not None:
+                window.append(page)
+                if len(window) < self.WINDOW:
+                    continue
+                for held in window:
+                    yield self.strip(held)
+                window = None
+            else:
+                yield self.strip(page)
+        for held in window or []:
+            yield self.strip(held)
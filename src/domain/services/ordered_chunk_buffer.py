@@ -0,0 +1,66 @@
+import threading
+from typing import Dict, Iterator, Optional
+
+class OrderedChunkBuffer:
+    """Reorders audio chunks that complete out of order.
+
+    Producers put() chunks by index from any thread; a single consumer
+    iterates and receives them strictly in sequence, blocking until the next
+    expected chunk arrives. Only out-of-order chunks are held in memory.
+    """
+
+    def __init__(self, start: int = 1):
+        self._cond = threading.Condition()
+        self._pending: Dict[int, bytes] = {}
+        self._next = start
+        self._start = start
+        self._end: Optional[int] = None
+        self._error: Optional[BaseException] = None
+
+    def put(self, idx: int, data: bytes):
+        with self._cond:
+            self._pending[idx] = data
+            self._cond.notify_all()
+
+    def finish(self, total: int):
+        """Declares the total chunk count so iteration can end."""
+        with self._cond:
+            self._end = self._start + total
+            self._cond.notify_all()
+
+    def abort(self, error: Optional[BaseException] = None):
+        """Makes the consumer stop with error (InterruptedError by default)."""
+        with self._cond:
+            self._error = error or InterruptedError("Ensamblado cancelado.")
+            self._pending.clear()
+            self._cond.notify_all()
+
+    @property
+    def flushed(self) -> int:
+        """Number of chunks already handed to the consumer."""
+        with self._cond:
+            return self._next - self._start
+
+    def wait_flushed(self, count: int, timeout: Optional[float] = None) -> bool:
+        """Blocks until at least count chunks were handed to the consumer.
+        Lets producers stay a bounded distance ahead of a slow consumer."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._next - self._start >= count or self._error is not None, timeout
+            )
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            with self._cond:
+                while True:
+                    if self._error:
+                        raise self._error
+                    if self._next in self._pending:
+                        data = self._pending.pop(self._next)
+                        self._next += 1
+                        self._cond.notify_all() # producers may be waiting in wait_flushed()
+                        break
+                    if self._end is not None and self._next >= self._end:
+                        return
+                    self._cond.wait()
+            yield data
@@ -0,0 +1,93 @@
+import contextvars
+import queue
+import threading
+from typing import Callable, Generic, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+class PipelineStage(Generic[T]):
+    """Runs a producer on its own thread and hands its items to a single
+    consumer through a bounded queue.
+
+    A full queue blocks the producer (backpressure); an empty one blocks the
+    consumer. Both sides poll the cancel event, so a cancelled pipeline
+    drains within POLL_INTERVAL. A producer error is re-raised in the
+    consumer, and closing a stage ends any stage that reads from it. The
+    producer runs in a copy of the creator's context variables (e.g. the
+    job whose metrics it records).
+    """
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(
+        self,
+        name: str,
+        produce: Callable[[], Iterable[T]],
+        maxsize: int,
+        cancel_event: Optional[threading.Event] = None
+    ):
+        self.name = name
+        self._produce = produce
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, maxsize))
+        self._cancel = cancel_event or threading.Event()
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        context = contextvars.copy_context()
+        self._thread = threading.Thread(target=context.run, args=(self._run,), name=name, daemon=True)
+
+    def start(self) -> "PipelineStage[T]":
+        self._thread.start()
+        return self
+
+    def _stopped(self) -> bool:
+        return self._stop.is_set() or self._cancel.is_set()
+
+    def _put(self, item) -> bool:
+        while not self._stopped():
+            try:
+                self._queue.put(item, timeout=self.POLL_INTERVAL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _run(self):
+        try:
+            for item in self._produce():
+                if not self._put(item):
+                    return
+        except BaseException as e:
+            self._error = e
+        self._put(_DONE)
+
+    def __iter__(self) -> Iterator[T]:
+        while True:
+            if self._cancel.is_set():
+                raise InterruptedError("Proceso cancelado.")
+            if self._stop.is_set():
+                # Closed after a failure downstream: a stage reading from this
+                # one must end too instead of polling forever
+                raise InterruptedError("Etapa cerrada.")
+            try:
+                item = self._queue.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                continue
+            if item is _DONE:
+                if self._error is not None:
+                    raise self._error
+                return
+            yield item
+
+    def close(self, timeout: float = 1.0):
+        """Stops the producer and waits briefly for its thread to exit."""
+        self._stop.set()
+        # Unblock a producer waiting on a full queue
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
@@ -0,0 +1,137 @@
+import threading
+import time
+from typing import Callable, Optional
+from src.domain.models.progress_update import ProgressUpdate
+from src.domain.services.adaptive_limiter import AdaptiveConcurrencyLimiter
+
+class ProgressReporter:
+    """Progress of one stage of a job, shown as the slice [start, end] of
+    the overall bar.
+
+    advance() only adds to counters; a ProgressUpdate is built and passed to
+    the callback at most once per interval, so it can be called from hot
+    loops. Rates are exponentially weighted moving averages over those
+    reports: the ETA follows the current pace rather than the average since
+    the start, which stalls and throttling would skew for the rest of the job.
+    """
+
+    # Seconds between reports
+    INTERVAL = 0.25
+    # Weight of the newest rate sample in the moving averages
+    SMOOTHING = 0.3
+
+    def __init__(
+        self,
+        callback: Optional[Callable[[ProgressUpdate], None]],
+        stage: str,
+        label: str,
+        start: float = 0.0,
+        end: float = 1.0,
+        total: Optional[int] = None,
+        estimate: Optional[Callable[[int], Optional[float]]] = None,
+        suffix: Optional[Callable[[], str]] = None,
+        interval: Optional[float] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None
+    ):
+        """estimate(done) extrapolates the total while it is unknown; suffix()
+        adds details to the message. Both run only when a report is due, as
+        does the limiter snapshot that fills in the service's load."""
+        self.callback = callback
+        self.stage = stage
+        self.label = label
+        self.start = start
+        self.end = end
+        self.total = total
+        self.estimate = estimate
+        self.suffix = suffix
+        self.interval = self.INTERVAL if interval is None else interval
+        self.limiter = limiter
+        self.done = 0
+        self.bytes = 0
+        self.chars = 0
+        self._lock = threading.Lock()
+        self._started = self._last_time = time.monotonic()
+        self._next_report = self._started + self.interval
+        self._last_done = self._last_chars = 0
+        self._rate: Optional[float] = None # units per second
+        self._char_rate = 0.0
+
+    def advance(self, count: int = 1, bytes: int = 0, chars: int = 0):
+        if self.callback is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            self.done += count
+            self.bytes += bytes
+            self.chars += chars
+            if now < self._next_report:
+                return
+            update = self._snapshot(now)
+        self.callback(update)
+
+    def set_total(self, total: int):
+        self.total = total
+
+    def finish(self):
+        """Reports the final counts regardless of the interval."""
+        if self.callback is None:
+            return
+        with self._lock:
+            update = self._snapshot(time.monotonic())
+        self.callback(update)
+
+    def announce(self, message: str, fraction: Optional[float] = None):
+        """Reports a one-off message, e.g. the start of a step with no units."""
+        if self.callback is None:
+            return
+        self.callback(ProgressUpdate(
+            stage=self.stage, message=message,
+            fraction=self.start if fraction is None else fraction,
+            done=self.done, total=self.total, bytes=self.bytes
+        ))
+
+    def _snapshot(self, now: float) -> ProgressUpdate:
+        # Called with the lock held
+        elapsed = now - self._last_time
+        if elapsed > 0:
+            rate = (self.done - self._last_done) / elapsed
+            char_rate = (self.chars - self._last_chars) / elapsed
+            if self._rate is None:
+                self._rate, self._char_rate = rate, char_rate
+            else:
+                self._rate += self.SMOOTHING * (rate - self._rate)
+                self._char_rate += self.SMOOTHING * (char_rate - self._char_rate)
+            self._last_time, self._last_done, self._last_chars = now, self.done, self.chars
+        self._next_report = now + self.interval
+
+        total, estimated = self.total, False
+        if total is None and self.estimate:
+            guess = self.estimate(self.done)
+            if guess:
+                total, estimated = max(int(guess), self.done), True
+        fraction = min(self.done / total, 1.0) if total else 0.0
+        eta = None
+        if total and self._rate:
+            eta = max(total - self.done, 0) / self._rate
+
+        shown_total = total if not estimated else f"~{total}"
+        message = f"{self.label}: {self.done}/{shown_total if total else '?'}"
+        if eta is not None:
+            message += f" - ETA: {int(eta)}s"
+        if self.suffix:
+            message += self.suffix()
+        concurrency = error_rate = latency_ms = None
+        if self.limiter:
+            stats = self.limiter.snapshot()
+            concurrency, error_rate = stats["limit"], round(stats["error_rate"], 3)
+            latency_ms = round(stats["latency"] * 1000)
+            message += (f" - Concurrencia: {concurrency}"
+                        f" - Errores: {error_rate:.0%}"
+                        f" - Latencia: {stats['latency']:.1f}s")
+        return ProgressUpdate(
+            stage=self.stage, message=message,
+            fraction=self.start + (self.end - self.start) * fraction,
+            done=self.done, total=total, estimated=estimated, bytes=self.bytes,
+            chars_per_second=round(self._char_rate, 1), eta=eta,
+            concurrency=concurrency, error_rate=error_rate, latency_ms=latency_ms
+        )
@@ -0,0 +1,407 @@
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+# --- Number words -------------------------------------------------------------
+
+_ES_UNITS = (
+    "cero uno dos tres cuatro cinco seis siete ocho nueve diez once doce trece catorce quince "
+    "dieciséis diecisiete dieciocho diecinueve veinte veintiuno veintidós veintitrés veinticuatro "
+    "veinticinco veintiséis veintisiete veintiocho veintinueve"
+).split()
+_ES_TENS = ("", "", "", "treinta", "cuarenta", "cincuenta", "sesenta", "setenta", "ochenta", "noventa")
+_ES_HUNDREDS = ("", "ciento", "doscientos", "trescientos", "cuatrocientos", "quinientos",
+                "seiscientos", "setecientos", "ochocientos", "novecientos")
+_ES_MONTHS = ("enero febrero marzo abril mayo junio julio agosto septiembre octubre noviembre diciembre").split()
+
+_EN_UNITS = (
+    "zero one two three four five six seven eight nine ten eleven twelve thirteen fourteen "
+    "fifteen sixteen seventeen eighteen nineteen"
+).split()
+_EN_TENS = ("", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety")
+_EN_ORDINALS = {"one": "first", "two": "second", "three": "third", "five": "fifth",
+                "eight": "eighth", "nine": "ninth", "twelve": "twelfth"}
+_EN_MONTHS = ("January February March April May June July August September October November December").split()
+
+# Longer numbers are read digit by digit (IDs, phone numbers...)
+_MAX_DIGITS = 15
+
+def _es_below_1000(n: int) -> str:
+    if n < 30:
+        return _ES_UNITS[n]
+    if n < 100:
+        tens, unit = divmod(n, 10)
+        return _ES_TENS[tens] + (f" y {_ES_UNITS[unit]}" if unit else "")
+    if n == 100:
+        return "cien"
+    hundreds, rest = divmod(n, 100)
+    return _ES_HUNDREDS[hundreds] + (f" {_es_below_1000(rest)}" if rest else "")
+
+def es_apocope(words: str) -> str:
+    """'uno' becomes 'un' before a noun: veintiún dólares, treinta y un mil."""
+    if words.endswith("veintiuno"):
+        return words[:-3] + "ún"
+    if words.endswith("uno"):
+        return words[:-1]
+    return words
+
+def es_cardinal(n: int) -> str:
+    if n == 0:
+        return "cero"
+    parts = []
+    for value, singular, plural in ((10 ** 12, "un billón", "billones"), (10 ** 6, "un millón", "millones")):
+        count, n = divmod(n, value)
+        if count:
+            parts.append(singular if count == 1 else f"{es_apocope(es_cardinal(count))} {plural}")
+    thousands, n = divmod(n, 1000)
+    if thousands:
+        parts.append("mil" if thousands == 1 else f"{es_apocope(_es_below_1000(thousands))} mil")
+    if n:
+        parts.append(_es_below_1000(n))
+    return " ".join(parts)
+
+def _en_below_1000(n: int) -> str:
+    hundreds, rest = divmod(n, 100)
+    words = [f"{_EN_UNITS[hundreds]} hundred"] if hundreds else []
+    if rest >= 20:
+        tens, unit = divmod(rest, 10)
+        words.append(_EN_TENS[tens] + (f"-{_EN_UNITS[unit]}" if unit else ""))
+    elif rest or not hundreds:
+        words.append(_EN_UNITS[rest])
+    return " ".join(words)
+
+def en_cardinal(n: int) -> str:
+    if n == 0:
+        return "zero"
+    parts = []
+    for value, name in ((10 ** 12, "trillion"), (10 ** 9, "billion"), (10 ** 6, "million"), (10 ** 3, "thousand")):
+        count, n = divmod(n, value)
+        if count:
+            parts.append(f"{en_cardinal(count)} {name}")
+    if n:
+        parts.append(_en_below_1000(n))
+    return " ".join(parts)
+
+def en_ordinal(n: int) -> str:
+    words = en_cardinal(n)
+    cut = max(words.rfind(" "), words.rfind("-")) + 1
+    last = words[cut:]
+    if last in _EN_ORDINALS:
+        last = _EN_ORDINALS[last]
+    elif last.endswith("y"):
+        last = last[:-1] + "ieth"
+    else:
+        last += "th"
+    return words[:cut] + last
+
+def en_year(n: int) -> str:
+    if n < 1000 or n > 9999 or 2000 <= n <= 2009 or n % 1000 == 0:
+        return en_cardinal(n)
+    high, low = divmod(n, 100)
+    if low == 0:
+        return f"{en_cardinal(high)} hundred"
+    if low < 10:
+        return f"{en_cardinal(high)} oh {en_cardinal(low)}"
+    return f"{en_cardinal(high)} {en_cardinal(low)}"
+
+def _parse_number(token: str) -> Optional[Tuple[int, str]]:
+    """Splits '1.234,5' / '1,234.5' / '3,5' into (integer, decimals digits).
+
+    With both separators the last one is the decimal mark; a single
+    separator followed by exactly three digits is a thousands separator.
+    """
+    dots, commas = token.count("."), token.count(",")
+    if dots and commas:
+        decimal = "." if token.rfind(".") > token.rfind(",") else ","
+        whole, _, frac = token.rpartition(decimal)
+        groups = whole.replace("." if decimal == "," else ",", "")
+        return (int(groups), frac) if groups.isdigit() and frac.isdigit() else None
+    sep = "." if dots else "," if commas else None
+    if sep is None:
+        return int(token), ""
+    parts = token.split(sep)
+    if len(parts) == 2 and (len(parts[1]) != 3 or parts[0] == "0"):
+        return int(parts[0]), parts[1]
+    if all(len(p) == 3 for p in parts[1:]) and len(parts[0]) <= 3:
+        return int("".join(parts)), ""
+    return None
+
+# --- Language rule sets -------------------------------------------------------
+
+@dataclass(frozen=True)
+class LanguageRules:
+    cardinal: Callable[[int], str]
+    noun_cardinal: Callable[[int], str] # form used before a noun (un dólar, veintiún mil)
+    year: Callable[[int], str] # bare four-digit numbers between 1100 and 2099
+    decimal_word: str
+    percent_word: str
+    currency_joiner: str # between units and cents
+    currencies: Dict[str, Tuple[str, str, str, str]] # symbol -> unit, units, cent, cents
+    symbols: Dict[str, str]
+    abbreviations: Dict[str, str]
+    date: Callable[[int, int, int], Optional[str]] # (first, second, year) as written
+    time: Callable[[int, int], Optional[str]] # (hours, minutes) of an H:MM clock time
+    # Spoken number followed by a noun (treinta y un años); None: unchanged
+    noun_form: Optional[Callable[[str], str]] = None
+    # Words after a number that are not the noun it counts (el 21 de mayo, 31 es primo)
+    function_words: FrozenSet[str] = frozenset()
+
+def _es_date(day: int, month: int, year: int) -> Optional[str]:
+    if not (1 <= day <= 31 and 1 <= month <= 12):
+        return None
+    day_words = "primero" if day == 1 else es_cardinal(day)
+    return f"{day_words} de {_ES_MONTHS[month - 1]} de {es_cardinal(year)}"
+
+def _es_time(hours: int, minutes: int) -> Optional[str]:
+    if hours > 23:
+        return None
+    # la una, las veintiuna: the hour agrees with the feminine 'hora'
+    words = "una" if hours == 1 else "veintiuna" if hours == 21 else es_cardinal(hours)
+    return f"{words} en punto" if minutes == 0 else f"{words} y {es_cardinal(minutes)}"
+
+def _en_date(month: int, day: int, year: int) -> Optional[str]:
+    if not (1 <= day <= 31 and 1 <= month <= 12):
+        return None
+    return f"{_EN_MONTHS[month - 1]} {en_ordinal(day)}, {en_year(year)}"
+
+def _en_time(hours: int, minutes: int) -> Optional[str]:
+    if hours > 23:
+        return None
+    if minutes == 0:
+        return f"{en_cardinal(hours)} o'clock"
+    return f"{en_cardinal(hours)} {'oh ' if minutes < 10 else ''}{en_cardinal(minutes)}"
+
+RULES: Dict[str, LanguageRules] = {
+    "es": LanguageRules(
+        cardinal=es_cardinal,
+        noun_cardinal=lambda n: es_apocope(es_cardinal(n)),
+        year=es_cardinal,
+        decimal_word="coma",
+        percent_word="por ciento",
+        currency_joiner="con",
+        currencies={"$": ("dólar", "dólares", "centavo", "centavos"),
+                    "€": ("euro", "euros", "céntimo", "céntimos")},
+        symbols={"&": "y", "@": "arroba", "#": "número", "%": "por ciento"},
+        abbreviations={
+            "Sr.": "señor", "Sra.": "señora", "Srta.": "señorita", "Dr.": "doctor", "Dra.": "doctora",
+            "Lic.": "licenciado", "Ing.": "ingeniero", "Mtro.": "maestro", "Ud.": "usted", "Uds.": "ustedes",
+            "etc.": "etcétera.", "pág.": "página", "págs.": "páginas", "núm.": "número", "aprox.": "aproximadamente",
+            "art.": "artículo", "cap.": "capítulo", "fig.": "figura", "vol.": "volumen", "tel.": "teléfono",
+            "Av.": "avenida", "p. ej.": "por ejemplo", "EE. UU.": "Estados Unidos", "EE.UU.": "Estados Unidos",
+        },
+        date=_es_date,
+        time=_es_time,
+        noun_form=es_apocope,
+        function_words=frozenset(
+            "y e o u ni que de del a al en por para con sin sobre entre hasta desde como según "
+            "el la los las lo le les se me te nos su sus es son era eran fue fueron ha han está están "
+            "más menos".split()
+        ),
+    ),
+    "en": LanguageRules(
+        cardinal=en_cardinal,
+        noun_cardinal=en_cardinal,
+        year=en_year,
+        decimal_word="point",
+        percent_word="percent",
+        currency_joiner="and",
+        currencies={"$": ("dollar", "dollars", "cent", "cents"),
+                    "€": ("euro", "euros", "cent", "cents")},
+        symbols={"&": "and", "@": "at", "#": "number", "%": "percent"},
+        abbreviations={
+            "Mr.": "Mister", "Mrs.": "Missus", "Ms.": "Miz", "Dr.": "Doctor", "Prof.": "Professor",
+            "etc.": "et cetera.", "e.g.": "for example", "i.e.": "that is", "vs.": "versus",
+            "approx.": "approximately", "Fig.": "Figure", "fig.": "figure",
+        },
+        date=_en_date,
+        time=_en_time,
+    ),
+}
+
+# --- Engine ------------------------------------------------------------------
+
+# Whitespace that starts a run to collapse
+_WHITESPACE_TRIGGERS = "\n\r\t\f\v\xa0     　"
+_DIGIT_TOKEN = r'(?:\d?(?::[0-5]\d){1,2}(?![:\d])|\d?(?:/\d{1,2}/|\.\d{1,2}\.|-\d{1,2}-)\d{4}(?!\d)|\d*(?:[.,]\d+)*(?:\s?[%€])?)'
+_SPACE_RUN = re.compile(r' {2,}')
+_NUMBER_MEMO_SIZE = 4096
+# Memo miss; None is a valid memoized value (token left as written)
+_MISSING = object()
+_MONEY_TOKEN = r'\s?\d+(?:[.,]\d+)*'
+# Word after a number, on the same line or the next
+_NEXT_WORD = re.compile(r'[^\S\n]*\n?[^\S\n]*([^\W\d_]+)')
+
+@dataclass
+class _CompiledRules:
+    pattern: "re.Pattern"
+    rules: Optional[LanguageRules]
+    abbreviation_lengths: List[int] = field(default_factory=list)
+    # Spoken form of number tokens already seen (page numbers, years...)
+    numbers: Dict[str, Optional[str]] = field(default_factory=dict)
+
+class TextNormalizer:
+    """Rewrites text for narration in one scan.
+
+    Each language's rules are compiled (once, on first use) into a single
+    regex whose alternatives all start with a literal character, so the
+    regex engine skips straight from one trigger character to the next
+    (digits, symbols, whitespace runs, hyphens, abbreviation dots); plain
+    text between triggers is copied as slices. Handles hyphenated line
+    breaks, whitespace (blank lines are kept as paragraph breaks), dates,
+    clock times, currency, percentages, numbers, symbols and abbreviations.
+    """
+
+    _compiled: Dict[str, _CompiledRules] = {}
+
+    def __init__(self, language: str = "es"):
+        # Languages without a rule set only get whitespace and hyphen cleanup
+        self.language = language
+
+    @classmethod
+    def _compile(cls, language: str) -> _CompiledRules:
+        compiled = cls._compiled.get(language)
+        if compiled is not None:
+            return compiled
+        rules = RULES.get(language)
+        branches = [re.escape(c) + r'\s*' for c in _WHITESPACE_TRIGGERS]
+        # Hyphenated line break between two word characters
+        branches.append(r'-(?<=\w-)[ \t]*\r?\n[ \t]*(?=\w)')
+        by_length: Dict[int, List[str]] = {}
+        if rules is not None:
+            branches += [f"{d}{_DIGIT_TOKEN}" for d in "0123456789"]
+            branches += [re.escape(s) + _MONEY_TOKEN for s in rules.currencies]
+            branches += [re.escape(s) + r'[ \t]*' for s in rules.symbols]
+            # Abbreviations end in a dot: look back for one of each length
+            for abbreviation in rules.abbreviations:
+                by_length.setdefault(len(abbreviation), []).append(r'\b' + re.escape(abbreviation))
+            lookbehinds = "|".join(f"(?<={'|'.join(alts)})" for alts in by_length.values())
+            branches.append(rf'\.(?:{lookbehinds})')
+
+        compiled = _CompiledRules(
+            pattern=re.compile("|".join(branches)),
+            rules=rules,
+            abbreviation_lengths=sorted(by_length, reverse=True),
+        )
+        cls._compiled[language] = compiled
+        return compiled
+
+    def normalize(self, text: str) -> str:
+        """Normalizes text without trimming its ends, so blocks of a larger
+        text can be normalized separately and concatenated."""
+        compiled = self._compile(self.language)
+        rules = compiled.rules
+        numbers = compiled.numbers
+        out: List[str] = []
+        pos = 0
+        for match in compiled.pattern.finditer(text):
+            start, end = match.span()
+            token = match.group()
+            first = token[0]
+
+            if first.isspace():
+                out.append(text[pos:start].rstrip(" "))
+                out.append("\n\n" if token.count("\n") >= 2 else " ")
+            elif first.isdigit():
+                # Part of a word or code (mp3, A4, 10km): left alone
+                if (start > 0 and text[start - 1].isalpha()) or (end < len(text) and text[end].isalpha()):
+                    continue
+                # One lookup: the memo is shared with other threads, which may
+                # clear it between a membership test and a read
+                words = numbers.get(token, _MISSING)
+                if words is _MISSING:
+                    if len(numbers) >= _NUMBER_MEMO_SIZE:
+                        numbers.clear()
+                    words = numbers[token] = self._number_token(token, rules)
+                if words is None:
+                    continue # left as written; copied with the next slice
+                if rules.noun_form is not None and token.isdigit() and len(token) <= _MAX_DIGITS:
+                    following = _NEXT_WORD.match(text, end)
+                    if following and following.group(1).lower() not in rules.function_words:
+                        words = rules.noun_form(words)
+                out.append(text[pos:start])
+                out.append(words)
+            elif first == "-":
+                out.append(text[pos:start])
+            elif first == ".":
+                for length in compiled.abbreviation_lengths:
+                    key = text[end - length:end]
+                    if key in rules.abbreviations:
+                        out.append(text[pos:end - length])
+                        out.append(rules.abbreviations[key])
+                        break
+                else:
+                    continue
+            elif first in rules.currencies:
+                words = self._money(token[1:].strip(), first, rules)
+                if words is None:
+                    continue
+                out.append(text[pos:start])
+                out.append(words)
+            else: # symbol
+                out.append(text[pos:start])
+                if start > 0 and not text[start - 1].isspace():
+                    out.append(" ")
+                out.append(rules.symbols[first])
+                if end < len(text) and not text[end].isspace():
+                    out.append(" ")
+            pos = end
+        out.append(text[pos:])
+        result = "".join(out)
+        # Plain spaces are too common to be triggers: runs of them are
+        # collapsed afterwards, only when there are any
+        if "  " in result:
+            result = _SPACE_RUN.sub(" ", result)
+        return result
+
+    def _number_token(self, token: str, rules: LanguageRules) -> Optional[str]:
+        if ":" in token:
+            parts = [int(part) for part in token.split(":")]
+            words = rules.time(*parts) if len(parts) == 2 else None
+            # Durations and scores (1:30:00, 25:30): each number on its own
+            return words or ":".join(rules.cardinal(part) for part in parts)
+        if len(token) >= 8 and token[-5] in "/.-" and token[-5] == token[1 if token[1] in "/.-" else 2]:
+            first, second, year = re.split(r'[/.\-]', token)
+            return rules.date(int(first), int(second), int(year))
+
+        suffix = ""
+        if token[-1] in "%€":
+            suffix = token[-1]
+            token = token[:-1].rstrip()
+        if suffix == "€":
+            return self._money(token, "€", rules)
+        words = self._number(token, rules)
+        if words is None:
+            return None
+        return f"{words} {rules.percent_word}" if suffix else words
+
+    @staticmethod
+    def _number(token: str, rules: LanguageRules) -> Optional[str]:
+        if len(token) > _MAX_DIGITS and token.isdigit():
+            return " ".join(rules.cardinal(int(d)) for d in token)
+        if len(token) == 4 and token.isdigit() and 1100 <= int(token) <= 2099:
+            return rules.year(int(token))
+        parsed = _parse_number(token)
+        if parsed is None:
+            return None
+        whole, frac = parsed
+        words = rules.cardinal(whole)
+        if frac:
+            if frac[0] == "0" or len(frac) > 3:
+                frac_words = " ".join(rules.cardinal(int(d)) for d in frac)
+            else:
+                frac_words = rules.cardinal(int(frac))
+            words = f"{words} {rules.decimal_word} {frac_words}"
+        return words
+
+    @staticmethod
+    def _money(token: str, symbol: str, rules: LanguageRules) -> Optional[str]:
+        parsed = _parse_number(token)
+        if parsed is None:
+            return None
+        whole, frac = parsed
+        unit, units, cent, cents = rules.currencies[symbol]
+        words = f"{rules.noun_cardinal(whole)} {unit if whole == 1 else units}"
+        cent_value = int((frac + "00")[:2]) if frac else 0
+        if cent_value:
+            words += f" {rules.currency_joiner} {rules.noun_cardinal(cent_value)} {cent if cent_value == 1 else cents}"
+        return words
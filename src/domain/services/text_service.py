@@ -1,64 +1,318 @@
 import re
-from typing import List
+import sys
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from src.domain.models.chunk_budget import ChunkBudget
+from src.domain.services.text_normalizer import TextNormalizer
 
 class TextService:
+    # Bump whenever preprocess() output changes, to invalidate cached extractions
+    PREPROCESS_VERSION = 2
+
+    def __init__(self, language: str = "es"):
+        self.language = language
+
     @staticmethod
-    def preprocess(text: str) -> str:
-        """Cleans and normalizes text for TTS (Restored to simple version)."""
+    def language_of(voice_id: Optional[str]) -> Optional[str]:
+        """Language code of an Edge TTS voice ('es-MX-DaliaNeural' -> 'es')."""
+        return voice_id.split("-")[0].lower() if voice_id else None
+
+    def _normalizer(self, language: Optional[str]) -> TextNormalizer:
+        return TextNormalizer(language or self.language)
+
+    def preprocess(self, text: str, language: Optional[str] = None) -> str:
+        """Cleans and normalizes text for TTS: joins hyphenated line breaks,
+        collapses whitespace (keeping blank lines as paragraph breaks) and
+        spells out numbers, dates, currency, symbols and abbreviations."""
         if not text:
             return ""
-        
-        # Join hyphenated words
-        text = re.sub(r'(\w)-\n(\w)', r'\1\2', text)
-        
-        # Normalize newlines
-        text = text.replace('\r\n', '\n')
-        
-        # Replace multiple spaces with single space
-        text = re.sub(r'\s+', ' ', text)
-        
-        return text.strip()
+        return self._normalizer(language).normalize(text).strip()
 
     @staticmethod
-    def chunk_text(text: str, word_limit: int = 3500) -> List[str]:
+    def _budget(word_limit: int, budget: Optional[ChunkBudget]) -> ChunkBudget:
+        return budget if budget is not None else ChunkBudget(max_words=word_limit)
+
+    @staticmethod
+    def chunk_text(text: str, word_limit: int = 3500, budget: Optional[ChunkBudget] = None) -> List[str]:
         """
-        Splits text into simple chunks respecting sentence boundaries.
-        Increased limit to 3500 words for better API efficiency.
+        Splits text into chunks within the budget (word_limit words by default),
+        cutting at paragraph, then sentence, then clause boundaries.
         """
         if not text:
             return []
-        
-        # Split by sentence endings (. ! ?), keeping the punctuation
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        
-        chunks = []
-        current_chunk = []
-        current_word_count = 0
-        
-        for sentence in sentences:
-            sentence_word_count = len(sentence.split())
-            
-            if sentence_word_count > word_limit:
-                if current_chunk:
-                    chunks.append(" ".join(current_chunk))
-                    current_chunk = []
-                    current_word_count = 0
-                
-                words = sentence.split()
-                for i in range(0, len(words), word_limit):
-                    sub_chunk = " ".join(words[i:i + word_limit])
-                    chunks.append(sub_chunk)
-                continue
+        return list(_pack(_segments(text), TextService._budget(word_limit, budget)))
+
+    @staticmethod
+    def rechunk(
+        text: str,
+        previous: List[str],
+        word_limit: int = 3500,
+        budget: Optional[ChunkBudget] = None
+    ) -> List[str]:
+        """
+        Chunks an edited version of a text that was chunked before, keeping
+        every previous chunk whose sentences still appear unchanged and in
+        place. Only the text between kept chunks is packed anew, so an edit
+        changes the chunk it falls in (two if it grows past the budget) and
+        leaves every other chunk, and its audio, as it was.
+        """
+        if not text:
+            return []
+        segments = list(_segments(text))
+        # Previous chunks by their first sentence. Re-splitting a chunk gives
+        # back the segments it was packed from, with the same boundaries
+        # between them (the last one always reads as the end of a paragraph)
+        starts: Dict[str, List[Tuple[str, List[Tuple[str, int]]]]] = {}
+        for chunk in previous:
+            parts = list(_segments(chunk))
+            if parts:
+                starts.setdefault(parts[0][0], []).append((chunk, parts))
 
-            if current_word_count + sentence_word_count > word_limit:
-                chunks.append(" ".join(current_chunk))
-                current_chunk = [sentence]
-                current_word_count = sentence_word_count
-            else:
-                current_chunk.append(sentence)
-                current_word_count += sentence_word_count
-                
-        if current_chunk:
-            chunks.append(" ".join(current_chunk))
-            
+        def matches(i: int, parts: List[Tuple[str, int]]) -> bool:
+            last = i + len(parts) - 1
+            return (last < len(segments) and segments[last][0] == parts[-1][0]
+                    and all(segments[i + k] == part for k, part in enumerate(parts[:-1])))
+
+        budget = TextService._budget(word_limit, budget)
+        chunks: List[str] = []
+        gap: List[Tuple[str, int]] = []
+        i = 0
+        while i < len(segments):
+            kept = next(((chunk, parts) for chunk, parts in starts.get(segments[i][0], ()) if matches(i, parts)), None)
+            if kept is None:
+                gap.append(segments[i])
+                i += 1
+                continue
+            chunks.extend(_pack(gap, budget))
+            gap = []
+            chunks.append(kept[0])
+            i += len(kept[1])
+        chunks.extend(_pack(gap, budget))
         return chunks
+
+    def chunk_stream(
+        self,
+        pages: Iterable[str],
+        word_limit: int = 3500,
+        budget: Optional[ChunkBudget] = None,
+        language: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        Preprocesses and chunks raw page texts incrementally.
+        A chunk is yielded as soon as it is full, so only the text of the
+        chunk being built is held in memory.
+        """
+        normalizer = self._normalizer(language)
+
+        def segments() -> Iterator[Tuple[str, int]]:
+            held = None # kept back so hyphen joins and blank lines across pages still work
+            tail = "" # unfinished sentence carried to the next page
+            for page in pages:
+                raw = page if held is None else f"{held}\n{page}"
+                cut = _safe_cut(raw)
+                if cut <= 0:
+                    held = raw
+                    continue
+                ready, held = raw[:cut], raw[cut:]
+
+                # Blocks start with the whitespace run that separates them from
+                # the previous one, so its normalized form (" " or "\n\n") joins them
+                text = normalizer.normalize(ready)
+                last = None
+                for piece in _segments(tail + text if tail else text.lstrip()):
+                    if last is not None:
+                        yield last
+                    last = piece
+                tail = last[0]
+
+            rest = (tail + normalizer.normalize(held or "")).strip()
+            if rest:
+                yield from _segments(rest)
+
+        return _pack(segments(), TextService._budget(word_limit, budget))
+
+    @staticmethod
+    def count_sentences(chunks: Iterable[str], min_chars: int = 40) -> Counter:
+        """Occurrences of each sentence (of at least min_chars), by hash."""
+        return Counter(hash(segment) for chunk in chunks for segment, _ in _segments(chunk) if len(segment) >= min_chars)
+
+    @staticmethod
+    def isolate_repeats(
+        chunks: Iterable[str], min_chars: int = 40, min_count: int = 3, counts: Optional[Counter] = None
+    ) -> Iterator[str]:
+        """
+        Gives sentences (of at least min_chars) that recur at least min_count
+        times a chunk of their own. Identical chunks have identical audio, so
+        such a sentence is synthesized once and then reused. A sentence seen
+        only twice stays in place: cutting it out would cost a request and
+        break the intonation around it for no saving.
+
+        With counts (from count_sentences over the whole document) every
+        occurrence is isolated, the first one included, so reuse starts at
+        the second. Streamed documents are counted as they go, and a
+        sentence is isolated from its min_count-th occurrence on.
+        """
+        seen = Counter() # hashes only, so memory stays flat on long documents
+        tally = seen if counts is None else counts
+        for chunk in chunks:
+            run: List[Tuple[str, int]] = []
+            isolated = False
+            for segment, level in _segments(chunk):
+                if len(segment) >= min_chars:
+                    key = hash(segment)
+                    if counts is None:
+                        seen[key] += 1
+                    if tally[key] >= min_count:
+                        if run:
+                            yield _join(run)
+                            run = []
+                        isolated = True
+                        yield segment
+                        continue
+                run.append((segment, level))
+            if run:
+                yield _join(run) if isolated else chunk
+
+# Boundary strength; chunks prefer to end at the strongest one available
+WORD, CLAUSE, SENTENCE, PARAGRAPH = 0, 1, 2, 3
+_SEPARATORS = {PARAGRAPH: "\n\n"}
+# Sentence end or newline, plus the whitespace after it (classified in _segments)
+_BOUNDARY = re.compile(r'[.!?\n]\s+')
+_CLAUSE_SPLIT = re.compile(r'(?<=[,;:])\s+')
+_WHITESPACE = re.compile(r'\s+')
+# A cut may move back to a stronger boundary as long as the chunk stays this full
+_MIN_FILL = 0.5
+
+def _safe_cut(raw: str) -> int:
+    """Start of the whitespace run around the last line break of raw that is
+    not a hyphenated word break, or -1. Normalizing the text on either side
+    separately gives the same result as normalizing it whole."""
+    cut = raw.rfind("\n")
+    while cut >= 0:
+        start = cut
+        while start > 0 and raw[start - 1].isspace():
+            start -= 1
+        if start == 0 or raw[start - 1] != "-":
+            return start
+        cut = raw.rfind("\n", 0, start)
+    return -1
+
+def _segments(text: str) -> Iterator[Tuple[str, int]]:
+    """Yields (segment, strength of the boundary after it) in one regex scan.
+
+    Sentence ends are whitespace after . ! or ?; blank lines end paragraphs.
+    A single line break inside a sentence is not a boundary.
+    """
+    pos = 0
+    for match in _BOUNDARY.finditer(text):
+        start = match.start()
+        paragraph = match.group().count("\n") >= 2
+        if text[start] == "\n":
+            if not paragraph:
+                continue
+            segment = text[pos:start].rstrip()
+        else:
+            segment = text[pos:start + 1]
+        if segment:
+            yield segment, PARAGRAPH if paragraph else SENTENCE
+        pos = match.end()
+    if pos < len(text):
+        yield text[pos:], PARAGRAPH
+
+def _join(segments: List[Tuple[str, int]]) -> str:
+    out = []
+    for segment, level in segments:
+        out.append(segment)
+        out.append(_SEPARATORS.get(level, " "))
+    out.pop()
+    return "".join(out)
+
+def _cost(segment: str) -> Tuple[int, int, int]:
+    """(chars, words, bytes) of a segment. Words are whitespace characters + 1,
+    exact for normalized text and never an undercount otherwise."""
+    chars = len(segment)
+    words = segment.count(" ") + segment.count("\n") + segment.count("\t") + 1
+    size = chars if segment.isascii() else len(segment.encode("utf-8"))
+    return chars, words, size
+
+def _split_finer(segment: str, level: int, budget: ChunkBudget) -> List[Tuple[str, int]]:
+    """Breaks a segment that can't fit in a chunk on its own: clauses, then words,
+    then (for a single giant token) fixed-size slices."""
+    for pattern, finer in ((_CLAUSE_SPLIT, CLAUSE), (_WHITESPACE, WORD)):
+        parts = pattern.split(segment)
+        if len(parts) > 1:
+            return [(p, finer) for p in parts[:-1]] + [(parts[-1], level)]
+    max_bytes = budget.max_bytes and (budget.max_bytes if segment.isascii() else budget.max_bytes // 4)
+    limits = [n for n in (budget.max_chars, max_bytes) if n]
+    step = max(1, min(limits)) if limits else len(segment)
+    pieces = [segment[i:i + step] for i in range(0, len(segment), step)]
+    return [(p, WORD) for p in pieces[:-1]] + [(pieces[-1], level)]
+
+def _pack(pieces: Iterable[Tuple[str, int]], budget: ChunkBudget) -> Iterator[str]:
+    """Greedily fills chunks up to the budget in one pass over the segments.
+
+    When the next segment doesn't fit, the chunk ends at the strongest
+    boundary among those that keep it at least half full (latest wins ties);
+    the segments after the cut start the next chunk.
+    """
+    unbounded = sys.maxsize
+    max_chars = budget.max_chars or unbounded
+    max_words = budget.max_words or unbounded
+    max_bytes = budget.max_bytes or unbounded
+    # A cut at i keeps the chunk half full if every bounded total reaches half its limit
+    half = (max_chars * _MIN_FILL, max_words * _MIN_FILL, max_bytes * _MIN_FILL)
+
+    segs: List[str] = []
+    levels: List[int] = [] # boundary after each segment
+    # Running totals: chars[i] etc. cover segs[:i] including separators
+    chars, words, size = [0], [0], [0]
+
+    def push(seg: str, level: int, cost: Tuple[int, int, int]):
+        sep = (2 if levels[-1] == PARAGRAPH else 1) if segs else 0
+        segs.append(seg)
+        levels.append(level)
+        chars.append(chars[-1] + sep + cost[0])
+        words.append(words[-1] + cost[1])
+        size.append(size[-1] + sep + cost[2])
+
+    def join(count: int) -> str:
+        out = []
+        for seg, level in zip(segs[:count - 1], levels):
+            out.append(seg)
+            out.append(_SEPARATORS.get(level, " "))
+        out.append(segs[count - 1])
+        return "".join(out)
+
+    for piece in pieces:
+        stack = [piece]
+        while stack:
+            seg, level = stack.pop()
+            cost = _cost(seg)
+            sep = (2 if levels[-1] == PARAGRAPH else 1) if segs else 0
+            if (chars[-1] + sep + cost[0] <= max_chars and words[-1] + cost[1] <= max_words
+                    and size[-1] + sep + cost[2] <= max_bytes):
+                push(seg, level, cost)
+                continue
+
+            if not segs:
+                stack.extend(reversed(_split_finer(seg, level, budget)))
+                continue
+
+            # Pick the cut: strongest boundary in the upper half of the chunk
+            best = i = len(segs)
+            best_level = levels[-1]
+            i -= 1
+            while i > 0 and (chars[i] >= half[0] or words[i] >= half[1] or size[i] >= half[2]):
+                if levels[i - 1] > best_level:
+                    best, best_level = i, levels[i - 1]
+                i -= 1
+            yield join(best)
+
+            rest = list(zip(segs[best:], levels[best:]))
+            segs, levels, chars, words, size = [], [], [0], [0], [0]
+            for r_seg, r_level in rest:
+                push(r_seg, r_level, _cost(r_seg))
+            stack.append((seg, level))
+
+    if segs:
+        yield join(len(segs))
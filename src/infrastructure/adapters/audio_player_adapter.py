@@ -0,0 +1,202 @@
+import ctypes
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Iterable, Optional
+
+class _WAVEFORMATEX(ctypes.Structure):
+    _fields_ = [
+        ("wFormatTag", ctypes.c_ushort), ("nChannels", ctypes.c_ushort),
+        ("nSamplesPerSec", ctypes.c_uint32), ("nAvgBytesPerSec", ctypes.c_uint32),
+        ("nBlockAlign", ctypes.c_ushort), ("wBitsPerSample", ctypes.c_ushort), ("cbSize", ctypes.c_ushort)
+    ]
+
+class _WAVEHDR(ctypes.Structure):
+    _fields_ = [
+        ("lpData", ctypes.c_void_p), ("dwBufferLength", ctypes.c_uint32),
+        ("dwBytesRecorded", ctypes.c_uint32), ("dwUser", ctypes.c_size_t),
+        ("dwFlags", ctypes.c_uint32), ("dwLoops", ctypes.c_uint32),
+        ("lpNext", ctypes.c_void_p), ("reserved", ctypes.c_size_t)
+    ]
+
+class _WaveOut:
+    """16-bit mono PCM sink on the Windows waveOut API (winmm), called
+    through ctypes so playback needs no player program or audio package."""
+
+    WAVE_MAPPER = 0xFFFFFFFF # default output device
+    WHDR_DONE = 0x1
+    # Buffers handed to the device at once; more only adds latency to stop()
+    MAX_QUEUED = 8
+
+    @staticmethod
+    def available() -> bool:
+        return os.name == 'nt'
+
+    def __init__(self, sample_rate: int):
+        self._winmm = winmm = ctypes.WinDLL("winmm")
+        header = ctypes.POINTER(_WAVEHDR)
+        winmm.waveOutOpen.argtypes = [
+            ctypes.POINTER(ctypes.c_void_p), ctypes.c_uint, ctypes.POINTER(_WAVEFORMATEX),
+            ctypes.c_size_t, ctypes.c_size_t, ctypes.c_uint32
+        ]
+        for name in ("waveOutPrepareHeader", "waveOutUnprepareHeader", "waveOutWrite"):
+            getattr(winmm, name).argtypes = [ctypes.c_void_p, header, ctypes.c_uint]
+        winmm.waveOutReset.argtypes = winmm.waveOutClose.argtypes = [ctypes.c_void_p]
+
+        fmt = _WAVEFORMATEX(1, 1, sample_rate, sample_rate * 2, 2, 16, 0) # WAVE_FORMAT_PCM
+        self._handle = ctypes.c_void_p()
+        if winmm.waveOutOpen(ctypes.byref(self._handle), self.WAVE_MAPPER, ctypes.byref(fmt), 0, 0, 0):
+            raise OSError("No se pudo abrir el dispositivo de audio.")
+        # (buffer, header) pairs the device still owns, oldest first
+        self._queued = deque()
+
+    def _reap(self):
+        while self._queued and self._queued[0][1].dwFlags & self.WHDR_DONE:
+            _, header = self._queued.popleft()
+            self._winmm.waveOutUnprepareHeader(self._handle, ctypes.byref(header), ctypes.sizeof(header))
+
+    def write(self, pcm: bytes, stopped: threading.Event):
+        """Queues pcm for playback, waiting while the device is full."""
+        self._reap()
+        while len(self._queued) >= self.MAX_QUEUED:
+            if stopped.is_set():
+                return
+            time.sleep(0.01)
+            self._reap()
+        buffer = ctypes.create_string_buffer(pcm, len(pcm))
+        header = _WAVEHDR(lpData=ctypes.addressof(buffer), dwBufferLength=len(pcm))
+        self._winmm.waveOutPrepareHeader(self._handle, ctypes.byref(header), ctypes.sizeof(header))
+        self._winmm.waveOutWrite(self._handle, ctypes.byref(header), ctypes.sizeof(header))
+        self._queued.append((buffer, header))
+
+    def drain(self, stopped: threading.Event):
+        """Waits until everything queued has been played."""
+        self._reap()
+        while self._queued and not stopped.is_set():
+            time.sleep(0.01)
+            self._reap()
+
+    def close(self):
+        # Reset hands every buffer back as done, so all of them can be released
+        self._winmm.waveOutReset(self._handle)
+        self._reap()
+        self._winmm.waveOutClose(self._handle)
+
+class AudioPlayerAdapter:
+    """Plays MP3 audio while it is still arriving.
+
+    On Windows, ffmpeg decodes the pieces as they come and the samples go
+    straight to the sound device from this process, so sound starts with the
+    first piece and nothing beyond ffmpeg has to ship with the application.
+    Elsewhere the pieces are piped to ffplay when it is installed; without
+    it, the audio is collected into a temporary file and handed to the
+    system's default player.
+    """
+
+    # Decoded format sent to the sound device (Edge voices are 24 kHz mono)
+    SAMPLE_RATE = 24000
+    # Bytes of samples read from ffmpeg at a time: 0.1 s
+    BLOCK_BYTES = SAMPLE_RATE // 10 * 2
+
+    def __init__(self, ffmpeg_exe: Optional[str] = None):
+        self.ffmpeg_exe = ffmpeg_exe
+        self.ffplay_exe = self._get_ffplay_exe()
+        self._proc: Optional[subprocess.Popen] = None
+        self._stopped: Optional[threading.Event] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_ffplay_exe() -> Optional[str]:
+        if hasattr(sys, '_MEIPASS'):
+            bundled_ffplay = os.path.join(sys._MEIPASS, "ffplay.exe")
+            if os.path.exists(bundled_ffplay):
+                return bundled_ffplay
+        return shutil.which("ffplay")
+
+    def stop(self):
+        """Silences whatever is playing."""
+        with self._lock:
+            proc, self._proc = self._proc, None
+            stopped, self._stopped = self._stopped, None
+        if stopped:
+            stopped.set()
+        if proc and proc.poll() is None:
+            proc.kill()
+
+    def play(self, chunks: Iterable[bytes]):
+        """Starts playback, replacing the current one. Returns once every
+        chunk has been handed over; playback continues in the background."""
+        self.stop()
+        creation_flags = 0x08000000 if os.name == 'nt' else 0
+        # Start on the first frames instead of probing seconds of input
+        low_latency = ["-fflags", "nobuffer", "-probesize", "4096", "-analyzeduration", "0"]
+        stopped = None
+        if self.ffmpeg_exe and _WaveOut.available():
+            cmd = [
+                self.ffmpeg_exe, "-loglevel", "quiet", *low_latency, "-f", "mp3", "-i", "pipe:0",
+                "-f", "s16le", "-ac", "1", "-ar", str(self.SAMPLE_RATE), "pipe:1"
+            ]
+            proc = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, creationflags=creation_flags
+            )
+            stopped = threading.Event()
+            threading.Thread(target=self._play_samples, args=(proc, stopped), name="preview-audio", daemon=True).start()
+        elif self.ffplay_exe:
+            cmd = [self.ffplay_exe, "-nodisp", "-autoexit", "-loglevel", "quiet", *low_latency, "-i", "pipe:0"]
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, creationflags=creation_flags)
+        else:
+            self._open_file(chunks)
+            return
+
+        with self._lock:
+            self._proc, self._stopped = proc, stopped
+        try:
+            for data in chunks:
+                if proc.poll() is not None:
+                    break # stopped by a newer preview
+                proc.stdin.write(data)
+                proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            pass # the player exited before the audio ended
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+            try:
+                proc.stdin.close()
+            except OSError:
+                pass
+
+    def _play_samples(self, proc: subprocess.Popen, stopped: threading.Event):
+        """Moves ffmpeg's decoded samples to the sound device until the
+        audio ends or stop() is called."""
+        sink = None
+        try:
+            sink = _WaveOut(self.SAMPLE_RATE)
+            while not stopped.is_set():
+                pcm = proc.stdout.read(self.BLOCK_BYTES)
+                if not pcm:
+                    break
+                sink.write(pcm, stopped)
+            sink.drain(stopped)
+        except OSError:
+            proc.kill() # no sound device: nothing to play to
+        finally:
+            if sink:
+                sink.close()
+            proc.stdout.close()
+
+    @staticmethod
+    def _open_file(chunks: Iterable[bytes]):
+        path = os.path.join(tempfile.gettempdir(), "preview_voice.mp3")
+        with open(path, "wb") as f:
+            for data in chunks:
+                f.write(data)
+        if os.name == 'nt':
+            os.startfile(path)
+        else:
+            subprocess.Popen(["open" if sys.platform == "darwin" else "xdg-open", path])
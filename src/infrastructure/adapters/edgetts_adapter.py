@@ -1,54 +1,204 @@
 import asyncio
-import edge_tts
-import os
-import time
+import concurrent.futures
+import queue
 import random
+import threading
+import time
+from typing import AsyncIterator, Callable, Iterator, List, Optional
 from src.domain.models.voice_settings import VoiceSettings
 from src.domain.ports.speech_generator import SpeechGeneratorPort
+from src.domain.services.adaptive_limiter import AdaptiveConcurrencyLimiter
+from src.infrastructure.adapters.journal_adapter import JournalAdapter
+from src.infrastructure.adapters.metrics_adapter import metrics
 
 class EdgeTTSAdapter(SpeechGeneratorPort):
-    def generate_speech(self, text: str, output_path: str, settings: VoiceSettings) -> None:
-        """Generates MP3 directly with Exponential Backoff for resilience."""
-        if not text or not text.strip():
-            return
-            
+    """Edge TTS engine running on one long-lived asyncio loop in a dedicated thread.
+
+    All synthesis requests, including retries and their backoff sleeps, are
+    coroutines on that loop, so no event loop is created or torn down per chunk.
+    Concurrency is governed by a shared AIMD limiter rather than OS threads.
+    """
+
+    MAX_RETRIES = 5
+    BASE_DELAY = 2.0 # Start with 2 seconds
+
+    def __init__(self, limiter: Optional[AdaptiveConcurrencyLimiter] = None, journal: Optional[JournalAdapter] = None):
+        self.limiter = limiter or AdaptiveConcurrencyLimiter()
+        self.journal = journal
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Starts the background event loop on first use."""
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def _run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=_run, name="edge-tts-loop", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    def shutdown(self):
+        """Stops the background loop. A later request restarts it."""
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop and loop.is_running():
+            loop.call_soon_threadsafe(loop.stop)
+
+    @staticmethod
+    def _normalize_path(output_path: str) -> str:
         # Force MP3 extension
         if output_path.endswith('.wav'):
             output_path = output_path.replace('.wav', '.mp3')
+        return output_path
+
+    @staticmethod
+    def _is_throttled(error: Exception) -> bool:
+        """Detects 429-like rejections from the service."""
+        if getattr(error, "status", None) == 429:
+            return True
+        message = str(error).lower()
+        return "429" in message or "too many requests" in message
+
+    async def _request_stream(self, text: str, settings: VoiceSettings) -> AsyncIterator[bytes]:
+        """One synthesis request to the service, yielding audio as it arrives."""
+        import edge_tts # loaded on the first request, off the startup path
+        communicate = edge_tts.Communicate(
+            text,
+            settings.voice_id,
+            rate=settings.rate,
+            pitch=settings.pitch
+        )
+        async for chunk in communicate.stream():
+            if chunk["type"] == "audio":
+                yield chunk["data"]
+
+    async def _request(self, text: str, settings: VoiceSettings) -> bytes:
+        """One synthesis request to the service; raises on any failure."""
+        audio = bytearray()
+        async for data in self._request_stream(text, settings):
+            audio.extend(data)
+
+        if not audio:
+            raise Exception("Audio stream is empty.")
+        return bytes(audio)
+
+    async def _relay(self, text: str, settings: VoiceSettings, on_data: Callable[[bytes], None]) -> bytes:
+        """Like _request, but hands every piece to on_data as soon as it arrives."""
+        audio = bytearray()
+        async for data in self._request_stream(text, settings):
+            audio.extend(data)
+            on_data(data)
+
+        if not audio:
+            raise Exception("Audio stream is empty.")
+        return bytes(audio)
 
-        MAX_RETRIES = 5
-        base_delay = 2.0 # Start with 2 seconds
+    async def _synthesize(
+        self, text: str, settings: VoiceSettings, on_data: Optional[Callable[[bytes], None]] = None
+    ) -> bytes:
+        """Generates MP3 bytes in memory with Exponential Backoff for resilience.
 
-        success = False
+        With on_data, audio is also passed on piece by piece while it
+        arrives; a request that fails after passing some on is not retried,
+        since the listener already has its beginning.
+        """
         last_exception = None
+        relayed = False
 
-        for attempt in range(MAX_RETRIES):
+        def relay(data: bytes):
+            nonlocal relayed
+            relayed = True
+            on_data(data)
+
+        for attempt in range(self.MAX_RETRIES):
+            await self.limiter.acquire()
+            started = time.monotonic()
+            success = throttled = cancelled = False
             try:
-                async def _generate():
-                    communicate = edge_tts.Communicate(
-                        text, 
-                        settings.voice_id, 
-                        rate=settings.rate, 
-                        pitch=settings.pitch
-                    )
-                    await communicate.save(output_path)
-
-                asyncio.run(_generate())
-                
-                if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-                    success = True
-                    break
+                if on_data is None:
+                    audio = await self._request(text, settings)
                 else:
-                    raise Exception("Audio file is empty or missing.")
-                    
+                    audio = await self._relay(text, settings, relay)
+                success = True
+                return audio
+
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
             except Exception as e:
                 last_exception = e
-                # Exponential backoff: base * 2^attempt + jitter
-                wait_time = (base_delay * (2 ** attempt)) + random.uniform(0, 1)
-                
-                # If it's likely a rate limit or connection issue, we log and wait
-                print(f"[RETRY {attempt+1}/{MAX_RETRIES}] Error detectado: {e}. Reintentando en {wait_time:.2f}s...")
-                time.sleep(wait_time)
-        
-        if not success:
-            raise Exception(f"Fallo crítico tras {MAX_RETRIES} intentos: {last_exception}")
+                throttled = self._is_throttled(e)
+                if relayed:
+                    raise
+            finally:
+                elapsed = time.monotonic() - started
+                if cancelled:
+                    self.limiter.discard()
+                else:
+                    self.limiter.release(success, elapsed, throttled, len(text))
+                    metrics.observe("tts.request", elapsed, attempt=attempt + 1, ok=success, chars=len(text))
+
+            if attempt == self.MAX_RETRIES - 1:
+                break # no retry left: fail now instead of after one more backoff
+
+            # Exponential backoff: base * 2^attempt + jitter. The limiter's
+            # global cool-down already holds back every other request.
+            wait_time = (self.BASE_DELAY * (2 ** attempt)) + random.uniform(0, 1)
+            metrics.count("tts.retry", throttled=throttled, error=str(last_exception)[:200])
+
+            # If it's likely a rate limit or connection issue, we log and wait
+            if self.journal:
+                self.journal.warning(
+                    f"Reintento {attempt+1}/{self.MAX_RETRIES}: {last_exception}. Nuevo intento en {wait_time:.2f}s."
+                )
+            await asyncio.sleep(wait_time)
+
+        raise Exception(f"Fallo crítico tras {self.MAX_RETRIES} intentos: {last_exception}")
+
+    def _submit(self, text: str, settings: VoiceSettings) -> concurrent.futures.Future:
+        # Cancelling the returned future cancels the task on the loop, which
+        # interrupts the request or backoff sleep it is awaiting
+        if not text or not text.strip():
+            done = concurrent.futures.Future()
+            done.set_result(b"")
+            return done
+        return asyncio.run_coroutine_threadsafe(self._synthesize(text, settings), self._ensure_loop())
+
+    def synthesize(self, text: str, settings: VoiceSettings) -> bytes:
+        return self._submit(text, settings).result()
+
+    def stream_speech(self, text: str, settings: VoiceSettings) -> Iterator[bytes]:
+        if not text or not text.strip():
+            return
+        pieces = queue.Queue()
+        # The loop hands pieces over through a queue; None marks the end
+        future = asyncio.run_coroutine_threadsafe(
+            self._synthesize(text, settings, pieces.put_nowait), self._ensure_loop()
+        )
+        future.add_done_callback(lambda _: pieces.put(None))
+        try:
+            for data in iter(pieces.get, None):
+                yield data
+            future.result() # raises if the request failed
+        finally:
+            future.cancel() # the caller stopped listening early
+
+    def generate_speech(self, text: str, output_path: str, settings: VoiceSettings) -> None:
+        if not text or not text.strip():
+            return
+        audio = self.synthesize(text, settings)
+        with open(self._normalize_path(output_path), "wb") as f:
+            f.write(audio)
+
+    def submit_many(self, texts: List[str], settings: VoiceSettings) -> List[concurrent.futures.Future]:
+        return [self._submit(text, settings) for text in texts]
@@ -2,12 +2,28 @@ import os
 import subprocess
 import sys
 import shutil
-from typing import List
+import threading
+import collections
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from src.domain.ports.audio_processor import AudioProcessorPort
+from src.infrastructure.adapters.metrics_adapter import metrics
+
+# Sample rates by MPEG version bits (2.5, reserved, 2, 1)
+MP3_SAMPLE_RATES = {0: (11025, 12000, 8000), 2: (22050, 24000, 16000), 3: (44100, 48000, 32000)}
+# Layer III bitrates in kbps by bitrate index, for MPEG-1 and MPEG-2/2.5
+MP3_BITRATES = {
+    3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
 
 class FFmpegAdapter(AudioProcessorPort):
+    # How often a running ffmpeg is checked against its cancel event
+    POLL_INTERVAL = 0.1
+
     def __init__(self):
         self.ffmpeg_exe = self._get_ffmpeg_exe()
+        self._silence_cache = {}
 
     def _get_ffmpeg_exe(self):
         if hasattr(sys, '_MEIPASS'):
@@ -20,6 +36,44 @@ class FFmpegAdapter(AudioProcessorPort):
         except ImportError:
             return "ffmpeg"
 
+    @staticmethod
+    def _kill(proc: subprocess.Popen):
+        """Asks ffmpeg to stop, then kills it if it doesn't within a second."""
+        if proc.poll() is not None:
+            return
+        proc.terminate()
+        try:
+            proc.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    def _kill_on_cancel(self, proc: subprocess.Popen, cancel_event: threading.Event):
+        """Watches a child process and terminates it as soon as the job is cancelled."""
+        while proc.poll() is None:
+            if cancel_event.wait(self.POLL_INTERVAL):
+                self._kill(proc)
+                return
+
+    def _spawn(self, cmd: List[str], cancel_event: Optional[threading.Event] = None, **kwargs) -> subprocess.Popen:
+        creation_flags = 0x08000000 if os.name == 'nt' else 0
+        proc = subprocess.Popen(cmd, creationflags=creation_flags, **kwargs)
+        if cancel_event is not None:
+            threading.Thread(target=self._kill_on_cancel, args=(proc, cancel_event), daemon=True).start()
+        return proc
+
+    def _run_ffmpeg(self, cmd: List[str], cancel_event: Optional[threading.Event] = None, phase: str = "run") -> bytes:
+        """Like subprocess.run(check=True), but the child is terminated as soon
+        as cancel_event is set. Returns stdout."""
+        with metrics.span(f"ffmpeg.{phase}"):
+            proc = self._spawn(cmd, cancel_event, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            stdout, stderr = proc.communicate()
+        if cancel_event is not None and cancel_event.is_set():
+            raise InterruptedError("ffmpeg cancelado.")
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, output=stdout, stderr=stderr)
+        return stdout
+
     def merge_wavs(self, file_paths: List[str], output_path: str) -> str:
         """Concatenates audio files (MP3 or WAV) and re-encodes to ensure consistent metadata."""
         if not file_paths:
@@ -47,8 +101,7 @@ class FFmpegAdapter(AudioProcessorPort):
         ]
         
         try:
-            creation_flags = 0x08000000 if os.name == 'nt' else 0
-            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True, creationflags=creation_flags)
+            self._run_ffmpeg(cmd, phase="merge")
         finally:
             if os.path.exists(list_file):
                 os.remove(list_file)
@@ -61,8 +114,6 @@ class FFmpegAdapter(AudioProcessorPort):
         if output_path.endswith('.wav'):
             output_path = output_path.replace('.wav', '.mp3')
 
-        creation_flags = 0x08000000 if os.name == 'nt' else 0
-
         # Check if background music exists
         if not bgm_path or not os.path.exists(bgm_path):
             # No background music, just process voice
@@ -97,7 +148,169 @@ class FFmpegAdapter(AudioProcessorPort):
                 output_path
             ]
         
-        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True, creationflags=creation_flags)
+        self._run_ffmpeg(cmd, phase="mix")
+        return output_path
+
+    @classmethod
+    def _mp3_format(cls, data: bytes) -> Tuple[int, int]:
+        """Reads (sample_rate, channels) from the first MPEG audio frame header."""
+        pos = cls._id3_size(data)
+        while pos + 4 <= len(data):
+            if data[pos] == 0xFF and (data[pos + 1] & 0xE0) == 0xE0:
+                version = (data[pos + 1] >> 3) & 0x03
+                rate_index = (data[pos + 2] >> 2) & 0x03
+                if version in MP3_SAMPLE_RATES and rate_index < 3:
+                    channels = 1 if (data[pos + 3] >> 6) == 3 else 2
+                    return MP3_SAMPLE_RATES[version][rate_index], channels
+            pos += 1
+        return 24000, 1 # Edge TTS default: 24 kHz mono
+
+    @staticmethod
+    def _id3_size(data: bytes) -> int:
+        if data[:3] == b"ID3" and len(data) >= 10:
+            return 10 + ((data[6] & 0x7f) << 21 | (data[7] & 0x7f) << 14 | (data[8] & 0x7f) << 7 | (data[9] & 0x7f))
+        return 0
+
+    def get_duration(self, data: bytes) -> float:
+        """Sums the duration of every Layer III frame, without decoding."""
+        pos = self._id3_size(data)
+        duration = 0.0
+        while pos + 4 <= len(data):
+            b1, b2 = data[pos + 1], data[pos + 2]
+            if data[pos] != 0xFF or (b1 & 0xE0) != 0xE0 or (b1 >> 1) & 0x03 != 1:
+                pos += 1 # not a Layer III header: resync
+                continue
+            version = (b1 >> 3) & 0x03
+            bitrate_index, rate_index = b2 >> 4, (b2 >> 2) & 0x03
+            if version not in MP3_SAMPLE_RATES or rate_index == 3 or bitrate_index in (0, 15):
+                pos += 1
+                continue
+            sample_rate = MP3_SAMPLE_RATES[version][rate_index]
+            bitrate = MP3_BITRATES[3 if version == 3 else 2][bitrate_index] * 1000
+            samples = 1152 if version == 3 else 576
+            pos += samples // 8 * bitrate // sample_rate + ((b2 >> 1) & 0x01)
+            duration += samples / sample_rate
+        return duration
+
+    def _silence_frames(self, duration: float, sample_rate: int, channels: int,
+                        cancel_event: Optional[threading.Event] = None) -> bytes:
+        """Encodes bare MP3 silence (no ID3/Xing headers) matching the voice format,
+        so it can be spliced between chunks and even stream-copied."""
+        key = (round(duration, 3), sample_rate, channels)
+        if key not in self._silence_cache:
+            layout = "mono" if channels == 1 else "stereo"
+            cmd = [
+                self.ffmpeg_exe,
+                "-f", "lavfi",
+                "-i", f"anullsrc=r={sample_rate}:cl={layout}",
+                "-t", str(duration),
+                "-codec:a", "libmp3lame",
+                "-b:a", "48k",
+                "-id3v2_version", "0",
+                "-write_xing", "0",
+                "-f", "mp3",
+                "pipe:1"
+            ]
+            self._silence_cache[key] = self._run_ffmpeg(cmd, cancel_event, phase="silence")
+        return self._silence_cache[key]
+
+    def _iter_stream(self, chunks: Iterable[Union[bytes, str]], silences: Optional[Dict[int, float]],
+                     cancel_event: Optional[threading.Event] = None) -> Iterator[bytes]:
+        """Yields chunk bytes in order, reading paths lazily and splicing silences."""
+        audio_format = None
+        for i, chunk in enumerate(chunks):
+            if isinstance(chunk, str):
+                with open(chunk, "rb") as f:
+                    chunk = f.read()
+            if not chunk:
+                continue
+            if audio_format is None:
+                audio_format = self._mp3_format(chunk)
+            yield chunk
+            pause = silences.get(i) if silences else None
+            if pause and pause > 0:
+                yield self._silence_frames(pause, *audio_format, cancel_event=cancel_event)
+
+    def render(
+        self,
+        chunks: Iterable[Union[bytes, str]],
+        output_path: str,
+        voice_vol: float = 1.0,
+        bgm_path: str = "",
+        bgm_vol: float = 0.2,
+        silences: Optional[Dict[int, float]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> str:
+        """Pipes MP3 chunks into one ffmpeg process with a single filter graph.
+
+        Without BGM and at unity volume the stream is copied, so nothing is
+        re-encoded; otherwise volume and BGM mix happen in one encode. Setting
+        cancel_event terminates ffmpeg even while it is finishing the encode.
+        """
+        # Ensure output is MP3
+        if output_path.endswith('.wav'):
+            output_path = output_path.replace('.wav', '.mp3')
+
+        # MP3 frames can be concatenated byte-wise, so stdin is one continuous stream
+        cmd = [self.ffmpeg_exe, "-f", "mp3", "-i", "pipe:0"]
+        if bgm_path and os.path.exists(bgm_path):
+            filter_complex = f"[0:a]volume={voice_vol}[v];[1:a]volume={bgm_vol}[b];[v][b]amix=inputs=2:duration=first[out]"
+            cmd += [
+                "-stream_loop", "-1",
+                "-i", bgm_path,
+                "-filter_complex", filter_complex,
+                "-map", "[out]",
+                "-codec:a", "libmp3lame",
+                "-qscale:a", "4"
+            ]
+        elif abs(voice_vol - 1.0) >= 0.01:
+            cmd += [
+                "-filter_complex", f"[0:a]volume={voice_vol}[out]",
+                "-map", "[out]",
+                "-codec:a", "libmp3lame",
+                "-qscale:a", "4"
+            ]
+        else:
+            # Fast path: remux only; the Xing header keeps duration metadata right
+            cmd += ["-codec:a", "copy"]
+        mode = cmd[cmd.index("-codec:a") + 1]
+        cmd += ["-y", output_path]
+
+        proc = self._spawn(cmd, cancel_event, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+        # Drain stderr concurrently so a chatty ffmpeg can never block the writer
+        stderr_tail = collections.deque(maxlen=50)
+        drain = threading.Thread(target=lambda: stderr_tail.extend(proc.stderr), daemon=True)
+        drain.start()
+
+        # Time blocked on ffmpeg (writing) vs. on the producer (waiting for chunks)
+        write_seconds = 0.0
+        bytes_in = 0
+        started = time.perf_counter()
+        try:
+            for data in self._iter_stream(chunks, silences, cancel_event):
+                write_started = time.perf_counter()
+                proc.stdin.write(data)
+                write_seconds += time.perf_counter() - write_started
+                bytes_in += len(data)
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass # ffmpeg exited early; its return code reports why
+        except BaseException:
+            self._kill(proc)
+            raise
+        finally:
+            metrics.observe("ffmpeg.write", write_seconds, mode=mode)
+            metrics.observe("ffmpeg.input_wait", time.perf_counter() - started - write_seconds, mode=mode)
+            metrics.count("ffmpeg.bytes_in", bytes_in)
+
+        with metrics.span("ffmpeg.finish", mode=mode):
+            returncode = proc.wait()
+        drain.join()
+        if cancel_event is not None and cancel_event.is_set():
+            raise InterruptedError("ffmpeg cancelado.")
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd, stderr=b"".join(stderr_tail))
         return output_path
 
     def convert_to_mp3(self, input_path: str) -> str:
@@ -114,8 +327,7 @@ class FFmpegAdapter(AudioProcessorPort):
             "-y",
             output_path
         ]
-        creation_flags = 0x08000000 if os.name == 'nt' else 0
-        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True, creationflags=creation_flags)
+        self._run_ffmpeg(cmd, phase="convert")
         return output_path
 
     def generate_silence(self, duration: float, output_path: str) -> str:
@@ -129,6 +341,5 @@ class FFmpegAdapter(AudioProcessorPort):
             "-y",
             output_path
         ]
-        creation_flags = 0x08000000 if os.name == 'nt' else 0
-        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True, creationflags=creation_flags)
+        self._run_ffmpeg(cmd, phase="silence")
         return output_path
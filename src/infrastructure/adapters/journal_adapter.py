@@ -1,28 +1,77 @@
-from datetime import datetime
+import collections
 import threading
+import time
+from typing import List, Tuple
 
 class JournalAdapter:
-    def __init__(self):
+    """Application journal.
+
+    With a callback set (CLI, benchmarks), each message is formatted and
+    handed over at once. Without one, messages wait in a ring buffer for
+    the GUI to drain() them in batches; if it falls behind, the oldest
+    are dropped and a note says how many. Logging from a worker thread is
+    O(1) either way: messages below the level are rejected before any
+    formatting, and buffered ones are formatted only when drained.
+    """
+
+    LEVELS = {"DEBUG": 10, "INFO": 20, "WARN": 30, "ERROR": 40}
+
+    def __init__(self, level: str = "INFO", max_pending: int = 1000):
         self.callback = None
         self._lock = threading.Lock()
+        self._min_level = self.LEVELS.get(level, 20)
+        # (time, level, message); deque appends are atomic
+        self._pending = collections.deque(maxlen=max_pending)
+        self._dropped = 0 # approximate: counted without a lock
 
     def set_callback(self, callback):
         self.callback = callback
 
+    def set_level(self, level: str):
+        self._min_level = self.LEVELS.get(level, 20)
+
+    @staticmethod
+    def _format(created: float, level: str, message) -> str:
+        timestamp = time.strftime("%H:%M:%S", time.localtime(created))
+        return f"[{timestamp}] [{level}] {message}\n"
+
     def log(self, message, level="INFO"):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] [{level}] {message}\n"
-        
-        # Thread-safe dispatch to callback
-        if self.callback:
+        if self.LEVELS.get(level, 20) < self._min_level:
+            return
+        callback = self.callback
+        if callback:
+            # Thread-safe dispatch to callback
+            formatted_message = self._format(time.time(), level, message)
             with self._lock:
-                self.callback(formatted_message)
+                callback(formatted_message)
+        else:
+            if len(self._pending) == self._pending.maxlen:
+                self._dropped += 1
+            self._pending.append((time.time(), level, message))
+
+    def drain(self, limit: int = 500) -> List[Tuple[str, str]]:
+        """Removes up to limit buffered messages, oldest first, as
+        (level, formatted message) pairs."""
+        batch = []
+        dropped, self._dropped = self._dropped, 0
+        if dropped:
+            batch.append(("WARN", self._format(time.time(), "WARN", f"... {dropped} mensajes omitidos.")))
+        for _ in range(limit):
+            try:
+                created, level, message = self._pending.popleft()
+            except IndexError:
+                break
+            batch.append((level, self._format(created, level, message)))
+        return batch
 
     def error(self, message):
         self.log(message, "ERROR")
 
     def info(self, message):
         self.log(message, "INFO")
-    
+
     def warning(self, message):
         self.log(message, "WARN")
+
+    def debug(self, message):
+        self.log(message, "DEBUG")
@@ -0,0 +1,153 @@
+import contextvars
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+class Histogram:
+    """Every observed value of one metric; summarized once at the end."""
+    __slots__ = ("values",)
+
+    def __init__(self):
+        self.values: List[float] = []
+
+    def add(self, value: float):
+        self.values.append(value)
+
+    def summary(self) -> Dict[str, float]:
+        values = sorted(self.values)
+        count = len(values)
+        total = sum(values)
+
+        def pct(p):
+            return values[min(count - 1, int(p * count))]
+
+        return {
+            "count": count,
+            "total": round(total, 4),
+            "mean": round(total / count, 4),
+            "p50": round(pct(0.5), 4),
+            "p95": round(pct(0.95), 4),
+            "max": round(values[-1], 4)
+        }
+
+class JobTrace:
+    """Counters and histograms of one job, with every record also appended
+    to a JSON-lines trace file (if a path is given)."""
+
+    # Longest a record may sit in the write buffer
+    FLUSH_INTERVAL = 5.0
+
+    def __init__(self, job_id: str, path: Optional[str] = None):
+        self.job_id = job_id
+        self.path = path
+        self.started = time.monotonic()
+        self.counters: Dict[str, float] = defaultdict(int)
+        self.histograms: Dict[str, Histogram] = defaultdict(Histogram)
+        self._lock = threading.Lock()
+        self._file = None
+        if path:
+            try:
+                self._file = open(path, "a", encoding="utf-8")
+            except OSError:
+                pass # metrics are still summarized in memory
+        self._flushed = self.started
+
+    def _write(self, record: dict):
+        if self._file is None:
+            return
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        now = time.monotonic()
+        if now - self._flushed >= self.FLUSH_INTERVAL:
+            self._file.flush()
+            self._flushed = now
+
+    def _record(self, kind: str, name: str, value: float, fields: dict):
+        record = {"t": round(time.monotonic() - self.started, 4), "kind": kind, "name": name, "value": value}
+        record.update(fields)
+        with self._lock:
+            if kind == "count":
+                self.counters[name] += value
+            else:
+                self.histograms[name].add(value)
+            self._write(record)
+
+    def count(self, name: str, value: float = 1, **fields):
+        self._record("count", name, value, fields)
+
+    def observe(self, name: str, value: float, **fields):
+        self._record("observe", name, round(value, 4), fields)
+
+    def span(self, name: str, started: float, **fields):
+        """Records the seconds elapsed since started (a perf_counter value)."""
+        self._record("span", name, round(time.perf_counter() - started, 4), fields)
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "job_id": self.job_id,
+                "seconds": round(time.monotonic() - self.started, 2),
+                "counters": dict(self.counters),
+                "histograms": {name: h.summary() for name, h in sorted(self.histograms.items())}
+            }
+
+    def close(self) -> dict:
+        """Appends the end-of-job summary to the trace and returns it."""
+        summary = self.summary()
+        with self._lock:
+            self._write({"t": summary["seconds"], "kind": "summary", **summary})
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        return summary
+
+_current_trace: "contextvars.ContextVar[Optional[JobTrace]]" = contextvars.ContextVar("job_trace", default=None)
+
+class MetricsAdapter:
+    """Counters, histograms and spans for the whole pipeline.
+
+    Instrumented code records metrics without knowing which job it works
+    for: records go to the trace of the job running in the calling context,
+    and are dropped outside a job. asyncio tasks inherit that context, and
+    so do threads started through contextvars.copy_context().run.
+    """
+
+    @contextmanager
+    def job(self, job_id: str, path: Optional[str] = None) -> Iterator[JobTrace]:
+        trace = JobTrace(job_id, path)
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+            trace.close()
+
+    @staticmethod
+    def current() -> Optional[JobTrace]:
+        return _current_trace.get()
+
+    def count(self, name: str, value: float = 1, **fields):
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.count(name, value, **fields)
+
+    def observe(self, name: str, value: float, **fields):
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.observe(name, value, **fields)
+
+    @contextmanager
+    def span(self, name: str, **fields) -> Iterator[None]:
+        """Times the enclosed block, whether it finishes or raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            trace = _current_trace.get()
+            if trace is not None:
+                trace.span(name, started, **fields)
+
+# Instancia única para todo el sistema
+metrics = MetricsAdapter()
@@ -1,54 +1,147 @@
-from pypdf import PdfReader
 import os
-import tempfile
-from typing import Tuple, Dict, Any
+import threading
+import time
+from pypdf import PdfReader
+from typing import Tuple, Dict, Any, Iterable, Iterator, List, Optional
 from pdf2image import convert_from_path
+from src.domain.models.page_text import PageText
 from src.domain.ports.document_extractor import DocumentExtractorPort
+from src.infrastructure.adapters.metrics_adapter import metrics
 from src.infrastructure.env_manager import env_manager
 
 class PyPdfAdapter(DocumentExtractorPort):
+    # Pages with fewer extracted characters than this are treated as scans
+    MIN_PAGE_CHARS = 20
+    # Scanned pages rasterized together before OCR starts; also caps the
+    # images held in memory (about 4 MB per grayscale page)
+    MAX_OCR_BATCH = 32
+
     def __init__(self, ocr_adapter=None):
         self.ocr_adapter = ocr_adapter
 
+    def iter_pages(
+        self,
+        file_path: str,
+        pages: Optional[Iterable[int]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[PageText]:
+        """Yields each page's text as soon as it is parsed.
+
+        Near-empty pages are OCR'd individually (in small runs of consecutive
+        pages) instead of rasterizing the whole document.
+        """
+        reader = PdfReader(file_path)
+        total = len(reader.pages)
+        numbers = range(1, total + 1) if pages is None else sorted(set(pages))
+        scanned: List[Tuple[int, str]] = [] # (page_number, extracted_text)
+
+        for number in numbers:
+            if cancel_event is not None and cancel_event.is_set():
+                raise InterruptedError("Extracción cancelada.")
+            # Rasterized runs must be contiguous: flush on a gap in the selection
+            if scanned and (scanned[-1][0] != number - 1 or len(scanned) >= self.MAX_OCR_BATCH):
+                yield from self._ocr_pages(file_path, scanned, total, cancel_event)
+                scanned = []
+
+            started = time.perf_counter()
+            text = reader.pages[number - 1].extract_text() or ""
+            metrics.observe("extract.page", time.perf_counter() - started, page=number, chars=len(text))
+            if self.ocr_adapter and len(text.strip()) < self.MIN_PAGE_CHARS:
+                scanned.append((number, text))
+                continue
+
+            # Flush pending scans first so pages come out in order
+            if scanned:
+                yield from self._ocr_pages(file_path, scanned, total, cancel_event)
+                scanned = []
+            yield PageText(number=number, total=total, text=text)
+
+        if scanned:
+            yield from self._ocr_pages(file_path, scanned, total, cancel_event)
+
+    def page_count(self, file_path: str) -> Optional[int]:
+        try:
+            return len(PdfReader(file_path).pages)
+        except Exception:
+            return None
+
+    def ocr_language(self) -> Optional[str]:
+        return getattr(self.ocr_adapter, "lang", None) if self.ocr_adapter else None
+
     def extract_text(self, file_path: str) -> Tuple[str, Dict[str, Any]]:
         try:
-            reader = PdfReader(file_path)
             text_content = []
-            
-            for page in reader.pages:
-                text = page.extract_text()
-                if text:
-                    text_content.append(text)
-            
+            num_pages = 0
+            ocr_pages = 0
+
+            for page in self.iter_pages(file_path):
+                num_pages = page.total
+                if page.method == "OCR":
+                    ocr_pages += 1
+                if page.text:
+                    text_content.append(page.text)
+
             full_text = "\n".join(text_content).strip()
-            
-            # Si no hay texto, es un escaneo: Activamos OCR local
-            if not full_text and len(reader.pages) > 0 and self.ocr_adapter:
-                full_text = self._perform_ocr_local(file_path)
+
+            if ocr_pages == 0:
+                method = "Direct"
+            elif ocr_pages == num_pages:
+                method = "OCR"
+            else:
+                method = "Mixed"
 
             metadata = {
-                "num_pages": len(reader.pages),
+                "num_pages": num_pages,
+                "ocr_pages": ocr_pages,
                 "success": True,
-                "method": "OCR" if not text_content and full_text else "Direct"
+                "method": method
             }
             return full_text, metadata
-            
+
         except Exception as e:
             return "", {"error": str(e), "success": False}
 
-    def _perform_ocr_local(self, pdf_path: str) -> str:
-        """Convierte PDF a imagen usando Poppler local y aplica OCR."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            images = convert_from_path(
-                pdf_path, 
-                output_folder=temp_dir,
+    def _ocr_pages(
+        self,
+        pdf_path: str,
+        pages: List[Tuple[int, str]],
+        total: int,
+        cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[PageText]:
+        """OCRs a run of consecutive pages, rasterizing only its first..last range."""
+        recognized = self._perform_ocr_local(pdf_path, pages[0][0], pages[-1][0], cancel_event)
+        recognized += [""] * (len(pages) - len(recognized))
+        for (number, text), ocr_text in zip(pages, recognized):
+            # Keep whatever the text layer had if OCR found nothing better
+            if len(ocr_text.strip()) > len(text.strip()):
+                yield PageText(number=number, total=total, text=ocr_text, method="OCR", ocr_lang=self.ocr_language())
+            else:
+                yield PageText(number=number, total=total, text=text)
+
+    def _rasterize(self, pdf_path: str, first_page: int, last_page: int) -> List[Any]:
+        """Renders a run of pages to in-memory grayscale images.
+
+        One poppler call per run, so pdfinfo is queried once and pdftoppm
+        splits the range over its own threads.
+        """
+        threads = min(last_page - first_page + 1, getattr(self.ocr_adapter, "max_workers", None) or os.cpu_count() or 1)
+        with metrics.span("ocr.rasterize", first_page=first_page, last_page=last_page):
+            return convert_from_path(
+                pdf_path,
+                first_page=first_page,
+                last_page=last_page,
+                thread_count=threads,
+                grayscale=True,
                 poppler_path=env_manager.get_poppler_path() # Inyectamos Poppler local
             )
-            
-            image_paths = []
-            for i, image in enumerate(images):
-                img_path = os.path.join(temp_dir, f"page_{i}.png")
-                image.save(img_path, "PNG")
-                image_paths.append(img_path)
-            
-            return self.ocr_adapter.extract_text_from_images(image_paths)
+
+    def _perform_ocr_local(
+        self,
+        pdf_path: str,
+        first_page: int,
+        last_page: int,
+        cancel_event: Optional[threading.Event] = None
+    ) -> List[str]:
+        """Convierte un rango de páginas a imagen usando Poppler local y aplica OCR."""
+        images = self._rasterize(pdf_path, first_page, last_page)
+        return list(self.ocr_adapter.extract_text_from_image_stream(images, cancel_event))
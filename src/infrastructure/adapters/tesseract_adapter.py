@@ -1,29 +1,127 @@
 import pytesseract
-from PIL import Image
-from typing import List
+from typing import Any, Iterable, Iterator, List, Optional, Set, Tuple
+import collections
 import concurrent.futures
+import io
+import os
+import subprocess
+import threading
+import time
 from src.domain.ports.ocr_port import OcrPort
+from src.infrastructure.adapters.metrics_adapter import metrics
 from src.infrastructure.env_manager import env_manager
 
 class TesseractAdapter(OcrPort):
-    def __init__(self):
+    """Tesseract OCR, one CLI process per page, max_workers pages at once.
+
+    In-memory pages are encoded once and piped to `tesseract stdin stdout`,
+    so nothing touches the disk; the threads only wait on their process.
+    Images are consumed lazily and at most max_in_flight of them are held at
+    any time, so long scans OCR at full core utilization without loading
+    every page into memory. Cancelling a stream kills its processes.
+    """
+
+    # How often a wait for a page checks its cancel event
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, lang: str = 'spa+eng', max_workers: int = None):
         # Aplicar configuración local desde el env_manager
         env_manager.setup_ocr_environment()
+        self.lang = lang
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_in_flight = self.max_workers * 2
+        # One page per process: Tesseract's own threads would only compete with the others
+        self._env = dict(os.environ, OMP_THREAD_LIMIT="1")
+        self._executor = None
+        self._lock = threading.Lock()
 
-    def _process_single_image(self, img_path: str) -> str:
-        """Internal helper to process one image."""
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="ocr"
+                )
+            return self._executor
+
+    def _recognize(self, image: Any, running: Set[subprocess.Popen], closed: threading.Event) -> Tuple[str, float]:
+        """Returns the page text and the seconds spent recognizing it."""
+        started = time.perf_counter()
         try:
-            return pytesseract.image_to_string(Image.open(img_path), lang='spa+eng')
-        except:
-            return ""
+            if isinstance(image, str):
+                source, data = image, None
+            else:
+                gray = image if image.mode == "L" else image.convert("L")
+                buffer = io.BytesIO()
+                gray.save(buffer, "PNG", compress_level=1) # fast: the bytes only cross a pipe
+                image.close()
+                source, data = "stdin", buffer.getvalue()
+
+            creation_flags = 0x08000000 if os.name == 'nt' else 0
+            proc = subprocess.Popen(
+                [pytesseract.pytesseract.tesseract_cmd, source, "stdout", "-l", self.lang],
+                stdin=subprocess.PIPE if data else subprocess.DEVNULL,
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                env=self._env, creationflags=creation_flags
+            )
+            with self._lock:
+                running.add(proc)
+            if closed.is_set():
+                proc.kill() # the stream ended while this page was being encoded
+            try:
+                output, _ = proc.communicate(data)
+            finally:
+                with self._lock:
+                    running.discard(proc)
+            if proc.returncode != 0:
+                return "", time.perf_counter() - started
+            return output.decode("utf-8", errors="replace"), time.perf_counter() - started
+        except Exception:
+            return "", time.perf_counter() - started
+
+    def _result(self, future: concurrent.futures.Future, cancel_event: Optional[threading.Event]) -> str:
+        while True:
+            try:
+                text, seconds = future.result(timeout=None if cancel_event is None else self.POLL_INTERVAL)
+            except concurrent.futures.TimeoutError:
+                if cancel_event.is_set():
+                    raise InterruptedError("OCR cancelado.")
+                continue
+            metrics.observe("ocr.page", seconds, chars=len(text))
+            return text
+
+    def extract_text_from_image_stream(
+        self, images: Iterable[Any], cancel_event: Optional[threading.Event] = None
+    ) -> Iterator[str]:
+        """Processes images in parallel, pulling the next one only when a slot frees up."""
+        executor = self._get_executor()
+        pending = collections.deque()
+        running: Set[subprocess.Popen] = set() # this stream's tesseract processes
+        closed = threading.Event()
+        try:
+            for image in images:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise InterruptedError("OCR cancelado.")
+                pending.append(executor.submit(self._recognize, image, running, closed))
+                if len(pending) >= self.max_in_flight:
+                    yield self._result(pending.popleft(), cancel_event)
+            while pending:
+                yield self._result(pending.popleft(), cancel_event)
+        finally:
+            # Cancelled or abandoned: pages being recognized stop using the CPU
+            for future in pending:
+                future.cancel()
+            with self._lock:
+                closed.set()
+                procs = list(running)
+            for proc in procs:
+                if proc.poll() is None:
+                    proc.kill()
+
+    def extract_pages_from_images(self, image_paths: List[str]) -> List[str]:
+        return list(self.extract_text_from_image_stream(image_paths))
 
     def extract_text_from_images(self, image_paths: List[str]) -> str:
-        """Processes multiple images in parallel to optimize OCR speed."""
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            # Map processing to multiple threads
-            results = list(executor.map(self._process_single_image, image_paths))
-        
-        return "\n".join(results)
+        return "\n".join(self.extract_pages_from_images(image_paths))
 
     def is_available(self) -> bool:
         try:
@@ -1,38 +1,153 @@
-from src.infrastructure.adapters.pypdf_adapter import PyPdfAdapter
-from src.infrastructure.adapters.edgetts_adapter import EdgeTTSAdapter
-from src.infrastructure.adapters.ffmpeg_adapter import FFmpegAdapter
-from src.infrastructure.adapters.tesseract_adapter import TesseractAdapter
+import functools
+import threading
+from typing import Any, Callable
 from src.infrastructure.repositories.config_repository import ConfigRepository
-from src.infrastructure.repositories.cache_repository import CacheRepository
+from src.infrastructure.repositories.job_manifest_repository import JobManifestRepository
 from src.infrastructure.adapters.journal_adapter import JournalAdapter
+from src.domain.models.pipeline_settings import PipelineSettings
 from src.domain.services.text_service import TextService
+from src.domain.services.adaptive_limiter import AdaptiveConcurrencyLimiter
+from src.domain.services.fair_scheduler import FairShareScheduler
+from src.domain.services.chunk_tuner import ChunkSizeTuner
 from src.application.use_cases.process_pdf_to_speech import ProcessPdfToSpeechUseCase
 
+class Lazy:
+    """Stands in for a dependency that is only built on first attribute access."""
+    __slots__ = ("_factory", "_instance", "_lock")
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def _resolve(self) -> Any:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+def provider(build: Callable[["Container"], Any]) -> property:
+    """Turns a factory method into a singleton built on first access."""
+    name = build.__name__
+
+    @functools.wraps(build)
+    def get(self):
+        with self._lock:
+            if name not in self._instances:
+                self._instances[name] = build(self)
+            return self._instances[name]
+    return property(get)
+
 class Container:
+    """Dependency wiring. Only cheap objects are built up front; adapters
+    (and their heavy imports: pypdf, pdf2image, pytesseract, edge_tts,
+    imageio_ffmpeg) and the on-disk caches load the first time they are used."""
+
     def __init__(self):
-        # Repositories & Adapters
+        self._lock = threading.RLock()
+        self._instances = {}
         self.config_repo = ConfigRepository()
-        self.cache_repo = CacheRepository() # Persistent Cache
-        self.journal_adapter = JournalAdapter()
-        
-        self.ocr_adapter = TesseractAdapter()
-        self.pdf_extractor = PyPdfAdapter(ocr_adapter=self.ocr_adapter)
-        
-        self.speech_generator = EdgeTTSAdapter()
-        self.audio_processor = FFmpegAdapter()
-        
-        # Domain Services
-        self.text_service = TextService()
-        
-        # Use Cases
-        self.process_pdf_use_case = ProcessPdfToSpeechUseCase(
-            extractor=self.pdf_extractor,
-            generator=self.speech_generator,
-            processor=self.audio_processor,
+        self.journal_adapter = JournalAdapter(level=self.config_repo.get("log_level", "INFO"))
+
+    def override(self, name: str, instance: Any):
+        """Replaces a provider's instance before its first use, e.g. a local
+        stand-in for the speech service in benchmarks."""
+        with self._lock:
+            self._instances[name] = instance
+
+    # Repositories
+    @provider
+    def cache_repo(self):
+        from src.infrastructure.repositories.cache_repository import CacheRepository
+        return CacheRepository(
+            max_bytes=int(self.config_repo.get("cache_max_mb", 2048)) * 1024 * 1024
+        ) # Persistent Cache
+
+    @provider
+    def extraction_cache(self):
+        from src.infrastructure.repositories.extraction_cache_repository import ExtractionCacheRepository
+        return ExtractionCacheRepository()
+
+    @provider
+    def job_repo(self):
+        return JobManifestRepository() # Resumable job checkpoints
+
+    @provider
+    def pipeline_settings(self):
+        # Optional "pipeline" section in settings.json overrides queue sizes and workers
+        overrides = self.config_repo.get("pipeline") or {}
+        return PipelineSettings(**{k: v for k, v in overrides.items() if k in PipelineSettings.__dataclass_fields__})
+
+    # Adapters
+    @provider
+    def ocr_adapter(self):
+        from src.infrastructure.adapters.tesseract_adapter import TesseractAdapter
+        return TesseractAdapter(max_workers=self.pipeline_settings.ocr_workers)
+
+    @provider
+    def pdf_extractor(self):
+        from src.infrastructure.adapters.pypdf_adapter import PyPdfAdapter
+        # Scanned pages are rare: Tesseract loads only when one shows up
+        return PyPdfAdapter(ocr_adapter=Lazy(lambda: self.ocr_adapter))
+
+    @provider
+    def synthesis_limiter(self):
+        # Shared by every synthesis request so all workers back off together
+        return AdaptiveConcurrencyLimiter(initial=4, max_limit=32)
+
+    @provider
+    def synthesis_scheduler(self):
+        # Global chunk budget split fairly between documents processed at once,
+        # never larger than what the limiter currently lets through
+        limiter = self.synthesis_limiter
+        return FairShareScheduler(
+            capacity=int(self.config_repo.get("synthesis_workers", 32)),
+            limit=lambda: limiter.limit
+        )
+
+    @provider
+    def speech_generator(self):
+        from src.infrastructure.adapters.edgetts_adapter import EdgeTTSAdapter
+        return EdgeTTSAdapter(limiter=self.synthesis_limiter, journal=self.journal_adapter)
+
+    @provider
+    def audio_processor(self):
+        from src.infrastructure.adapters.ffmpeg_adapter import FFmpegAdapter
+        return FFmpegAdapter()
+
+    @provider
+    def audio_player(self):
+        from src.infrastructure.adapters.audio_player_adapter import AudioPlayerAdapter
+        # Voice previews, decoded with the same ffmpeg the renderer uses
+        return AudioPlayerAdapter(ffmpeg_exe=self.audio_processor.ffmpeg_exe)
+
+    # Domain Services
+    @provider
+    def text_service(self):
+        # Numbers, dates and abbreviations are spelled out in the voice's language
+        return TextService(language=TextService.language_of(self.config_repo.get("voice")) or "es")
+
+    # Use Cases
+    @provider
+    def process_pdf_use_case(self):
+        return ProcessPdfToSpeechUseCase(
+            extractor=Lazy(lambda: self.pdf_extractor),
+            generator=Lazy(lambda: self.speech_generator),
+            processor=Lazy(lambda: self.audio_processor),
             text_service=self.text_service,
             journal=self.journal_adapter,
-            max_workers=4
+            cache=Lazy(lambda: self.cache_repo),
+            limiter=self.synthesis_limiter,
+            extraction_cache=Lazy(lambda: self.extraction_cache),
+            jobs=self.job_repo,
+            scheduler=self.synthesis_scheduler,
+            chunk_tuner=ChunkSizeTuner(),
+            pipeline=self.pipeline_settings
         )
 
-# Singleton instance
+# Singleton instance (cheap: nothing heavy is built until used)
 container = Container()
@@ -1,31 +1,221 @@
 import os
+import re
+import json
+import time
 import hashlib
 import shutil
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+INDEX_FILE = "index.json"
+DEFAULT_MAX_BYTES = 2 * 1024 * 1024 * 1024  # 2 GB
+# Audio entries and their in-progress temp files; the directory is shared
+# with other caches (extraction, job registry) that clear() must not touch
+_ENTRY_FILE = re.compile(r"^[0-9a-f]{64}\.mp3(\.\d+\.tmp)?$")
 
 class CacheRepository:
-    def __init__(self, cache_dir: str = ".cache"):
+    """Content-addressed audio cache with a byte budget and LRU eviction.
+
+    Entries are tracked in an on-disk index (key -> size, in LRU order) so
+    lookups never need to stat the cache directory. The index is written
+    every FLUSH_EVERY new entries or FLUSH_INTERVAL seconds; a file saved
+    after the last write (a crash or a killed process) is adopted into the
+    index the first time it is looked up.
+    """
+
+    FLUSH_EVERY = 32
+    FLUSH_INTERVAL = 10.0
+
+    def __init__(self, cache_dir: str = ".cache", max_bytes: int = DEFAULT_MAX_BYTES):
         self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(self.cache_dir, INDEX_FILE)
+        self._dirty = False
+        self._unflushed = 0 # entries added since the index was last written
+        self._last_flush = time.monotonic()
         os.makedirs(self.cache_dir, exist_ok=True)
+        self._index = self._load_index()
+        self._total_bytes = sum(self._index.values())
 
     def _generate_key(self, text: str, voice_id: str, rate: str, pitch: str) -> str:
         """Generates a unique hash for a specific text and voice configuration."""
         data = f"{text}|{voice_id}|{rate}|{pitch}"
         return hashlib.sha256(data.encode('utf-8')).hexdigest()
 
-    def get_audio(self, text: str, voice_id: str, rate: str, pitch: str) -> str:
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        """Loads the LRU index, rebuilding it from the directory if missing or corrupt."""
+        index = OrderedDict()
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                for key, size in json.load(f).get("entries", []):
+                    index[key] = int(size)
+            return index
+        except (OSError, ValueError, TypeError):
+            pass
+
+        # Legacy cache without index: scan once, oldest first
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".mp3"):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    st = os.stat(path)
+                    files.append((st.st_mtime, name[:-4], st.st_size))
+                except OSError:
+                    pass
+        for _, key, size in sorted(files):
+            index[key] = size
+        self._dirty = bool(index)
+        return index
+
+    def get_audio(self, text: str, voice_id: str, rate: str, pitch: str) -> Optional[str]:
         """Returns the path to the cached audio if it exists, otherwise None."""
         key = self._generate_key(text, voice_id, rate, pitch)
-        cache_path = os.path.join(self.cache_dir, f"{key}.mp3")
-        return cache_path if os.path.exists(cache_path) else None
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+                self._dirty = True
+                self.hits += 1
+                return self._path_for(key)
+        # Saved but never indexed (the process ended before a flush)
+        path = self._path_for(key)
+        try:
+            size = os.stat(path).st_size
+        except OSError:
+            size = 0
+        if size:
+            self._register(key, size)
+            with self._lock:
+                self.hits += 1
+            return path
+        with self._lock:
+            self.misses += 1
+        return None
 
     def save_audio(self, text: str, voice_id: str, rate: str, pitch: str, source_path: str):
         """Copies a generated audio file to the cache, overwriting if exists."""
         key = self._generate_key(text, voice_id, rate, pitch)
-        cache_path = os.path.join(self.cache_dir, f"{key}.mp3")
-        shutil.copy2(source_path, cache_path)
+        cache_path = self._path_for(key)
+        size = os.path.getsize(source_path)
+        if size > self.max_bytes:
+            return
+
+        # Copy to a temp name first so concurrent readers never see a partial file
+        tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, cache_path)
+        self._register(key, size)
+
+    def get_bytes(self, text: str, voice_id: str, rate: str, pitch: str) -> Optional[bytes]:
+        """Returns the cached audio bytes, or None on a miss."""
+        path = self.get_audio(text, voice_id, rate, pitch)
+        if not path:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            # Index said yes but the file is gone: drop it and count a miss
+            self.discard(text, voice_id, rate, pitch)
+            with self._lock:
+                self.hits -= 1
+                self.misses += 1
+            return None
+
+    def save_bytes(self, text: str, voice_id: str, rate: str, pitch: str, data: bytes) -> bool:
+        """Stores in-memory audio in the cache. Returns whether it was stored."""
+        key = self._generate_key(text, voice_id, rate, pitch)
+        cache_path = self._path_for(key)
+        size = len(data)
+        if size == 0 or size > self.max_bytes:
+            return False
+
+        tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+        self._register(key, size)
+        return True
+
+    def _register(self, key: str, size: int):
+        with self._lock:
+            self._total_bytes += size - self._index.pop(key, 0)
+            self._index[key] = size
+            self._dirty = True
+            self._evict()
+            self._unflushed += 1
+            due = (self._unflushed >= self.FLUSH_EVERY
+                   or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL)
+        if due:
+            try:
+                self.flush()
+            except OSError:
+                pass # retried on the next save; the files are adopted on lookup anyway
+
+    def discard(self, text: str, voice_id: str, rate: str, pitch: str):
+        """Drops an entry whose file turned out to be missing or unreadable."""
+        key = self._generate_key(text, voice_id, rate, pitch)
+        with self._lock:
+            self._remove_entry(key)
+
+    def _remove_entry(self, key: str):
+        size = self._index.pop(key, None)
+        if size is None:
+            return
+        self._total_bytes -= size
+        self._dirty = True
+        try:
+            os.remove(self._path_for(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        """Removes least recently used entries until the byte budget is met."""
+        while self._total_bytes > self.max_bytes and self._index:
+            oldest = next(iter(self._index))
+            self._remove_entry(oldest)
+
+    def flush(self):
+        """Persists the LRU index to disk if it changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"entries": [[k, s] for k, s in self._index.items()]}
+            self._dirty = False
+            self._unflushed = 0
+            self._last_flush = time.monotonic()
+        tmp_path = f"{self._index_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self._index_path)
+
+    def stats(self) -> dict:
+        """Returns cumulative hit/miss counters and current usage."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._index),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
 
     def clear(self):
-        """Deletes all cached files."""
-        if os.path.exists(self.cache_dir):
-            shutil.rmtree(self.cache_dir)
-            os.makedirs(self.cache_dir, exist_ok=True)
+        """Deletes all cached audio and its index."""
+        with self._lock:
+            for name in os.listdir(self.cache_dir):
+                if _ENTRY_FILE.match(name) or name == INDEX_FILE:
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+            self._index.clear()
+            self._total_bytes = 0
+            self._dirty = False
@@ -20,7 +20,10 @@ class ConfigRepository:
             "voice": "es-MX-JorgeNeural",
             "rate_val": 0,
             "pitch_val": 0,
-            "output_path": default_path
+            "output_path": default_path,
+            "cache_max_mb": 2048,
+            "synthesis_workers": 32,
+            "log_level": "INFO"
         }
         
         if not os.path.exists(CONFIG_FILE):
@@ -0,0 +1,91 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+INDEX_FILE = "index.json"
+
+class ExtractionCacheRepository:
+    """Persistent cache of extracted PDF text, keyed by the file's SHA-256.
+
+    An index of path -> (mtime, size, hash) lets unchanged files skip hashing
+    entirely; renamed or copied files still hit through the content hash.
+    Each entry stores the raw text and method of every page plus the
+    preprocessed document text.
+    """
+
+    def __init__(self, cache_dir: str = os.path.join(".cache", "extraction"), max_entries: int = 50):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._index_path = os.path.join(self.cache_dir, INDEX_FILE)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._index = self._load_index()
+
+    def _load_index(self) -> "OrderedDict[str, Dict[str, Any]]":
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                return OrderedDict(json.load(f))
+        except (OSError, ValueError):
+            return OrderedDict()
+
+    def _save_index(self):
+        self._write_json(self._index_path, self._index)
+
+    @staticmethod
+    def _write_json(path: str, data):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _entry_path(self, file_hash: str) -> str:
+        return os.path.join(self.cache_dir, f"{file_hash}.json")
+
+    def file_hash(self, pdf_path: str) -> str:
+        """Returns the content hash, reusing the indexed one if mtime and size match."""
+        key = os.path.abspath(pdf_path)
+        st = os.stat(pdf_path)
+        with self._lock:
+            known = self._index.get(key)
+            if known and known["mtime"] == st.st_mtime and known["size"] == st.st_size:
+                return known["hash"]
+
+        digest = hashlib.sha256()
+        with open(pdf_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        file_hash = digest.hexdigest()
+
+        with self._lock:
+            self._index[key] = {"mtime": st.st_mtime, "size": st.st_size, "hash": file_hash}
+        return file_hash
+
+    def get(self, pdf_path: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached entry for the document, or None."""
+        file_hash = self.file_hash(pdf_path)
+        try:
+            with open(self._entry_path(file_hash), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            self._index.move_to_end(os.path.abspath(pdf_path))
+            self._save_index()
+        return entry
+
+    def put(self, pdf_path: str, entry: Dict[str, Any]):
+        """Stores an entry, evicting the least recently used documents."""
+        file_hash = self.file_hash(pdf_path)
+        self._write_json(self._entry_path(file_hash), entry)
+
+        with self._lock:
+            self._index.move_to_end(os.path.abspath(pdf_path))
+            while len(self._index) > self.max_entries:
+                _, old = self._index.popitem(last=False)
+                if all(v["hash"] != old["hash"] for v in self._index.values()):
+                    try: os.remove(self._entry_path(old["hash"]))
+                    except OSError: pass
+            self._save_index()
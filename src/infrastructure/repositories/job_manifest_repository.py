@@ -0,0 +1,176 @@
+import os
+import json
+import shutil
+import hashlib
+import threading
+from dataclasses import asdict
+from typing import Iterable, List, Optional, Tuple
+from src.domain.models.job_manifest import JobManifest, ChunkRecord
+from src.domain.models.chunk_budget import ChunkBudget
+from src.domain.models.voice_settings import VoiceSettings
+
+JOB_DIR = ".job"
+REGISTRY_FILE = "jobs.json"
+
+class JobManifestRepository:
+    """Per-project job manifests and chunk checkpoints.
+
+    Each project keeps {project_dir}/.job/ with manifest.json (rewritten
+    atomically on job-level changes), records.jsonl (chunk records appended
+    as chunks finish, folded into manifest.json on its next save),
+    chunks.jsonl (append-only chunk texts), trace.jsonl (metrics of every
+    run) and parts/ (finished chunk audio).
+    A small registry maps job ids to project directories so jobs can be
+    resumed by id.
+    """
+
+    def __init__(self, registry_dir: str = ".cache"):
+        self.registry_dir = registry_dir
+        self._registry_path = os.path.join(registry_dir, REGISTRY_FILE)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _job_dir(project_dir: str) -> str:
+        return os.path.join(project_dir, JOB_DIR)
+
+    def _manifest_path(self, manifest: JobManifest) -> str:
+        return os.path.join(self._job_dir(manifest.project_dir), "manifest.json")
+
+    @classmethod
+    def _records_path(cls, project_dir: str) -> str:
+        return os.path.join(cls._job_dir(project_dir), "records.jsonl")
+
+    def _texts_path(self, manifest: JobManifest) -> str:
+        return os.path.join(self._job_dir(manifest.project_dir), "chunks.jsonl")
+
+    def trace_path(self, manifest: JobManifest) -> str:
+        return os.path.join(self._job_dir(manifest.project_dir), "trace.jsonl")
+
+    @staticmethod
+    def _write_json(path: str, data):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _load_registry(self) -> dict:
+        try:
+            with open(self._registry_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def create(self, manifest: JobManifest):
+        """Starts a fresh job directory for the manifest's project."""
+        job_dir = self._job_dir(manifest.project_dir)
+        shutil.rmtree(job_dir, ignore_errors=True)
+        os.makedirs(os.path.join(job_dir, "parts"), exist_ok=True)
+        self.save(manifest)
+
+        with self._lock:
+            os.makedirs(self.registry_dir, exist_ok=True)
+            registry = self._load_registry()
+            registry[manifest.job_id] = os.path.abspath(manifest.project_dir)
+            self._write_json(self._registry_path, registry)
+
+    def save(self, manifest: JobManifest):
+        """Atomically persists the manifest, with every chunk record."""
+        with self._lock:
+            data = asdict(manifest)
+            data["chunks"] = [asdict(c) for _, c in sorted(manifest.chunks.items())]
+            self._write_json(self._manifest_path(manifest), data)
+            # The manifest holds every record now
+            try:
+                os.remove(self._records_path(manifest.project_dir))
+            except OSError:
+                pass
+
+    def append_record(self, manifest: JobManifest, record: ChunkRecord):
+        """Records one chunk's progress without rewriting the whole manifest."""
+        with self._lock:
+            with open(self._records_path(manifest.project_dir), "a", encoding="utf-8") as f:
+                f.write(json.dumps(asdict(record), ensure_ascii=False) + "\n")
+
+    def load(self, job_id: str) -> Optional[JobManifest]:
+        project_dir = self._load_registry().get(job_id)
+        if not project_dir:
+            return None
+        manifest = self.load_project(project_dir)
+        # A newer job in the same project replaces the old one
+        return manifest if manifest and manifest.job_id == job_id else None
+
+    def load_project(self, project_dir: str) -> Optional[JobManifest]:
+        """Returns the latest job manifest stored in a project directory."""
+        try:
+            with open(os.path.join(self._job_dir(project_dir), "manifest.json"), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        data["voice_settings"] = VoiceSettings(**data["voice_settings"])
+        if data.get("chunk_budget"):
+            data["chunk_budget"] = ChunkBudget(**data["chunk_budget"])
+        data["chunks"] = {c["index"]: ChunkRecord(**c) for c in data["chunks"]}
+        # Records appended after the last save are newer than the manifest's
+        try:
+            with open(self._records_path(project_dir), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = ChunkRecord(**json.loads(line))
+                    except (ValueError, TypeError):
+                        break # torn last line from a crash
+                    data["chunks"][record.index] = record
+        except OSError:
+            pass
+        return JobManifest(**data)
+
+    def append_text(self, manifest: JobManifest, index: int, text: str):
+        """Records a chunk's text so the job can be resumed without re-chunking."""
+        self.append_texts(manifest, [(index, text)])
+
+    def append_texts(self, manifest: JobManifest, texts: Iterable[Tuple[int, str]]):
+        with self._lock:
+            with open(self._texts_path(manifest), "a", encoding="utf-8") as f:
+                for index, text in texts:
+                    f.write(json.dumps({"index": index, "text": text}, ensure_ascii=False) + "\n")
+
+    def load_texts(self, manifest: JobManifest) -> List[str]:
+        texts = {}
+        try:
+            with open(self._texts_path(manifest), "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                        texts[row["index"]] = row["text"]
+                    except ValueError:
+                        break # torn last line from a crash
+        except OSError:
+            pass
+        return [texts[i] for i in sorted(texts)]
+
+    def write_part(self, manifest: JobManifest, index: int, data: bytes) -> str:
+        path = os.path.join(self._job_dir(manifest.project_dir), "parts", f"{index:05d}.mp3")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return path
+
+    @staticmethod
+    def read_part(record: ChunkRecord) -> Optional[bytes]:
+        if record.status != "done" or not record.output_path:
+            return None
+        try:
+            with open(record.output_path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def discard_parts(self, manifest: JobManifest):
+        """Removes chunk checkpoints once the final audio exists."""
+        shutil.rmtree(os.path.join(self._job_dir(manifest.project_dir), "parts"), ignore_errors=True)
+        for record in manifest.chunks.values():
+            record.output_path = None
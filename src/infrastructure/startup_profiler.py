@@ -0,0 +1,97 @@
+import importlib.abc
+import sys
+import threading
+import time
+from typing import List, Optional, TextIO, Tuple
+
+class _TimedLoader(importlib.abc.Loader):
+    """Wraps a module loader to time its exec_module()."""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        create = getattr(self._loader, "create_module", None)
+        return create(spec) if create else None
+
+    def exec_module(self, module):
+        self._profiler._enter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(module.__name__)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """Delegates to the real finders and wraps the loader they return."""
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            find = getattr(finder, "find_spec", None)
+            if finder is self or find is None:
+                continue
+            spec = find(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+class StartupProfiler:
+    """Cold-start breakdown: named phases plus per-module import times in the
+    style of `python -X importtime` (self and cumulative microseconds)."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self.imports: List[Tuple[str, float, float]] = [] # (module, self_us, cumulative_us)
+        self._local = threading.local()
+        self._finder: Optional[_TimingFinder] = None
+
+    def install(self):
+        if self._finder is None:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall(self):
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+
+    def _enter(self):
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append([time.perf_counter(), 0.0]) # start, time spent in nested imports
+
+    def _exit(self, name: str):
+        stack = self._local.stack
+        started, nested = stack.pop()
+        cumulative = (time.perf_counter() - started) * 1e6
+        if stack:
+            stack[-1][1] += cumulative
+        self.imports.append((name, cumulative - nested, cumulative))
+
+    def mark(self, phase: str):
+        """Records the time elapsed since startup at the end of a phase."""
+        self.phases.append((phase, time.perf_counter() - self.start))
+
+    def report(self, stream: Optional[TextIO] = None, top: int = 25):
+        stream = stream or sys.stderr
+        print("Arranque:", file=stream)
+        previous = 0.0
+        for phase, at in self.phases:
+            print(f"  {at * 1000:8.1f} ms  (+{(at - previous) * 1000:7.1f})  {phase}", file=stream)
+            previous = at
+        print("import time:       self [us] |  cumulative | imported package", file=stream)
+        for name, self_us, cumulative_us in sorted(self.imports, key=lambda i: i[2], reverse=True)[:top]:
+            print(f"import time: {self_us:>12.0f} | {cumulative_us:>11.0f} | {name}", file=stream)
+        stream.flush()
+
+# Instancia única para todo el sistema
+profiler = StartupProfiler()
@@ -0,0 +1,213 @@
+"""Headless batch conversion of many PDFs.
+
+    python -m src.interfaces.cli.batch libros/ "scans/*.pdf" -o salida --voice es-MX-DaliaNeural
+
+Prints one JSON object per line on stdout (start, progress, done, failed,
+summary); the journal goes to stderr. Exits with 1 if any document failed.
+"""
+import argparse
+import concurrent.futures
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+# Asegurar que el root esté en el path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))))
+
+from src.domain.models.voice_settings import VoiceSettings
+
+PROGRESS_INTERVAL = 1.0 # seconds between progress lines per document
+
+class BatchRunner:
+    """Converts documents concurrently through one shared use case.
+
+    Documents start smallest first, and the use case's fair scheduler splits
+    the global synthesis budget between the ones in progress, so short
+    documents finish early even when queued next to very long ones.
+    """
+
+    def __init__(self, container, voice_settings: VoiceSettings, output_dir: str,
+                 bgm_path: Optional[str] = None, bgm_volume: float = 0.2,
+                 max_documents: int = 4, resume: bool = False):
+        self.container = container
+        self.use_case = container.process_pdf_use_case
+        self.voice_settings = voice_settings
+        self.output_dir = output_dir
+        self.bgm_path = bgm_path
+        self.bgm_volume = bgm_volume
+        self.max_documents = max_documents
+        self.resume = resume
+        self.cancel_event = threading.Event()
+        self._out_lock = threading.Lock()
+
+    def emit(self, event: str, **data):
+        with self._out_lock:
+            print(json.dumps({"event": event, "time": round(time.time(), 3), **data}, ensure_ascii=False), flush=True)
+
+    def _pending_job(self, pdf_path: str) -> Optional[str]:
+        """Returns the id of an unfinished job for this PDF, if any."""
+        project_dir = os.path.join(self.output_dir, os.path.basename(pdf_path).split('.')[0])
+        manifest = self.container.job_repo.load_project(project_dir)
+        if manifest and manifest.status != "completed" and os.path.abspath(manifest.pdf_path) == os.path.abspath(pdf_path):
+            return manifest.job_id
+        return None
+
+    def _convert(self, pdf_path: str) -> Dict:
+        last_report = 0.0
+
+        def on_progress(update):
+            nonlocal last_report
+            now = time.monotonic()
+            if now - last_report >= PROGRESS_INTERVAL:
+                last_report = now
+                self.emit(
+                    "progress", file=pdf_path, stage=update.stage, progress=round(update.fraction, 3),
+                    done=update.done, total=update.total, estimated=update.estimated, bytes=update.bytes,
+                    chars_per_second=update.chars_per_second,
+                    eta=round(update.eta, 1) if update.eta is not None else None,
+                    concurrency=update.concurrency, error_rate=update.error_rate, latency_ms=update.latency_ms,
+                    message=update.message
+                )
+
+        start = time.monotonic()
+        job_id = self._pending_job(pdf_path) if self.resume else None
+        self.emit("start", file=pdf_path, resumed=job_id)
+        if job_id:
+            output = self.use_case.resume(job_id, progress_callback=on_progress, cancel_event=self.cancel_event)
+        else:
+            output = self.use_case.execute(
+                text=None, pdf_path=pdf_path, output_base_dir=self.output_dir,
+                voice_settings=self.voice_settings, bgm_path=self.bgm_path,
+                bgm_volume=self.bgm_volume, progress_callback=on_progress,
+                cancel_event=self.cancel_event
+            )
+        if output is None:
+            raise InterruptedError("Proceso cancelado.")
+
+        seconds = time.monotonic() - start
+        manifest = self.container.job_repo.load_project(os.path.dirname(output))
+        chunks = len(manifest.chunks) if manifest else 0
+        audio_seconds = sum(c.duration for c in manifest.chunks.values()) if manifest else 0.0
+        result = {
+            "file": pdf_path,
+            "output": output,
+            "seconds": round(seconds, 2),
+            "chunks": chunks,
+            "audio_seconds": round(audio_seconds, 1),
+            "realtime_factor": round(audio_seconds / seconds, 1) if seconds > 0 else None,
+            "chars_saved": dict(manifest.chars_saved) if manifest else {},
+        }
+        self.emit("done", **result)
+        return result
+
+    def run(self, pdf_paths: List[str]) -> int:
+        """Converts every document and returns the number of failures."""
+        # Smallest first: quick documents are not held behind long ones
+        pdf_paths = sorted(pdf_paths, key=os.path.getsize)
+        start = time.monotonic()
+        results, failed = [], 0
+
+        with concurrent.futures.ThreadPoolExecutor(self.max_documents, thread_name_prefix="batch") as pool:
+            futures = {pool.submit(self._convert, p): p for p in pdf_paths}
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        failed += 1
+                        self.emit("failed", file=futures[future], error=str(e))
+            except KeyboardInterrupt:
+                self.cancel_event.set()
+                for future in futures:
+                    future.cancel()
+                raise
+
+        seconds = time.monotonic() - start
+        audio_seconds = sum(r["audio_seconds"] for r in results)
+        self.emit(
+            "summary",
+            documents=len(pdf_paths),
+            completed=len(results),
+            failed=failed,
+            seconds=round(seconds, 2),
+            chunks=sum(r["chunks"] for r in results),
+            audio_seconds=round(audio_seconds, 1),
+            documents_per_hour=round(len(results) * 3600 / seconds, 1) if seconds > 0 else None,
+            realtime_factor=round(audio_seconds / seconds, 1) if seconds > 0 else None,
+        )
+        return failed
+
+def collect_pdfs(inputs: List[str]) -> List[str]:
+    """Expands directories and glob patterns into a de-duplicated PDF list."""
+    found = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = glob.glob(os.path.join(item, "*.pdf")) + glob.glob(os.path.join(item, "*.PDF"))
+        else:
+            matches = glob.glob(item, recursive=True)
+        found += [os.path.abspath(p) for p in matches if os.path.isfile(p) and p.lower().endswith(".pdf")]
+    return list(dict.fromkeys(found))
+
+def build_parser(config) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Convierte lotes de PDF a audio sin interfaz gráfica.")
+    parser.add_argument("inputs", nargs="+", help="Archivos, carpetas o patrones glob de PDF")
+    parser.add_argument("-o", "--output", default=config.get("output_path"), help="Carpeta de salida")
+    parser.add_argument("--voice", default=config.get("voice"), help="Voz de Edge TTS")
+    parser.add_argument("--rate", type=int, default=int(config.get("rate_val", 0)), help="Velocidad en %%")
+    parser.add_argument("--pitch", type=int, default=int(config.get("pitch_val", 0)), help="Tono en Hz")
+    parser.add_argument("--volume", type=float, default=1.0, help="Volumen de la voz")
+    parser.add_argument("--bgm", help="Música de fondo")
+    parser.add_argument("--bgm-volume", type=float, default=0.2, help="Volumen de la música de fondo")
+    parser.add_argument("--documents", type=int, default=4, help="Documentos procesados a la vez")
+    parser.add_argument("--workers", type=int, default=None, help="Fragmentos en síntesis a la vez (global)")
+    parser.add_argument("--resume", action="store_true", help="Reanuda trabajos inconclusos en la carpeta de salida")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # Imported here so child OCR processes don't build the container
+    from src.infrastructure.container import container
+
+    args = build_parser(container.config_repo).parse_args(argv)
+    pdf_paths = collect_pdfs(args.inputs)
+    if not pdf_paths:
+        print("No se encontraron archivos PDF.", file=sys.stderr)
+        return 2
+
+    # Projects are named after the file: two PDFs with the same name would share one
+    names = {}
+    for p in pdf_paths:
+        names.setdefault(os.path.basename(p).split('.')[0], []).append(p)
+    clashes = [paths for paths in names.values() if len(paths) > 1]
+    if clashes:
+        print(f"Nombres de proyecto repetidos: {clashes}", file=sys.stderr)
+        return 2
+
+    container.journal_adapter.set_callback(lambda m: sys.stderr.write(m))
+    if args.workers:
+        container.synthesis_scheduler.set_capacity(args.workers)
+
+    settings = VoiceSettings(
+        voice_id=args.voice,
+        rate=f"{'+' if args.rate >= 0 else ''}{args.rate}%",
+        pitch=f"{'+' if args.pitch >= 0 else ''}{args.pitch}Hz",
+        volume=args.volume
+    )
+    runner = BatchRunner(
+        container, settings, args.output, bgm_path=args.bgm, bgm_volume=args.bgm_volume,
+        max_documents=max(1, args.documents), resume=args.resume
+    )
+    try:
+        failed = runner.run(pdf_paths)
+    except KeyboardInterrupt:
+        return 130
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    # Requerido por el pool de procesos de OCR en el ejecutable congelado
+    multiprocessing.freeze_support()
+    sys.exit(main())
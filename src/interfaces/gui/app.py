@@ -5,7 +5,6 @@ import os
 import sys
 import threading
 import subprocess
-import queue
 from tkinterdnd2 import DND_FILES, TkinterDnD
 
 # Use Absolute imports
@@ -29,9 +28,9 @@ class AntigravityApp(ctk.CTk):
         self.config_repo = container.config_repo
         self.journal = container.journal_adapter
         
-        # UI Refresh Queue (To prevent blocking main thread)
-        self.log_queue = queue.Queue()
+        # Log console refresh: the journal buffers, the UI drains it per tick
         self.update_interval = 100 # ms
+        self.max_log_lines = 2000
 
         # Window Setup
         self.title("PDF To Speech Studio v4.1")
@@ -58,7 +57,6 @@ class AntigravityApp(ctk.CTk):
             except: pass
 
         self._build_ui()
-        self.journal.set_callback(self.thread_safe_log)
         
         # Start periodic UI log checker
         self.after(self.update_interval, self._process_log_queue)
@@ -67,18 +65,12 @@ class AntigravityApp(ctk.CTk):
     def _process_log_queue(self):
         """Periodically flushes logs from the background threads to the UI."""
         try:
-            while True: # Process all pending logs
-                message = self.log_queue.get_nowait()
-                self._append_to_log(message)
-        except queue.Empty:
-            pass
+            batch = self.journal.drain()
+            if batch:
+                self._append_to_log(batch)
         finally:
             self.after(self.update_interval, self._process_log_queue)
 
-    def thread_safe_log(self, message):
-        """Enqueues a message for UI update instead of writing directly."""
-        self.log_queue.put(message)
-
     def _build_ui(self):
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(0, weight=1)
@@ -274,7 +266,10 @@ class AntigravityApp(ctk.CTk):
     def run_extraction(self):
         try:
             self.after(0, lambda: self.lbl_status.configure(text="Extrayendo texto..."))
-            text = self.use_case.extract_only(self.current_pdf_path)
+            text = self.use_case.extract_only(
+                self.current_pdf_path, language=self.use_case.text_service.language_of(self.voice_var.get()),
+                progress_callback=self.on_progress
+            )
             self.extracted_text = text
             self.after(0, self._on_extraction_complete)
         except Exception as e:
@@ -329,8 +324,8 @@ class AntigravityApp(ctk.CTk):
                 rate=f"{'+' if self.slider_rate.get() >= 0 else ''}{int(self.slider_rate.get())}%",
                 pitch=f"{'+' if self.slider_pitch.get() >= 0 else ''}{int(self.slider_pitch.get())}Hz"
             )
-            path = self.use_case.preview_voice(text, settings)
-            os.startfile(path)
+            # Plays while it downloads; recently heard settings replay from memory
+            container.audio_player.play(self.use_case.preview_stream(text, settings))
         except Exception as e:
             self.after(0, lambda: messagebox.showerror("Error Preview", str(e)))
         finally:
@@ -362,13 +357,12 @@ class AntigravityApp(ctk.CTk):
                 pitch=f"{'+' if self.slider_pitch.get() >= 0 else ''}{int(self.slider_pitch.get())}Hz",
                 volume=self.slider_v_vol.get()
             )
-            def on_progress(msg, val): self.after(0, lambda: self._update_ui(msg, val))
             final = self.use_case.execute(
                 text=text, pdf_path=self.current_pdf_path,
                 output_base_dir=self.config_repo.get("output_path"),
                 voice_settings=settings, bgm_path=self.bgm_path,
                 bgm_volume=self.slider_b_vol.get(),
-                progress_callback=on_progress, cancel_event=self.cancel_event
+                progress_callback=self.on_progress, cancel_event=self.cancel_event
             )
             if final: self.after(0, lambda p=final: self._finish_success(p))
             else: self.after(0, self._finish_cancelled)
@@ -378,10 +372,13 @@ class AntigravityApp(ctk.CTk):
             self.after(0, self._reset_ui)
             self.after(0, lambda: self._set_busy(False))
 
-    def _update_ui(self, msg, val):
-        self.lbl_status.configure(text=msg)
-        self.progress_bar.set(val)
-        self.journal.info(msg)
+    def on_progress(self, update):
+        # Already throttled by the use case: one UI update per report
+        self.after(0, lambda: self._update_ui(update))
+
+    def _update_ui(self, update):
+        self.lbl_status.configure(text=update.message)
+        self.progress_bar.set(update.fraction)
 
     def _finish_success(self, path):
         if messagebox.askyesno("Éxito", "¿Deseas escuchar el audio final?"):
@@ -394,15 +391,26 @@ class AntigravityApp(ctk.CTk):
         self.btn_process.configure(state="normal", text="🚀 INICIAR CONVERSIÓN")
         self.btn_cancel.configure(state="disabled")
 
-    def _append_to_log(self, message):
+    def _append_to_log(self, batch):
+        """Writes a batch of (level, message) with a single insert, then
+        trims the console to its last max_log_lines lines."""
         try:
-            self.textbox_log.configure(state="normal")
-            tag = "INFO"
-            if "[ERROR]" in message: tag = "ERROR"
-            elif "[WARN]" in message: tag = "WARN"
-            self.textbox_log.insert("end", message, tag)
-            self.textbox_log.see("end")
-            self.textbox_log.configure(state="disabled")
+            box = self.textbox_log
+            box.configure(state="normal")
+            first_line = int(box.index("end-1c").split(".")[0])
+            box.insert("end", "".join(message for _, message in batch), "INFO")
+            line = first_line
+            for level, message in batch:
+                lines = message.count("\n")
+                if level in ("WARN", "ERROR"):
+                    box.tag_add(level, f"{line}.0", f"{line + lines}.0")
+                line += lines
+            # Every message ends in a newline, so the last line is empty
+            excess = int(box.index("end-1c").split(".")[0]) - 1 - self.max_log_lines
+            if excess > 0:
+                box.delete("1.0", f"{excess + 1}.0")
+            box.see("end")
+            box.configure(state="disabled")
         except: pass
 
 if __name__ == "__main__":
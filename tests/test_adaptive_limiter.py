@@ -0,0 +1,58 @@
+"""AIMD limiter: latency is judged against the fitted size/latency model.
+
+    python -m unittest tests.test_adaptive_limiter
+"""
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.services.adaptive_limiter import AdaptiveConcurrencyLimiter
+
+OVERHEAD, PER_CHAR = 1.0, 0.001 # a service with a fixed cost per request
+
+def latency(size: int) -> float:
+    return OVERHEAD + PER_CHAR * size
+
+class AdaptiveLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.limiter = AdaptiveConcurrencyLimiter(initial=4, max_limit=32)
+
+    def request(self, size: int, seconds: float, success: bool = True):
+        async def run():
+            await self.limiter.acquire()
+            self.limiter.release(success, seconds, size=size)
+        asyncio.run(run())
+
+    def warm_up(self):
+        for size in (2000, 500, 2000, 1000, 2000):
+            self.request(size, latency(size))
+
+    def test_model_is_fitted_from_mixed_sizes(self):
+        self.warm_up()
+        overhead, per_char = self.limiter.latency_model()
+        self.assertAlmostEqual(overhead, OVERHEAD, places=6)
+        self.assertAlmostEqual(per_char, PER_CHAR, places=9)
+
+    def test_short_chunks_at_the_expected_latency_are_healthy(self):
+        self.warm_up()
+        limit = self.limiter._limit
+        # 11 ms per character, against 1.5 ms for the long chunks: only the overhead
+        self.request(100, latency(100))
+        self.assertGreater(self.limiter._limit, limit)
+
+    def test_requests_slower_than_the_model_do_not_grow_the_limit(self):
+        self.warm_up()
+        limit = self.limiter._limit
+        self.request(2000, latency(2000) * 3)
+        self.assertEqual(self.limiter._limit, limit)
+
+    def test_errors_cut_the_limit(self):
+        self.request(1000, latency(1000), success=False)
+        self.assertEqual(self.limiter.limit, 2)
+        self.assertEqual(self.limiter.snapshot()["error_rate"], 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Audio cache: byte budget, LRU order, crash recovery and clearing.
+
+    python -m unittest tests.test_cache_repository
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.repositories.cache_repository import CacheRepository
+
+VOICE = ("es-ES-AlvaroNeural", "+0%", "+0Hz")
+
+class CacheRepositoryTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix="cache-")
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        cache = CacheRepository(self.cache_dir)
+        self.assertIsNone(cache.get_bytes("hola", *VOICE))
+        cache.save_bytes("hola", *VOICE, b"audio")
+        self.assertEqual(cache.get_bytes("hola", *VOICE), b"audio")
+        self.assertIsNone(cache.get_bytes("hola", "es-MX-DaliaNeural", "+0%", "+0Hz"))
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = CacheRepository(self.cache_dir, max_bytes=30)
+        cache.save_bytes("a", *VOICE, b"x" * 10)
+        cache.save_bytes("b", *VOICE, b"x" * 10)
+        cache.save_bytes("c", *VOICE, b"x" * 10)
+        cache.get_bytes("a", *VOICE) # "b" is now the oldest
+        cache.save_bytes("d", *VOICE, b"x" * 10)
+        self.assertIsNone(cache.get_bytes("b", *VOICE))
+        for text in ("a", "c", "d"):
+            self.assertIsNotNone(cache.get_bytes(text, *VOICE))
+        self.assertLessEqual(cache.stats()["bytes"], 30)
+
+    def test_entries_larger_than_the_budget_are_not_stored(self):
+        cache = CacheRepository(self.cache_dir, max_bytes=4)
+        cache.save_bytes("a", *VOICE, b"x" * 5)
+        self.assertIsNone(cache.get_bytes("a", *VOICE))
+
+    def test_index_survives_a_restart(self):
+        cache = CacheRepository(self.cache_dir)
+        cache.save_bytes("a", *VOICE, b"audio")
+        cache.flush()
+        reopened = CacheRepository(self.cache_dir)
+        self.assertEqual(reopened.stats()["entries"], 1)
+        self.assertEqual(reopened.get_bytes("a", *VOICE), b"audio")
+
+    def test_entries_saved_after_the_last_flush_are_adopted(self):
+        cache = CacheRepository(self.cache_dir)
+        cache.save_bytes("a", *VOICE, b"first")
+        cache.flush()
+        cache.save_bytes("b", *VOICE, b"second") # the process dies before the next flush
+        reopened = CacheRepository(self.cache_dir)
+        self.assertEqual(reopened.stats()["entries"], 1)
+        self.assertEqual(reopened.get_bytes("b", *VOICE), b"second")
+        self.assertEqual(reopened.stats()["entries"], 2)
+        self.assertEqual(reopened.stats()["bytes"], len(b"first") + len(b"second"))
+
+    def test_index_is_flushed_while_saving(self):
+        cache = CacheRepository(self.cache_dir)
+        cache.FLUSH_EVERY = 2
+        cache.save_bytes("a", *VOICE, b"1")
+        cache.save_bytes("b", *VOICE, b"2")
+        with open(os.path.join(self.cache_dir, "index.json"), "r", encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)["entries"]), 2)
+
+    def test_clear_only_removes_audio(self):
+        others = ["extraction.json", "jobs.json", os.path.join("bench_fixtures", "digital-10.pdf")]
+        os.makedirs(os.path.join(self.cache_dir, "bench_fixtures"))
+        for name in others:
+            with open(os.path.join(self.cache_dir, name), "w") as f:
+                f.write("{}")
+        cache = CacheRepository(self.cache_dir)
+        cache.save_bytes("a", *VOICE, b"audio")
+        cache.flush()
+        cache.clear()
+        self.assertIsNone(cache.get_bytes("a", *VOICE))
+        self.assertEqual(cache.stats()["bytes"], 0)
+        for name in others:
+            self.assertTrue(os.path.exists(os.path.join(self.cache_dir, name)), name)
+        self.assertFalse(os.path.exists(os.path.join(self.cache_dir, "index.json")))
+
+if __name__ == "__main__":
+    unittest.main()
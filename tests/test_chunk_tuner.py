@@ -0,0 +1,44 @@
+"""Chunk size choice: parallelism target, failure cap and its floor.
+
+    python -m unittest tests.test_chunk_tuner
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.services.chunk_tuner import ChunkSizeTuner
+
+MODEL = (1.0, 1 / 800) # 1 s per request, 800 characters per second
+
+class ChunkSizeTunerTest(unittest.TestCase):
+    def setUp(self):
+        self.tuner = ChunkSizeTuner()
+
+    def size(self, total_chars, workers=4, failure_rate=0.0):
+        budget, reason = self.tuner.choose(total_chars, workers, MODEL, failure_rate)
+        self.assertTrue(reason)
+        return budget.max_chars
+
+    def test_sizes_come_from_the_ladder(self):
+        for total in (500, 9000, 50000, 400000, 10 ** 7):
+            self.assertIn(self.size(total), ChunkSizeTuner.LADDER)
+
+    def test_every_worker_gets_chunks(self):
+        # 8 chunks in flight for 4 workers: 40,000 / 8 = 5,000 → 4,000
+        self.assertEqual(self.size(40000), 4000)
+        # Short documents are not floored into a single chunk
+        self.assertEqual(self.size(9000), 1000)
+
+    def test_failures_cap_the_size(self):
+        self.assertEqual(self.size(10 ** 7), 16000)
+        self.assertEqual(self.size(10 ** 7, failure_rate=0.1), 8000)
+
+    def test_the_cap_stops_at_the_overhead_floor(self):
+        # Overhead under 10% needs 1 s * 9 / (1/800) = 7,200 characters per request
+        self.assertEqual(self.size(10 ** 7, failure_rate=0.9), 4000)
+        self.assertEqual(self.size(10 ** 7, failure_rate=0.9), self.size(10 ** 7, failure_rate=0.3))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+"""A small document started during a large one is not queued behind its backlog.
+
+    python -m unittest tests.test_fair_share
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_pipeline import null_processor
+from benchmarks.fake_tts import FakeSpeechGenerator
+from benchmarks.fixtures import fixture
+from src.domain.models.voice_settings import VoiceSettings
+from src.domain.services.adaptive_limiter import AdaptiveConcurrencyLimiter
+from src.infrastructure.container import Container
+
+VOICE = VoiceSettings("es-ES-AlvaroNeural")
+LATENCY = 0.25
+
+class FairShareTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd, self.workdir = os.getcwd(), tempfile.mkdtemp(prefix="fair-")
+        os.chdir(self.workdir) # fresh caches and settings
+        self.big = fixture("fixtures", "digital", 300)
+        self.small = fixture("fixtures", "digital", 10)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def _container(self) -> Container:
+        container = Container()
+        # A service that serves 6 requests at once: the limiter settles there
+        container.override("synthesis_limiter", AdaptiveConcurrencyLimiter(initial=4, max_limit=6))
+        generator = FakeSpeechGenerator(
+            limiter=container.synthesis_limiter, latency=LATENCY, per_char=0.0, jitter=0.0, throttle_above=6
+        )
+        container.override("speech_generator", generator)
+        container.override("audio_processor", null_processor())
+        return container
+
+    def test_small_document_finishes_first(self):
+        container = self._container()
+        use_case = container.process_pdf_use_case
+        finished, outputs = {}, {}
+
+        def convert(pdf_path):
+            outputs[pdf_path] = use_case.execute(None, pdf_path, os.path.join(self.workdir, "out"), VOICE)
+            finished[pdf_path] = time.monotonic()
+
+        big = threading.Thread(target=convert, args=(self.big,))
+        big.start()
+        time.sleep(1.0) # the large job has filled the service by now
+        convert(self.small)
+        big.join()
+
+        self.assertLess(finished[self.small], finished[self.big])
+        # Each chunk of the small job waited for a slot, not for the large job's queue
+        manifest = container.job_repo.load_project(os.path.dirname(outputs[self.small]))
+        with open(container.job_repo.trace_path(manifest), "r", encoding="utf-8") as f:
+            stages = json.loads(f.readlines()[-1])["histograms"]
+        self.assertLess(stages["synthesis.chunk"]["p50"], 2 * stages["tts.request"]["p50"])
+
+if __name__ == "__main__":
+    unittest.main()
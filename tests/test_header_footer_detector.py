@@ -0,0 +1,57 @@
+"""Running headers and footers are stripped; body text is kept.
+
+    python -m unittest tests.test_header_footer_detector
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.services.header_footer_detector import HeaderFooterDetector
+
+HEADER = "Manual de usuario — Edición 2024"
+QUOTE = "Todo lo que brilla no es oro."
+# Digits are ignored when comparing lines: bodies differ in words
+NAMES = "alba brisa cedro duna eco faro gris hiedra isla jade lago musgo nube olmo pino roca sauce trigo valle zarza".split()
+
+def page(number: int, body: str) -> str:
+    return f"{HEADER}\n\n{body}\nPágina {number} de 20"
+
+def bodies(count: int):
+    return [f"Texto propio de la página {name}.\n{QUOTE}\nY un cierre que habla de {name}." for name in NAMES[:count]]
+
+class HeaderFooterDetectorTest(unittest.TestCase):
+    def test_headers_and_numbered_footers_are_stripped(self):
+        detector = HeaderFooterDetector()
+        pages = [page(n, body) for n, body in enumerate(bodies(10), start=1)]
+        stripped = detector.strip_pages(pages)
+        for body, text in zip(bodies(10), stripped):
+            self.assertEqual(text.strip(), body)
+        self.assertGreater(detector.saved_chars, 10 * len(HEADER))
+
+    def test_repeated_body_sentences_are_kept(self):
+        # The quote is on every page, but not at an edge
+        for text in HeaderFooterDetector().strip_pages([page(n, b) for n, b in enumerate(bodies(10), start=1)]):
+            self.assertIn(QUOTE, text)
+
+    def test_nothing_is_removed_below_min_pages(self):
+        pages = [page(n, body) for n, body in enumerate(bodies(2), start=1)]
+        self.assertEqual(HeaderFooterDetector().strip_pages(pages), pages)
+
+    def test_pages_made_only_of_repeated_lines_are_kept(self):
+        pages = ["Capítulo\nFin"] * 5
+        self.assertEqual(HeaderFooterDetector().strip_pages(pages), pages)
+
+    def test_stream_matches_strip_pages_after_the_window(self):
+        pages = [page(n, body) for n, body in enumerate(bodies(20), start=1)]
+        streamed = list(HeaderFooterDetector().stream(iter(pages)))
+        self.assertEqual(len(streamed), len(pages))
+        self.assertTrue(all(HEADER not in text for text in streamed))
+
+    def test_short_streams_are_still_stripped(self):
+        pages = [page(n, body) for n, body in enumerate(bodies(5), start=1)]
+        self.assertEqual(list(HeaderFooterDetector().stream(pages)), HeaderFooterDetector().strip_pages(pages))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Job manifests survive a crash between saves, and parts are checkpoints only.
+
+    python -m unittest tests.test_job_manifest_repository
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.models.job_manifest import ChunkRecord, JobManifest
+from src.domain.models.voice_settings import VoiceSettings
+from src.infrastructure.repositories.job_manifest_repository import JobManifestRepository
+
+class JobManifestRepositoryTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="jobs-")
+        self.repo = JobManifestRepository(os.path.join(self.workdir, "registry"))
+        self.manifest = JobManifest(
+            job_id="doc-1234", pdf_path="doc.pdf", project_dir=os.path.join(self.workdir, "doc"),
+            base_name="doc", voice_settings=VoiceSettings("es-ES-AlvaroNeural")
+        )
+        os.makedirs(self.manifest.project_dir)
+        self.repo.create(self.manifest)
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def finish(self, index: int) -> ChunkRecord:
+        record = self.manifest.chunks[index] = ChunkRecord(index=index, text_hash=f"h{index}", status="done")
+        self.repo.append_record(self.manifest, record)
+        return record
+
+    def test_appended_records_are_loaded_without_a_save(self):
+        for index in (1, 2, 3):
+            self.finish(index)
+        loaded = self.repo.load("doc-1234")
+        self.assertEqual({i: r.status for i, r in loaded.chunks.items()}, {1: "done", 2: "done", 3: "done"})
+
+    def test_save_folds_the_records_into_the_manifest(self):
+        self.finish(1)
+        self.repo.save(self.manifest)
+        self.assertFalse(os.path.exists(os.path.join(self.manifest.project_dir, ".job", "records.jsonl")))
+        self.assertEqual(self.repo.load("doc-1234").chunks[1].status, "done")
+
+    def test_torn_last_record_is_ignored(self):
+        self.finish(1)
+        with open(os.path.join(self.manifest.project_dir, ".job", "records.jsonl"), "a", encoding="utf-8") as f:
+            f.write('{"index": 2, "text_ha')
+        self.assertEqual(list(self.repo.load("doc-1234").chunks), [1])
+
+    def test_texts_round_trip(self):
+        self.repo.append_texts(self.manifest, [(1, "uno"), (2, "dos")])
+        self.repo.append_text(self.manifest, 3, "tres")
+        self.assertEqual(self.repo.load_texts(self.manifest), ["uno", "dos", "tres"])
+
+    def test_parts_are_discarded(self):
+        record = self.manifest.chunks[1] = ChunkRecord(index=1, text_hash="h1", status="done")
+        record.output_path = self.repo.write_part(self.manifest, 1, b"audio")
+        self.assertEqual(self.repo.read_part(record), b"audio")
+        self.repo.discard_parts(self.manifest)
+        self.assertIsNone(record.output_path)
+        self.assertIsNone(self.repo.read_part(record))
+
+    def test_new_job_replaces_the_old_one(self):
+        self.finish(1)
+        newer = JobManifest(
+            job_id="doc-5678", pdf_path="doc.pdf", project_dir=self.manifest.project_dir,
+            base_name="doc", voice_settings=self.manifest.voice_settings
+        )
+        self.repo.create(newer)
+        self.assertIsNone(self.repo.load("doc-1234"))
+        self.assertEqual(self.repo.load("doc-5678").chunks, {})
+
+if __name__ == "__main__":
+    unittest.main()
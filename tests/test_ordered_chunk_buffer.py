@@ -0,0 +1,71 @@
+"""Chunks completed out of order come out in sequence.
+
+    python -m unittest tests.test_ordered_chunk_buffer
+"""
+import os
+import random
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.services.ordered_chunk_buffer import OrderedChunkBuffer
+
+class OrderedChunkBufferTest(unittest.TestCase):
+    def test_out_of_order_chunks_come_out_in_sequence(self):
+        buffer = OrderedChunkBuffer()
+        for idx in (3, 1, 2):
+            buffer.put(idx, str(idx).encode())
+        buffer.finish(3)
+        self.assertEqual(list(buffer), [b"1", b"2", b"3"])
+        self.assertEqual(buffer.flushed, 3)
+
+    def test_custom_start(self):
+        buffer = OrderedChunkBuffer(start=5)
+        buffer.put(6, b"b")
+        buffer.put(5, b"a")
+        buffer.finish(2)
+        self.assertEqual(list(buffer), [b"a", b"b"])
+
+    def test_concurrent_producers(self):
+        buffer = OrderedChunkBuffer()
+        order = list(range(1, 201))
+        random.Random(7).shuffle(order)
+        producers = [threading.Thread(target=lambda part=order[i::4]: [buffer.put(idx, b"%d" % idx) for idx in part])
+                     for i in range(4)]
+        for producer in producers:
+            producer.start()
+        buffer.finish(200)
+        self.assertEqual(list(buffer), [b"%d" % idx for idx in range(1, 201)])
+        for producer in producers:
+            producer.join()
+
+    def test_abort_stops_the_consumer(self):
+        buffer = OrderedChunkBuffer()
+        buffer.put(1, b"a")
+        chunks = iter(buffer)
+        self.assertEqual(next(chunks), b"a")
+        threading.Timer(0.05, buffer.abort).start()
+        with self.assertRaises(InterruptedError):
+            next(chunks)
+
+    def test_abort_with_an_error(self):
+        buffer = OrderedChunkBuffer()
+        buffer.abort(RuntimeError("fallo"))
+        with self.assertRaisesRegex(RuntimeError, "fallo"):
+            list(buffer)
+        self.assertTrue(buffer.wait_flushed(10, timeout=0))
+
+    def test_wait_flushed(self):
+        buffer = OrderedChunkBuffer()
+        buffer.put(1, b"a")
+        buffer.put(2, b"b")
+        self.assertFalse(buffer.wait_flushed(1, timeout=0.01))
+        chunks = iter(buffer)
+        next(chunks)
+        self.assertTrue(buffer.wait_flushed(1, timeout=0))
+        self.assertFalse(buffer.wait_flushed(2, timeout=0.01))
+
+if __name__ == "__main__":
+    unittest.main()
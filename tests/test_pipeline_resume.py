@@ -0,0 +1,214 @@
+"""Conversion jobs with a fake speech engine: completion, failure and resume,
+cancellation and render errors.
+
+    python -m unittest tests.test_pipeline_resume
+"""
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.application.use_cases.process_pdf_to_speech import ProcessPdfToSpeechUseCase
+from src.domain.models.chunk_budget import ChunkBudget
+from src.domain.models.page_text import PageText
+from src.domain.models.voice_settings import VoiceSettings
+from src.domain.ports.audio_processor import AudioProcessorPort
+from src.domain.ports.document_extractor import DocumentExtractorPort
+from src.domain.ports.speech_generator import SpeechGeneratorPort
+from src.domain.services.text_service import TextService
+from src.infrastructure.repositories.cache_repository import CacheRepository
+from src.infrastructure.repositories.job_manifest_repository import JobManifestRepository
+
+VOICE = VoiceSettings("es-ES-AlvaroNeural")
+# Words, not digits: streamed pages are normalized for narration
+NAMES = ("alba", "brisa", "cedro", "duna", "eco", "faro", "gris", "hiedra", "isla", "jade", "kiosco", "lago",
+         "musgo", "nube", "olmo", "pino", "quinta", "roca", "sauce", "trigo", "umbral", "valle", "xilema",
+         "yunque", "zarza", "arce", "bruma", "cobre", "delta", "espiga")
+PAGES = [f"Capítulo {name}: la historia del {name} cuenta algo distinto. Y otra frase más sobre {name}." for name in NAMES]
+
+class FakeGenerator(SpeechGeneratorPort):
+    """'Audio' is the chunk text itself; texts containing fail_on raise."""
+
+    def __init__(self):
+        self.calls = []
+        self.fail_on = None
+        self.cancel_after = None # (calls, event): sets event once that many calls were made
+        self._lock = threading.Lock()
+
+    def generate_speech(self, text, output_path, settings):
+        with open(output_path, "wb") as f:
+            f.write(self.synthesize(text, settings))
+
+    def synthesize(self, text, settings):
+        with self._lock:
+            self.calls.append(text)
+            if self.cancel_after and len(self.calls) >= self.cancel_after[0]:
+                self.cancel_after[1].set()
+        if self.fail_on and self.fail_on in text:
+            raise RuntimeError("servicio caído")
+        return text.encode("utf-8")
+
+class FakeExtractor(DocumentExtractorPort):
+    def extract_text(self, file_path):
+        return "\n".join(PAGES), {}
+
+    def iter_pages(self, file_path, pages=None, cancel_event=None):
+        for number, text in enumerate(PAGES, start=1):
+            if pages is None or number in pages:
+                yield PageText(number=number, total=len(PAGES), text=text)
+
+    def page_count(self, file_path):
+        return len(PAGES)
+
+class FakeProcessor(AudioProcessorPort):
+    """Concatenates the chunks; fails the render when told to."""
+
+    def __init__(self):
+        self.fail = False
+
+    def render(self, chunks, output_path, voice_vol=1.0, bgm_path="", bgm_vol=0.2, silences=None, cancel_event=None):
+        with open(output_path, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                if self.fail:
+                    raise RuntimeError("ffmpeg falló")
+        return output_path
+
+    def merge_wavs(self, wav_paths, output_path):
+        raise NotImplementedError
+
+    def mix_with_bgm(self, voice_path, bgm_path, output_path, voice_vol, bgm_vol):
+        raise NotImplementedError
+
+    def convert_to_mp3(self, input_path):
+        return input_path
+
+    def generate_silence(self, duration, output_path):
+        return output_path
+
+class SmallChunks:
+    """Chunk tuner that always picks small chunks, so a job has many."""
+
+    def choose(self, total_chars, workers, latency_model=None, failure_rate=0.0):
+        return ChunkBudget(max_chars=150, max_words=None), "prueba"
+
+def squeeze(text: str) -> str:
+    return "".join(text.split())
+
+class PipelineResumeTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="pipeline-")
+        self.output_dir = os.path.join(self.workdir, "out")
+        self.project_dir = os.path.join(self.output_dir, "libro")
+        self.generator = FakeGenerator()
+        self.processor = FakeProcessor()
+        self.jobs = JobManifestRepository(os.path.join(self.workdir, "registry"))
+        self.use_case = self._use_case(cache=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+    def _use_case(self, cache: bool) -> ProcessPdfToSpeechUseCase:
+        return ProcessPdfToSpeechUseCase(
+            FakeExtractor(), self.generator, self.processor, TextService(),
+            cache=CacheRepository(os.path.join(self.workdir, "cache")) if cache else None,
+            jobs=self.jobs, chunk_tuner=SmallChunks()
+        )
+
+    def convert(self, text=None, cancel_event=None):
+        return self.use_case.execute(text, "libro.pdf", self.output_dir, VOICE, cancel_event=cancel_event)
+
+    def read(self, path: str) -> str:
+        with open(path, "rb") as f:
+            return f.read().decode("utf-8")
+
+    def job_files(self):
+        return sorted(os.listdir(self.project_dir))
+
+    def test_streamed_job_completes_in_order(self):
+        output = self.convert()
+        self.assertEqual(squeeze(self.read(output)), squeeze("".join(PAGES)))
+        self.assertGreater(len(self.generator.calls), 5)
+        manifest = self.jobs.load_project(self.project_dir)
+        self.assertEqual(manifest.status, "completed")
+        self.assertTrue(all(r.status == "done" for r in manifest.chunks.values()))
+        self.assertEqual(self.job_files(), [".job", "libro_mixed.mp3"])
+        self.assertFalse(os.path.exists(os.path.join(self.project_dir, ".job", "parts")))
+
+    def test_failed_job_resumes_where_it_stopped(self):
+        self.generator.fail_on = "Capítulo umbral:"
+        with self.assertRaises(Exception):
+            self.convert(text="\n".join(PAGES))
+        manifest = self.jobs.load_project(self.project_dir)
+        self.assertEqual(manifest.status, "failed")
+        self.assertNotIn("libro_mixed.mp3", self.job_files())
+
+        self.generator.fail_on = None
+        self.assert_resumes_without_repeating(manifest)
+        self.assertEqual(self.jobs.load(manifest.job_id).status, "completed")
+
+    def assert_resumes_without_repeating(self, manifest):
+        texts = self.jobs.load_texts(manifest)
+        done = {texts[r.index - 1] for r in manifest.chunks.values() if r.status == "done"}
+        self.assertTrue(done)
+        synthesized = len(self.generator.calls)
+        output = self.use_case.resume(manifest.job_id)
+        self.assertEqual(squeeze(self.read(output)), squeeze("".join(PAGES)))
+        # Chunks finished before the failure are not requested again
+        self.assertEqual(done & set(self.generator.calls[synthesized:]), set())
+
+    def test_resume_after_a_crash_finds_chunks_in_the_cache(self):
+        self.generator.fail_on = "Capítulo umbral:"
+        with self.assertRaises(Exception):
+            self.convert(text="\n".join(PAGES))
+        manifest = self.jobs.load_project(self.project_dir)
+        # Cached chunks need no part of their own
+        parts = os.path.join(self.project_dir, ".job", "parts")
+        self.assertEqual(os.listdir(parts) if os.path.isdir(parts) else [], [])
+        # The process died before the cache index listed this job's audio
+        with open(os.path.join(self.workdir, "cache", "index.json"), "w", encoding="utf-8") as f:
+            f.write('{"entries": []}')
+        self.use_case = self._use_case(cache=True)
+
+        self.generator.fail_on = None
+        self.assert_resumes_without_repeating(manifest)
+
+    def test_without_cache_parts_checkpoint_the_job(self):
+        self.use_case = self._use_case(cache=False)
+        self.generator.fail_on = "Capítulo umbral:"
+        with self.assertRaises(Exception):
+            self.convert(text="\n".join(PAGES))
+        self.assertTrue(os.listdir(os.path.join(self.project_dir, ".job", "parts")))
+
+        self.generator.fail_on = None
+        self.assert_resumes_without_repeating(self.jobs.load_project(self.project_dir))
+        self.assertFalse(os.path.exists(os.path.join(self.project_dir, ".job", "parts")))
+
+    def test_cancelled_job_keeps_the_previous_output(self):
+        previous = self.read(self.convert())
+        self.use_case = self._use_case(cache=False) # every chunk goes to the engine
+        cancel = threading.Event()
+        self.generator.cancel_after = (3, cancel)
+        self.assertIsNone(self.convert(text="Otro texto. " * 400, cancel_event=cancel))
+        self.assertEqual(self.jobs.load_project(self.project_dir).status, "cancelled")
+        self.assertEqual(self.job_files(), [".job", "libro_mixed.mp3"])
+        self.assertEqual(self.read(os.path.join(self.project_dir, "libro_mixed.mp3")), previous)
+
+    def test_render_failure_leaves_no_partial_output_or_threads(self):
+        self.processor.fail = True
+        with self.assertRaises(RuntimeError):
+            self.convert()
+        self.assertEqual(self.job_files(), [".job"])
+        self.assertEqual(self.jobs.load_project(self.project_dir).status, "failed")
+        stages = [t.name for t in threading.enumerate() if t.name.endswith("-libro")]
+        for name in stages:
+            thread = next(t for t in threading.enumerate() if t.name == name)
+            thread.join(2.0)
+        self.assertEqual([t.name for t in threading.enumerate() if t.name.endswith("-libro")], [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Pipeline stages end cleanly on completion, errors, failure downstream and cancel.
+
+    python -m unittest tests.test_pipeline_stage
+"""
+import itertools
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.services.pipeline_stage import PipelineStage
+
+def live_stages(prefix: str):
+    return [t.name for t in threading.enumerate() if t.name.startswith(prefix)]
+
+class PipelineStageTest(unittest.TestCase):
+    def wait_for_exit(self, prefix: str, timeout: float = 2.0):
+        deadline = time.monotonic() + timeout
+        while live_stages(prefix) and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(live_stages(prefix), [])
+
+    def test_items_arrive_in_order(self):
+        stage = PipelineStage("order-test", lambda: range(50), maxsize=4).start()
+        self.assertEqual(list(stage), list(range(50)))
+        stage.close()
+        self.wait_for_exit("order-test")
+
+    def test_producer_error_reaches_consumer(self):
+        def produce():
+            yield 1
+            raise ValueError("boom")
+
+        stage = PipelineStage("error-test", produce, maxsize=2).start()
+        with self.assertRaises(ValueError):
+            list(stage)
+        stage.close()
+
+    def test_failing_consumer_leaves_no_live_stages(self):
+        # Same shape as the use case: extract -> chunk -> consumer
+        extract = PipelineStage("leak-extract", lambda: itertools.count(), maxsize=2)
+        chunk = PipelineStage("leak-chunk", lambda: (item * 2 for item in extract), maxsize=2)
+        stages = [extract.start(), chunk.start()]
+        try:
+            for item in chunk:
+                if item > 10:
+                    raise RuntimeError("render failed")
+        except RuntimeError:
+            pass
+        finally:
+            for stage in stages:
+                stage.close()
+        self.wait_for_exit("leak-")
+
+    def test_cancel_interrupts_consumer(self):
+        cancel = threading.Event()
+        stage = PipelineStage("cancel-test", lambda: itertools.count(), maxsize=2, cancel_event=cancel).start()
+        with self.assertRaises(InterruptedError):
+            for item in stage:
+                if item == 5:
+                    cancel.set()
+        stage.close()
+        self.wait_for_exit("cancel-test")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Narration rewrites: numbers, dates, times, currency, symbols and cleanup.
+
+    python -m unittest tests.test_text_normalizer
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.services.text_normalizer import TextNormalizer
+
+class SpanishTest(unittest.TestCase):
+    def setUp(self):
+        self.normalizer = TextNormalizer("es")
+
+    def assertReads(self, text, expected):
+        self.assertEqual(self.normalizer.normalize(text), expected)
+
+    def test_numbers(self):
+        self.assertReads("Hay 0 y 100.", "Hay cero y cien.")
+        self.assertReads("Son 1.234.567 votos", "Son un millón doscientos treinta y cuatro mil quinientos sesenta y siete votos")
+        self.assertReads("Mide 3,05 metros", "Mide tres coma cero cinco metros")
+        self.assertReads("En 1985", "En mil novecientos ochenta y cinco")
+
+    def test_uno_before_a_noun(self):
+        self.assertReads("Tenía 31 años.", "Tenía treinta y un años.")
+        self.assertReads("Hay 1 libro y 21 páginas.", "Hay un libro y veintiún páginas.")
+        self.assertReads("Leyó 31\npáginas", "Leyó treinta y un páginas")
+        self.assertReads("2021 años", "dos mil veintiún años")
+
+    def test_uno_on_its_own(self):
+        self.assertReads("El número 31 es primo.", "El número treinta y uno es primo.")
+        self.assertReads("El 21 de mayo", "El veintiuno de mayo")
+        self.assertReads("Capítulo 1.", "Capítulo uno.")
+        self.assertReads("Subió un 21 %.", "Subió un veintiuno por ciento.")
+
+    def test_clock_times(self):
+        self.assertReads("A las 10:30.", "A las diez y treinta.")
+        self.assertReads("Abre a las 9:05", "Abre a las nueve y cinco")
+        self.assertReads("Cierra a las 21:00", "Cierra a las veintiuna en punto")
+        self.assertReads("Ganó 25:30", "Ganó veinticinco:treinta")
+        self.assertReads("Duró 1:30:00", "Duró uno:treinta:cero")
+
+    def test_dates(self):
+        self.assertReads("Nació el 1/5/1990.", "Nació el primero de mayo de mil novecientos noventa.")
+        self.assertReads("Vence el 31-12-2024", "Vence el treinta y uno de diciembre de dos mil veinticuatro")
+
+    def test_currency_and_percent(self):
+        self.assertReads("Cuesta $1", "Cuesta un dólar")
+        self.assertReads("Cuesta 21,50 €", "Cuesta veintiún euros con cincuenta céntimos")
+        self.assertReads("Un 15% más", "Un quince por ciento más")
+
+    def test_symbols_and_abbreviations(self):
+        self.assertReads("Juan&Ana", "Juan y Ana")
+        self.assertReads("El Sr. Pérez, pág. 3", "El señor Pérez, página tres")
+
+    def test_words_with_digits_are_left_alone(self):
+        self.assertReads("Un archivo mp3 en A4", "Un archivo mp3 en A4")
+
+    def test_whitespace_and_hyphenation(self):
+        self.assertReads("una pala-\nbra  y\totra\n\n\nparte", "una palabra y otra\n\nparte")
+
+class EnglishTest(unittest.TestCase):
+    def setUp(self):
+        self.normalizer = TextNormalizer("en")
+
+    def test_numbers_and_years(self):
+        self.assertEqual(self.normalizer.normalize("In 1999, 21 dogs"), "In nineteen ninety-nine, twenty-one dogs")
+
+    def test_clock_times(self):
+        self.assertEqual(
+            self.normalizer.normalize("At 10:05, 9:00 or 14:30"),
+            "At ten oh five, nine o'clock or fourteen thirty"
+        )
+
+    def test_dates(self):
+        self.assertEqual(self.normalizer.normalize("On 7/4/1776"), "On July fourth, seventeen seventy-six")
+
+class UnknownLanguageTest(unittest.TestCase):
+    def test_only_whitespace_is_cleaned(self):
+        self.assertEqual(TextNormalizer("fr").normalize("Il a 31  ans"), "Il a 31 ans")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""Chunking, re-chunking after an edit, and isolation of repeated sentences.
+
+    python -m unittest tests.test_text_service
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.domain.models.chunk_budget import ChunkBudget
+from src.domain.services.text_service import TextService
+
+BUDGET = ChunkBudget(max_chars=300, max_words=None)
+# Words, not digits: chunk_stream normalizes the text for narration
+NAMES = [a + b for a in ("ka", "lo", "mi", "nu", "pe", "ru") for b in ("ta", "sa", "ro", "li", "me", "no", "ve", "bu", "ci", "do")]
+TEXT = " ".join(f"La frase {name} dice algo bastante largo para medir." for name in NAMES)
+REPEAT = "Este documento es confidencial y propiedad exclusiva de ACME."
+
+def words(chunks):
+    return " ".join(chunks).split()
+
+class ChunkTextTest(unittest.TestCase):
+    def test_chunks_keep_every_word_within_the_budget(self):
+        chunks = TextService.chunk_text(TEXT, budget=BUDGET)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(words(chunks), TEXT.split())
+        self.assertTrue(all(len(chunk) <= BUDGET.max_chars for chunk in chunks))
+
+    def test_chunks_end_at_sentences(self):
+        for chunk in TextService.chunk_text(TEXT, budget=BUDGET):
+            self.assertTrue(chunk.endswith("."), chunk)
+
+    def test_word_limit(self):
+        self.assertEqual(TextService.chunk_text("Hola.\n\nAdiós. Otra.", word_limit=1), ["Hola.", "Adiós.", "Otra."])
+
+    def test_stream_matches_the_whole_text(self):
+        pages = [TEXT[:900], TEXT[900:]]
+        streamed = list(TextService().chunk_stream(pages, budget=BUDGET))
+        self.assertEqual(words(streamed), TEXT.split())
+        self.assertTrue(all(len(chunk) <= BUDGET.max_chars for chunk in streamed))
+
+class RechunkTest(unittest.TestCase):
+    def test_an_edit_changes_only_nearby_chunks(self):
+        previous = TextService.chunk_text(TEXT, budget=BUDGET)
+        edited = TEXT.replace("frase mime dice", "frase mime ya no dice")
+        chunks = TextService.rechunk(edited, previous, budget=BUDGET)
+        self.assertEqual(words(chunks), edited.split())
+        changed = [chunk for chunk in chunks if chunk not in set(previous)]
+        self.assertLessEqual(len(changed), 3)
+        self.assertTrue(any("ya no dice" in chunk for chunk in changed))
+
+class IsolateRepeatsTest(unittest.TestCase):
+    def chunks(self, occurrences: int):
+        return [f"Página {i} con su propio texto. {REPEAT} Y un final." for i in range(occurrences)]
+
+    def test_a_sentence_seen_twice_stays_in_place(self):
+        chunks = self.chunks(2)
+        self.assertEqual(list(TextService.isolate_repeats(chunks)), chunks)
+
+    def test_streamed_repeats_are_isolated_from_the_third_occurrence(self):
+        isolated = list(TextService.isolate_repeats(self.chunks(4)))
+        self.assertEqual(isolated.count(REPEAT), 2)
+        self.assertEqual(isolated[:2], self.chunks(2))
+        self.assertEqual(words(isolated), words(self.chunks(4)))
+
+    def test_counted_repeats_are_isolated_from_the_first_occurrence(self):
+        chunks = self.chunks(3)
+        isolated = list(TextService.isolate_repeats(chunks, counts=TextService.count_sentences(chunks)))
+        self.assertEqual(isolated.count(REPEAT), 3)
+        self.assertEqual(isolated[:3], ["Página 0 con su propio texto.", REPEAT, "Y un final."])
+        self.assertEqual(words(isolated), words(chunks))
+
+    def test_counted_pairs_stay_in_place(self):
+        chunks = self.chunks(2)
+        self.assertEqual(list(TextService.isolate_repeats(chunks, counts=TextService.count_sentences(chunks))), chunks)
+
+    def test_short_sentences_are_never_isolated(self):
+        chunks = ["Hola. Adiós."] * 5
+        self.assertEqual(list(TextService.isolate_repeats(chunks)), chunks)
+
+if __name__ == "__main__":
+    unittest.main()